@@ -1,11 +1,25 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.linalg import solve_banded
+from solver_tridiagonal import factorizar_tridiagonal, resolver_tridiagonal_factorizada
+from instrumentacion import estadisticas_o_nulas
+from esquemas_temporales import IntegradorTemporal
 
-def resolucion_ecuacion_difusion_linea_1D(D0, L, T_final, M, N):
+def _matriz_banda_difusion(M, r):
+    """Matriz I - r * (laplaciano discreto) de los M nodos interiores, en formato solve_banded."""
+    main_diag = (1 + 2 * r) * np.ones(M)
+    off_diag = -r * np.ones(M - 1)
+
+    return np.vstack([np.insert(off_diag, 0, 0),
+                      main_diag,
+                      np.append(off_diag, 0)])
+
+def resolucion_ecuacion_difusion_linea_1D(D0, L, T_final, M, N, theta_inicial=None,
+                                          reutilizar_factorizacion=True, estadisticas=None, esquema='euler'):
     """
     Resuelve la ecuación de difusión lineal 1D (Actividad a)
-    usando el esquema de Diferencias Finitas de Euler Implícito.
+    usando el esquema de Diferencias Finitas de Euler Implícito, o uno de
+    orden 2 en el tiempo (ver esquemas_temporales).
 
     Args:
         D0 (float): Coeficiente de difusividad constante.
@@ -13,52 +27,115 @@ def resolucion_ecuacion_difusion_linea_1D(D0, L, T_final, M, N):
         T_final (float): Tiempo final de la simulación.
         M (int): Número de puntos internos de la malla espacial (M+1 nodos).
         N (int): Número de pasos de tiempo.
+        theta_inicial (np.array, opcional): Condición inicial de forma (M+2,) o un
+            bloque (M+2, K) de K perfiles que se avanzan juntos como lado derecho
+            de varias columnas. Por defecto sin(pi x / L).
+        reutilizar_factorizacion (bool): Si es True, A se factoriza una sola vez y
+            cada paso solo hace sustitución hacia adelante/atrás sobre el mismo
+            arreglo, sin copias. Si es False, se llama a solve_banded en cada paso.
+        estadisticas (Estadisticas, opcional): Si se pasa, registra el tiempo de
+            ensamblado, factorización y resolución, y los sistemas resueltos.
+        esquema (str): 'euler', 'cn', 'bdf2' o 'trbdf2'. Los de orden 2 alcanzan
+            el mismo error temporal con muchos menos pasos; factorizan una vez
+            la matriz de cada etapa (reutilizar_factorizacion no se usa).
 
     Returns:
         tuple: (x, theta_num, theta_an, error_L2, r)
             x (np.array): Coordenadas espaciales.
             theta_num (np.array): Solución numérica al tiempo T_final.
-            theta_an (np.array): Solución analítica al tiempo T_final.
-            error_L2 (float): Error L2 entre la solución numérica y analítica.
+            theta_an (np.array): Solución analítica al tiempo T_final
+                (None si se pasa theta_inicial).
+            error_L2 (float): Error L2 entre la solución numérica y analítica
+                (None si se pasa theta_inicial).
             r (float): El parámetro de estabilidad/precisión r = D0*dt/dx^2.
     """
+    est = estadisticas_o_nulas(estadisticas)
+    est.iniciar()
+
     # 1. Parámetros de Discretización
     dx = L / (M + 1)
     dt = T_final / N
     r = D0 * dt / (dx ** 2)
 
     x = np.linspace(0, L, M + 2)
-    theta = np.sin(np.pi * x / L)
-
-    theta_interior = theta[1:-1]
-
-    lambda_sq = (np.pi / L) ** 2
-    theta_an = np.sin(np.pi * x / L) * np.exp(-D0 * lambda_sq * T_final)
-
-    main_diag = (1 + 2 * r) * np.ones(M)
-    off_diag = -r * np.ones(M - 1)
-
-    A_banded = np.vstack([np.insert(off_diag, 0, 0),
-                          main_diag,
-                          np.append(off_diag, 0)])
+    if theta_inicial is None:
+        theta = np.sin(np.pi * x / L)
+        lambda_sq = (np.pi / L) ** 2
+        theta_an = np.sin(np.pi * x / L) * np.exp(-D0 * lambda_sq * T_final)
+    else:
+        theta = np.asarray(theta_inicial, dtype=np.float64)
+        theta_an = None
+
+    with est.fase('ensamblado'):
+        A_banded = _matriz_banda_difusion(M, r)
+
+    # 5. Bucle Temporal (Euler Implícito o esquema de orden 2)
+    if esquema != 'euler':
+        theta_num, n_sistemas = _integrar_orden_superior(D0, dx, dt, M, N, theta, esquema, est)
+    else:
+        if reutilizar_factorizacion:
+            # A es la misma en todos los pasos: se factoriza una vez y la solución
+            # se sobrescribe en el mismo arreglo (orden Fortran, una columna por perfil)
+            with est.fase('factorizacion'):
+                factor = factorizar_tridiagonal(A_banded)
+            theta_interior = np.array(theta[1:-1], order='F')
+            with est.fase('resolucion_lineal'):
+                for _ in range(N):
+                    theta_interior = resolver_tridiagonal_factorizada(factor, theta_interior, sobrescribir=True)
+        else:
+            theta_interior = theta[1:-1]
+            with est.fase('resolucion_lineal'):
+                for _ in range(N):
+                    # Resolvemos el sistema: A * theta^(n+1) = theta^n
+                    theta_interior = solve_banded((1, 1), A_banded, theta_interior)
+        n_sistemas = N
+        theta_num = np.zeros(theta.shape)
+        theta_num[1:-1] = theta_interior
+    # Problema lineal: un sistema por etapa y por perfil, sin iteraciones no lineales
+    est.contar_resoluciones(n_sistemas * (theta.shape[1] if theta.ndim == 2 else 1))
+
+    if theta_an is None:
+        error_L2 = None
+    else:
+        error_L2 = np.sqrt(np.sum((theta_num - theta_an) ** 2 * dx))
+
+    est.finalizar()
+    return x, theta_num, theta_an, error_L2, r
 
-    # 5. Bucle Temporal (Euler Implícito)
+def _integrar_orden_superior(D0, dx, dt, M, N, theta, esquema, est):
+    """
+    N pasos de un esquema de orden 2 (IntegradorTemporal) con bordes nulos.
+    Cada etapa es un sistema con su propio r = D0 dt_etapa / dx^2, que se
+    factoriza una sola vez. Devuelve (theta, sistemas resueltos por perfil).
+    """
+    integrador = IntegradorTemporal(esquema)
+    factores = {}
+
+    def resolver_etapa(rhs, dt_etapa, previo=None):
+        if dt_etapa not in factores:
+            with est.fase('factorizacion'):
+                factores[dt_etapa] = factorizar_tridiagonal(_matriz_banda_difusion(M, D0 * dt_etapa / dx ** 2))
+        x = np.zeros(rhs.shape)
+        with est.fase('resolucion_lineal'):
+            x[1:-1] = resolver_tridiagonal_factorizada(factores[dt_etapa], rhs[1:-1])
+        return x, 1, True
+
+    def aplicar_operador(theta_n):
+        L_theta = np.zeros(theta_n.shape)
+        L_theta[1:-1] = D0 * (theta_n[:-2] - 2 * theta_n[1:-1] + theta_n[2:]) / dx ** 2
+        return L_theta
+
+    # Como en Euler, los bordes valen 0 (Dirichlet homogéneo)
+    theta = theta.copy()
+    theta[[0, -1]] = 0.0
+    n_sistemas = 0
+    previo = None
     for _ in range(N):
-        # Lado derecho b = theta^n
-        b = theta_interior.copy()
-
-        # Resolvemos el sistema: A * theta^(n+1) = b
-        theta_interior_new = solve_banded((1, 1), A_banded, b)
-
-        theta_interior = theta_interior_new
-
-
-    theta_num = np.zeros(M + 2)
-    theta_num[1:-1] = theta_interior
-
-    error_L2 = np.sqrt(np.sum((theta_num - theta_an) ** 2 * dx))
-
-    return x, theta_num, theta_an, error_L2, r
+        theta_n = theta
+        theta, etapas, _ = integrador.paso(resolver_etapa, aplicar_operador, theta_n, dt, previo)
+        previo = (theta_n, dt)
+        n_sistemas += etapas
+    return theta, n_sistemas
 
 def get_computational_cost_a(M, N):
     """
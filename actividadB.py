@@ -1,14 +1,254 @@
 import numpy as np
 from scipy.linalg import solve_banded
 import matplotlib.pyplot as plt
-from boltzmann_edo import solve_boltzmann_edo
+from cache_boltzmann import perfil_boltzmann
+from models_soil_models import dD_dtheta_brooks_corey
+from paso_adaptativo import integrar_adaptativo
+from instrumentacion import ESTADISTICAS_NULAS, estadisticas_o_nulas
+from region_activa import TOL_REGION, paso_en_region_activa
+from esquemas_temporales import IntegradorTemporal
+from iteracion_no_lineal import picard_por_miembro
+from solver_tridiagonal import resolver_tridiagonal_bloques
+
+
+def _ensamblar_sistema_richards_1D(D_nodes, theta_old, theta_k, coef):
+    """
+    Ensambla la matriz banda (formato solve_banded) y el lado derecho de una
+    iteración de Picard usando solo operaciones sobre rebanadas.
+
+    Args:
+        D_nodes (np.array): D(theta_k) en los M+2 nodos.
+        theta_old (np.array): Solución en el paso temporal anterior.
+        theta_k (np.array): Iterado de Picard actual (aporta los bordes).
+        coef (float): -dt/dx^2.
+
+    Returns:
+        tuple: (A_banded, rhs) con A_banded de forma (3, M).
+    """
+    M = len(D_nodes) - 2
+
+    # D en los puntos medios i+1/2
+    D_half = 0.5 * (D_nodes[:-1] + D_nodes[1:])
+    a = coef * D_half[:-1]
+    c = coef * D_half[1:]
+
+    A_banded = np.empty((3, M))
+    A_banded[0, 0] = 0.0
+    A_banded[0, 1:] = c[:-1]
+    A_banded[1, :] = 1.0 - (a + c)
+    A_banded[2, :-1] = a[1:]
+    A_banded[2, -1] = 0.0
+
+    # Lado derecho con las condiciones de borde Dirichlet
+    rhs = theta_old[1:M + 1].copy()
+    rhs[0] -= a[0] * theta_k[0]
+    rhs[-1] -= c[-1] * theta_k[-1]
+
+    return A_banded, rhs
+
+
+def _paso_picard_1D(D_func, theta_old, coef, picard_tol, picard_maxiter, est=ESTADISTICAS_NULAS, iteracion=None,
+                    previo=None):
+    """
+    Un paso de Euler implícito resuelto por Picard. Con iteracion
+    (IteracionNoLineal) el bucle lo maneja esa capa en lugar de picard_tol,
+    con previo = (estado, coef) del paso aceptado anterior para el predictor.
+    Devuelve (theta, iteraciones, convergido).
+    """
+    M = len(theta_old) - 2
+
+    def barrido(theta_k):
+        # Evaluar D y ensamblar el sistema tridiagonal por rebanadas
+        with est.fase('evaluacion_D'):
+            D_nodes = D_func(theta_k)
+        with est.fase('ensamblado'):
+            A_banded, rhs = _ensamblar_sistema_richards_1D(D_nodes, theta_old, theta_k, coef)
+        with est.fase('resolucion_lineal'):
+            theta_interior = solve_banded((1, 1), A_banded, rhs, overwrite_ab=True, overwrite_b=True)
+        est.contar_resoluciones()
+        theta_next = theta_k.copy()
+        theta_next[1:M + 1] = theta_interior
+        return theta_next
+
+    if iteracion is not None:
+        # -coef = dt/dx^2 es proporcional a dt, que es lo único que usa el predictor
+        previo = None if previo is None else (previo[0], -previo[1])
+        return iteracion.resolver(barrido, theta_old, -coef, picard_maxiter, est, previo=previo)
+
+    theta_k = theta_old.copy()
+    n_iter = 0
+    convergido = False
+    for picard_iter in range(picard_maxiter):
+        theta_prev = theta_k
+        n_iter += 1
+        try:
+            theta_k = barrido(theta_k)
+        except Exception as e:
+            print(f"Error resolviendo sistema: {e}")
+            break
+
+        with est.fase('convergencia'):
+            diff = np.linalg.norm(theta_k - theta_prev)
+        if diff < picard_tol:
+            convergido = True
+            break
+
+    return theta_k, n_iter, convergido
+
+
+def _diagonales_richards_1D(D_nodes, theta_old, theta_k, coef):
+    """
+    Versión por lotes de _ensamblar_sistema_richards_1D (el último eje son
+    los nodos, los anteriores indexan problemas independientes): devuelve
+    (inferior, diagonal, superior, rhs) en el formato de
+    resolver_tridiagonal_bloques.
+    """
+    D_half = 0.5 * (D_nodes[..., :-1] + D_nodes[..., 1:])
+    a = coef * D_half[..., :-1]
+    c = coef * D_half[..., 1:]
+
+    # Lado derecho con las condiciones de borde Dirichlet
+    rhs = theta_old[..., 1:-1].copy()
+    rhs[..., 0] -= a[..., 0] * theta_k[..., 0]
+    rhs[..., -1] -= c[..., -1] * theta_k[..., -1]
+    return a, 1.0 - (a + c), c, rhs
+
+
+def _paso_picard_1D_conjunto(D_func, theta_old, coef, picard_tol, picard_maxiter, est=ESTADISTICAS_NULAS):
+    """
+    Un paso de Euler implícito + Picard para un conjunto de perfiles (eje 0 =
+    miembro): D, las diagonales y un único sistema tridiagonal por bloques por
+    iteración para todos los miembros activos, con convergencia por miembro (ver
+    iteracion_no_lineal.picard_por_miembro).
+    Devuelve (theta, iteraciones, convergido), los dos últimos por miembro.
+    """
+    def barrido(theta_k, activos):
+        theta_o = theta_old if len(activos) == len(theta_old) else theta_old[activos]
+        with est.fase('evaluacion_D'):
+            D_nodes = D_func(theta_k)
+        with est.fase('ensamblado'):
+            inferior, diagonal, superior, rhs = _diagonales_richards_1D(D_nodes, theta_o, theta_k, coef)
+        theta_next = theta_k.copy()
+        with est.fase('resolucion_lineal'):
+            theta_next[..., 1:-1] = resolver_tridiagonal_bloques(inferior, diagonal, superior, rhs)
+        est.contar_resoluciones(len(theta_k))
+        return theta_next
+
+    return picard_por_miembro(barrido, theta_old, picard_maxiter, picard_tol, est)
+
+
+def _operador_richards_1D(D_nodes, theta, dx):
+    """L(theta) theta = d/dx (D dtheta/dx) con D en los puntos medios, nulo en los bordes Dirichlet."""
+    L_theta = np.zeros(theta.shape)
+    L_theta[..., 1:-1] = np.diff(0.5 * (D_nodes[..., :-1] + D_nodes[..., 1:]) * np.diff(theta)) / dx ** 2
+    return L_theta
+
+
+def _jacobiano_richards_1D(D_nodes, dD_nodes, theta_k, r):
+    """
+    Jacobiano tridiagonal exacto (formato solve_banded) del residuo
+        F_i = theta_i - theta_old_i - r * (q_{i+1/2} - q_{i-1/2}),
+        q_{i+1/2} = 0.5 * (D_i + D_{i+1}) * (theta_{i+1} - theta_i),
+    respecto de los nodos interiores.
+    """
+    M = len(theta_k) - 2
+    D_half = 0.5 * (D_nodes[:-1] + D_nodes[1:])
+    grad = np.diff(theta_k)
+
+    J_banded = np.empty((3, M))
+    J_banded[0, 0] = 0.0
+    J_banded[0, 1:] = -r * (D_half[1:M] + 0.5 * dD_nodes[2:M + 1] * grad[1:M])
+    J_banded[1, :] = (1.0 + r * (D_half[1:] + D_half[:-1])
+                      - 0.5 * r * dD_nodes[1:M + 1] * (grad[1:] - grad[:-1]))
+    J_banded[2, :-1] = r * (-D_half[1:M] + 0.5 * dD_nodes[1:M] * grad[1:M])
+    J_banded[2, -1] = 0.0
+    return J_banded
+
+
+def _paso_newton_1D(D_func, dD_func, theta_old, r, tol, maxiter, est=ESTADISTICAS_NULAS):
+    """Un paso de Euler implícito resuelto por Newton-Raphson. Devuelve (theta, iteraciones, convergido)."""
+    M = len(theta_old) - 2
+    theta_k = theta_old.copy()
+
+    n_iter = 0
+    convergido = False
+    for _ in range(maxiter):
+        n_iter += 1
+        with est.fase('evaluacion_D'):
+            D_nodes = D_func(theta_k)
+            dD_nodes = dD_func(theta_k)
+        with est.fase('ensamblado'):
+            flux = 0.5 * (D_nodes[:-1] + D_nodes[1:]) * np.diff(theta_k)
+            residuo = theta_k[1:M + 1] - theta_old[1:M + 1] - r * np.diff(flux)
+            J_banded = _jacobiano_richards_1D(D_nodes, dD_nodes, theta_k, r)
+        try:
+            with est.fase('resolucion_lineal'):
+                delta = solve_banded((1, 1), J_banded, -residuo, overwrite_ab=True, overwrite_b=True)
+            est.contar_resoluciones()
+        except Exception as e:
+            print(f"Error resolviendo sistema: {e}")
+            break
+        theta_k[1:M + 1] += delta
+
+        with est.fase('convergencia'):
+            norma_delta = np.linalg.norm(delta)
+        if norma_delta < tol:
+            convergido = True
+            break
+
+    return theta_k, n_iter, convergido
 
 
 def resolucion_ecuacion_richards_1D_no_lineal(D_func, L, T_final, M, N, theta_initial=None, picard_tol=1e-6,
-                                              picard_maxiter=20):
+                                              picard_maxiter=20, metodo='picard', dD_func=None,
+                                              adaptativo=False, tol_tiempo=1e-3, estadisticas=None,
+                                              snapshots=None, region_activa=False, tol_region=TOL_REGION,
+                                              iteracion=None, esquema='euler'):
     """
     Resuelve la ecuación de Richards 1D no lineal usando Euler Implícito + Picard.
+
+    Con metodo='newton' cada paso se resuelve por Newton-Raphson con el
+    Jacobiano tridiagonal analítico, construido con dD_func (por defecto
+    dD_dtheta_brooks_corey). picard_tol y picard_maxiter se usan entonces como
+    tolerancia e iteraciones máximas de Newton. El total de iteraciones
+    (= resoluciones lineales) se informa por pantalla y en el costo devuelto.
+
+    Con adaptativo=True el paso arranca en T_final/N y se ajusta con el error
+    local estimado (tolerancia tol_tiempo) y la velocidad de convergencia de
+    la iteración no lineal; se informan los pasos aceptados y rechazados.
+
+    Si se pasa estadisticas (instrumentacion.Estadisticas), se registran el
+    tiempo por fase (evaluación de D, ensamblado, resolución, convergencia),
+    las iteraciones de cada paso (incluidos los rechazados) y los sistemas
+    lineales resueltos. Si se pasa snapshots (snapshots.EscritorSnapshots),
+    recibe el perfil inicial y el de cada paso aceptado.
+
+    Con region_activa=True cada paso se resuelve solo en el tramo mojado
+    (D dt/dx^2 > tol_region) más un margen que crece con el frente (ver
+    region_activa.paso_en_region_activa); el resultado coincide con el de
+    todo el dominio a menos de ~tol_region.
+
+    Con iteracion (iteracion_no_lineal.IteracionNoLineal) el Picard usa
+    aceleración de Anderson, predictor desde los pasos previos y parada con
+    norma escalada (independiente de M) en lugar de picard_tol; picard_maxiter
+    sigue acotando las iteraciones.
+
+    Con esquema='cn', 'bdf2' o 'trbdf2' el tiempo se integra con orden 2
+    (ver esquemas_temporales): cada etapa es un paso de Euler implícito desde
+    un lado derecho combinado, resuelto con el mismo metodo, región activa e
+    iteracion. Para los frentes de Brooks-Corey conviene 'trbdf2' (L-estable);
+    en las estadísticas cada etapa cuenta como un paso. El control adaptativo
+    sigue estimando el error como si fuera de orden 1, lo que es conservador.
     """
+    if metodo not in ('picard', 'newton'):
+        raise ValueError(f"metodo debe ser 'picard' o 'newton', no {metodo!r}")
+    if iteracion is not None and metodo != 'picard':
+        raise ValueError("iteracion solo se usa con metodo='picard'")
+    if dD_func is None:
+        dD_func = dD_dtheta_brooks_corey
+    est = estadisticas_o_nulas(estadisticas)
+    est.iniciar()
+
     # Discretización
     dx = L / (M + 1)
     dt = T_final / N
@@ -26,70 +266,162 @@ def resolucion_ecuacion_richards_1D_no_lineal(D_func, L, T_final, M, N, theta_in
     else:
         theta = theta_initial.copy()
 
-    # Bucle temporal
-    for n in range(N):
-        if n % 100 == 0:
-            print(f"B: Paso temporal {n}/{N}")
+    def paso_dominio(theta_n, dt_n, previo=None):
+        if metodo == 'newton':
+            resultado = _paso_newton_1D(D_func, dD_func, theta_n, dt_n / dx ** 2, picard_tol, picard_maxiter, est)
+        else:
+            previo = None if previo is None else (previo[0], -previo[1] / dx ** 2)
+            resultado = _paso_picard_1D(D_func, theta_n, -dt_n / (dx ** 2), picard_tol, picard_maxiter, est,
+                                        iteracion, previo)
+        est.registrar_paso(resultado[1])
+        return resultado
 
-        theta_old = theta.copy()
-        theta_k = theta_old.copy()
+    estado_region = {}
 
-        for picard_iter in range(picard_maxiter):
-            theta_prev = theta_k.copy()
+    def paso(theta_n, dt_n, previo=None):
+        if not region_activa:
+            return paso_dominio(theta_n, dt_n, previo)
+        return paso_en_region_activa(paso_dominio, theta_n, dt_n, D_func, dt_n / dx ** 2, estado_region, tol_region,
+                                     previo=previo)
 
-            # Evaluar D en los puntos medios
-            D_nodes = D_func(theta_k)
-            D_half = np.zeros(M + 1)
-            for i in range(M + 1):
-                D_half[i] = 0.5 * (D_nodes[i] + D_nodes[i + 1])
-
-            # Construir matriz del sistema
-            main_diag = np.ones(M)
-            lower_diag = np.zeros(M - 1)
-            upper_diag = np.zeros(M - 1)
-            rhs = np.zeros(M)
-
-            for i in range(M):
-                idx = i + 1
-                a = -dt / (dx ** 2) * D_half[i]
-                c = -dt / (dx ** 2) * D_half[i + 1]
-                b = 1.0 - (a + c)
-
-                main_diag[i] = b
-                if i > 0:
-                    lower_diag[i - 1] = a
-                if i < M - 1:
-                    upper_diag[i] = c
-
-                rhs[i] = theta_old[idx]
-
-                if i == 0:
-                    rhs[i] -= a * theta_k[0]
-                if i == M - 1:
-                    rhs[i] -= c * theta_k[-1]
-
-            # Resolver sistema tridiagonal
-            A_banded = np.vstack([np.insert(upper_diag, 0, 0),
-                                  main_diag,
-                                  np.append(lower_diag, 0)])
-
-            try:
-                theta_interior = solve_banded((1, 1), A_banded, rhs)
-                theta_k[1:M + 1] = theta_interior
-            except Exception as e:
-                print(f"Error resolviendo sistema: {e}")
-                break
+    integrador = IntegradorTemporal(esquema)
 
-            diff = np.linalg.norm(theta_k - theta_prev)
-            if diff < picard_tol:
-                break
+    def aplicar_operador(theta_n):
+        with est.fase('evaluacion_D'):
+            D_nodes = D_func(theta_n)
+        return _operador_richards_1D(D_nodes, theta_n, dx)
 
-        theta = theta_k.copy()
+    # Iteraciones de cada paso intentado (en el adaptativo, también los rechazados)
+    iteraciones_pasos = []
+
+    def paso_temporal(theta_n, dt_n, previo):
+        resultado = integrador.paso(paso, aplicar_operador, theta_n, dt_n, previo)
+        iteraciones_pasos.append(int(resultado[1]))
+        return resultado
+
+    if snapshots is not None:
+        snapshots.registrar(0, 0.0, theta)
+
+    # Bucle temporal
+    if adaptativo:
+        al_aceptar = None if snapshots is None else snapshots.registrar
+        theta, info = integrar_adaptativo(paso_temporal, theta, T_final, dt, tol_tiempo, al_aceptar=al_aceptar)
+        N = info['aceptados']
+        total_iter = info['iteraciones']
+        print(f"B: Paso adaptativo - {info['aceptados']} pasos aceptados, {info['rechazados']} rechazados, "
+              f"dt en [{min(info['dt']):.3e}, {max(info['dt']):.3e}]")
+    else:
+        iteraciones = np.zeros(N, dtype=int)
+        previo = None
+        for n in range(N):
+            if n % 100 == 0:
+                print(f"B: Paso temporal {n}/{N}")
+            theta_n = theta
+            theta, iteraciones[n], _ = paso_temporal(theta_n, dt, previo)
+            previo = (theta_n, dt)
+            if snapshots is not None:
+                snapshots.registrar(n + 1, (n + 1) * dt, theta)
+        total_iter = int(iteraciones.sum())
 
-    computational_cost = f"O(N * M * picard_iter) ≈ O({N} * {M})"
+    iter_prom = total_iter / N
+    iter_max = max(iteraciones_pasos, default=0)
+    print(f"B: {metodo.capitalize()} - {total_iter} iteraciones ({iter_prom:.2f} por paso, máx. {iter_max})")
+    if region_activa and estado_region.get('caja') is not None:
+        caja = estado_region['caja'][0]
+        print(f"B: Región activa final [{caja.start}, {caja.stop}) de {M + 2} nodos (margen {estado_region['margen']})")
+
+    computational_cost = f"O(N * M * iter) ≈ O({N} * {M} * {iter_prom:.1f}) [{metodo}]"
+    if esquema != 'euler':
+        computational_cost += f" [{esquema}]"
+    if snapshots is not None:
+        snapshots.volcar()
+    est.finalizar()
     return x, theta, computational_cost
 
 
+def condiciones_iniciales_gaussianas(x, anchos, amplitud=0.8, centro=None):
+    """Perfiles amplitud * exp(-(x - centro)^2 / (2 sigma^2)), uno por ancho sigma: forma (len(anchos), len(x))."""
+    if centro is None:
+        centro = 0.5 * (x[0] + x[-1])
+    sigma = np.asarray(anchos, dtype=np.float64)[:, None]
+    return amplitud * np.exp(-((x - centro) ** 2) / (2 * sigma ** 2))
+
+
+def resolucion_richards_1D_conjunto(D_func, L, T_final, M, N, thetas_iniciales, picard_tol=1e-6, picard_maxiter=20,
+                                    estadisticas=None, esquema='euler'):
+    """
+    Resuelve Richards 1D (Euler implícito + Picard, paso fijo) para un
+    conjunto de K condiciones iniciales sobre el mismo suelo y la misma
+    malla, p. ej. gaussianas de distintos anchos (ver
+    condiciones_iniciales_gaussianas).
+
+    Los K perfiles se avanzan juntos con un eje de lote delante: D se evalúa,
+    las diagonales se arman y los sistemas tridiagonales se resuelven (en una
+    sola llamada a LAPACK, como un sistema por bloques) para todos a la vez.
+    La convergencia de Picard es por miembro con el mismo criterio que
+    resolucion_ecuacion_richards_1D_no_lineal, y los miembros que convergen
+    dejan de iterarse en ese paso; cada miembro coincide (al redondeo) con su
+    corrida individual.
+
+    Args:
+        D_func (callable): Difusividad D(theta), vectorizada.
+        L (float): Longitud del dominio.
+        T_final (float): Tiempo final.
+        M (int): Puntos interiores.
+        N (int): Pasos temporales.
+        thetas_iniciales (np.array): Perfiles iniciales de forma (K, M+2).
+        picard_tol (float): Tolerancia de Picard por miembro.
+        picard_maxiter (int): Iteraciones máximas de Picard por paso.
+        estadisticas (Estadisticas, opcional): Tiempos por fase, iteraciones
+            de cada paso (sumadas sobre los miembros) y sistemas resueltos.
+        esquema (str): Esquema temporal (ver esquemas_temporales).
+
+    Returns:
+        tuple: (x, thetas, iteraciones) con los perfiles (K, M+2) a T_final y
+            las iteraciones de Picard de cada miembro.
+    """
+    thetas_iniciales = np.asarray(thetas_iniciales, dtype=np.float64)
+    if thetas_iniciales.ndim != 2 or thetas_iniciales.shape[1] != M + 2:
+        raise ValueError(f"thetas_iniciales debe tener forma (K, {M + 2}), no {thetas_iniciales.shape}")
+    est = estadisticas_o_nulas(estadisticas)
+    est.iniciar()
+
+    dx = L / (M + 1)
+    dt = T_final / N
+    x = np.linspace(0, L, M + 2)
+    theta = thetas_iniciales.copy()
+    K = theta.shape[0]
+
+    def paso(theta_n, dt_n, previo=None):
+        resultado = _paso_picard_1D_conjunto(D_func, theta_n, -dt_n / dx ** 2, picard_tol, picard_maxiter, est)
+        est.registrar_paso(resultado[1].sum())
+        return resultado
+
+    def aplicar_operador(theta_n):
+        with est.fase('evaluacion_D'):
+            D_nodes = D_func(theta_n)
+        return _operador_richards_1D(D_nodes, theta_n, dx)
+
+    integrador = IntegradorTemporal(esquema)
+    iteraciones = np.zeros(K, dtype=int)
+    sin_converger = np.zeros(K, dtype=int)
+    previo = None
+    for _ in range(N):
+        theta_n = theta
+        theta, iteraciones_paso, convergido = integrador.paso(paso, aplicar_operador, theta_n, dt, previo)
+        previo = (theta_n, dt)
+        iteraciones += iteraciones_paso
+        sin_converger += ~convergido
+
+    print(f"B: Conjunto de {K} miembros - {iteraciones.sum()} iteraciones de Picard "
+          f"(por miembro entre {iteraciones.min()} y {iteraciones.max()})")
+    if sin_converger.any():
+        print(f"B: {np.count_nonzero(sin_converger)} miembros con pasos sin converger")
+
+    est.finalizar()
+    return x, theta, iteraciones
+
+
 def validacion_con_boltzmann(D_func, L, T_final, theta_initial):
     """
     Valida la solución numérica con la transformación de Boltzmann CORREGIDA.
@@ -121,8 +453,8 @@ def validacion_con_boltzmann(D_func, L, T_final, theta_initial):
         
         print(f"B: Usando eta_max = {eta_max:.1f} (D0={D0_promedio:.2e} m^2/s)")
 
-        # Resolver EDO de Boltzmann con parámetros robustos
-        eta, theta_eta = solve_boltzmann_edo(theta_a, theta_b, eta_max=eta_max, n_points=300)
+        # Perfil de Boltzmann por disparo (cacheado: no depende de t ni de L)
+        eta, theta_eta = perfil_boltzmann(theta_a, theta_b, eta_max=eta_max, n_points=300, metodo='disparo')
 
         # Transformación: x = η * √(4*D0*t)
         x_boltzmann = eta * np.sqrt(4 * D0_promedio * T_final)
@@ -1,5 +1,6 @@
 import numpy as np
-from scipy.linalg import solve_banded
+from solver_tridiagonal import factorizar_tridiagonal, resolver_tridiagonal_factorizada
+from instrumentacion import estadisticas_o_nulas
 import matplotlib.pyplot as plt
 
 def analytical_solution_2d(x, y, t, D0, Lx, Ly):
@@ -11,7 +12,44 @@ def analytical_solution_2d(x, y, t, D0, Lx, Ly):
     lambda_y = np.pi / Ly
     return np.sin(lambda_x * X) * np.sin(lambda_y * Y) * np.exp(-D0 * (lambda_x**2 + lambda_y**2) * t)
 
-def resolucion_ecuacion_difusion_2D(D0, Lx, Ly, T_final, Nx, Ny, N):
+def _paso_adi_lineal(theta_int, fact_x, fact_y, rx, ry, est):
+    """
+    Un paso ADI completo. Cada barrido arma todos los lados derechos con una
+    sola operación de arreglos y resuelve todas las líneas en una única llamada
+    contra la factorización precalculada.
+    """
+    Nx, Ny = theta_int.shape[0] - 2, theta_int.shape[1] - 2
+
+    # Paso 1: implícito en x (cada columna de b es una línea j)
+    theta_star = np.zeros_like(theta_int)
+    theta_star[0, :] = theta_int[0, :]
+    theta_star[-1, :] = theta_int[-1, :]
+
+    with est.fase('ensamblado'):
+        b = np.empty((Nx, Ny), order='F')
+        b[...] = (1 - 2 * ry) * theta_int[1:-1, 1:-1] + ry * (theta_int[1:-1, :-2] + theta_int[1:-1, 2:])
+    with est.fase('resolucion_lineal'):
+        theta_star[1:-1, 1:-1] = resolver_tridiagonal_factorizada(fact_x, b, sobrescribir=True)
+
+    # Paso 2: implícito en y (cada fila de b es una línea i; b.T es Fortran-contiguo)
+    theta_next = np.zeros_like(theta_int)
+    theta_next[:, 0] = theta_star[:, 0]
+    theta_next[:, -1] = theta_star[:, -1]
+
+    with est.fase('ensamblado'):
+        b = (1 - 2 * rx) * theta_star[1:-1, 1:-1] + rx * (theta_star[:-2, 1:-1] + theta_star[2:, 1:-1])
+    with est.fase('resolucion_lineal'):
+        theta_next[1:-1, 1:-1] = resolver_tridiagonal_factorizada(fact_y, b.T, sobrescribir=True).T
+    est.contar_resoluciones(Nx + Ny)
+
+    # Aplicar condiciones de borde Dirichlet homogéneas
+    theta_next[0, :] = 0.0
+    theta_next[-1, :] = 0.0
+    theta_next[:, 0] = 0.0
+    theta_next[:, -1] = 0.0
+    return theta_next
+
+def resolucion_ecuacion_difusion_2D(D0, Lx, Ly, T_final, Nx, Ny, N, estadisticas=None, snapshots=None):
     """
     Método ADI (Alternating Direction Implicit) para la ecuación de difusión 2D:
         ∂θ/∂t = D0 * (∂²θ/∂x² + ∂²θ/∂y²)
@@ -28,12 +66,19 @@ def resolucion_ecuacion_difusion_2D(D0, Lx, Ly, T_final, Nx, Ny, N):
         T_final (float): Tiempo final de integración
         Nx, Ny (int): Número de puntos interiores en cada dirección
         N (int): Número de pasos temporales
+        estadisticas (Estadisticas, opcional): Registro de tiempos por fase y
+            sistemas resueltos (una línea ADI cuenta como un sistema)
+        snapshots (EscritorSnapshots, opcional): Recibe el campo inicial y el
+            de cada paso para guardar la historia temporal en disco
     
     Returns:
         theta_int (ndarray): Solución numérica en la malla (Nx+2) × (Ny+2)
         theta_an (ndarray): Solución analítica para comparación
         error_L2 (float): Error L2 discreto entre solución numérica y analítica
     """
+    est = estadisticas_o_nulas(estadisticas)
+    est.iniciar()
+
     dx = Lx / (Nx + 1)
     dy = Ly / (Ny + 1)
     dt = T_final / N
@@ -59,43 +104,26 @@ def resolucion_ecuacion_difusion_2D(D0, Lx, Ly, T_final, Nx, Ny, N):
     Ay_ab[0, 1:] = -ry
     Ay_ab[2, :-1] = -ry
 
+    # Las matrices no cambian entre líneas ni entre pasos: se factorizan una vez
+    with est.fase('factorizacion'):
+        fact_x = factorizar_tridiagonal(Ax_ab)
+        fact_y = factorizar_tridiagonal(Ay_ab)
+
     # Bucle temporal
     theta_int = theta.copy()
-    for _ in range(N):
-        # Paso 1: implícito en x
-        theta_star = np.zeros_like(theta_int)
-        theta_star[0, :] = theta_int[0, :]
-        theta_star[-1, :] = theta_int[-1, :]
-        
-        for j in range(1, Ny + 1):
-            b = np.zeros(Nx)
-            for i_idx in range(Nx):
-                i = i_idx + 1
-                b[i_idx] = (1 - 2 * ry) * theta_int[i, j] + ry * (theta_int[i, j - 1] + theta_int[i, j + 1])
-            theta_star[1:Nx+1, j] = solve_banded((1, 1), Ax_ab, b)
-
-        # Paso 2: implícito en y
-        theta_next = np.zeros_like(theta_int)
-        theta_next[:, 0] = theta_star[:, 0]
-        theta_next[:, -1] = theta_star[:, -1]
-        
-        for i in range(1, Nx + 1):
-            b = np.zeros(Ny)
-            for j_idx in range(Ny):
-                j = j_idx + 1
-                b[j_idx] = (1 - 2 * rx) * theta_star[i, j] + rx * (theta_star[i - 1, j] + theta_star[i + 1, j])
-            theta_next[i, 1:Ny+1] = solve_banded((1, 1), Ay_ab, b)
-
-        # Aplicar condiciones de borde Dirichlet homogéneas
-        theta_next[0, :] = 0.0
-        theta_next[-1, :] = 0.0
-        theta_next[:, 0] = 0.0
-        theta_next[:, -1] = 0.0
-        theta_int = theta_next.copy()
+    if snapshots is not None:
+        snapshots.registrar(0, 0.0, theta_int)
+    for n in range(N):
+        theta_int = _paso_adi_lineal(theta_int, fact_x, fact_y, rx, ry, est)
+        if snapshots is not None:
+            snapshots.registrar(n + 1, (n + 1) * dt, theta_int)
+    if snapshots is not None:
+        snapshots.volcar()
 
     theta_an = analytical_solution_2d(x, y, T_final, D0, Lx, Ly)
     dxdy = dx * dy
     error_L2 = np.sqrt(np.sum((theta_int - theta_an) ** 2) * dxdy)
+    est.finalizar()
     return theta_int, theta_an, error_L2
 
 def grafica_convergencia(M_values, errors_L2):
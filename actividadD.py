@@ -1,121 +1,140 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.linalg import solve_banded
+from richards_2d import resolver_richards_2d_adi, resolver_richards_2d_conjunto, distancias_al_centro
+from instrumentacion import estadisticas_o_nulas
 
-def solver_richards_2d_circular(D_func, Lx, Ly, T_final, Nx, Ny, N):
+def solver_richards_2d_circular(D_func, Lx, Ly, T_final, Nx, Ny, N, adaptativo=False, tol_tiempo=1e-3,
+                                estadisticas=None, snapshots=None, checkpoint=None, cada_checkpoint=None,
+                                reanudar=None, metodo='adi', simetria=False,
+                                region_activa=False, iteracion=None, esquema='euler'):
     """
     Resuelve Richards 2D para una gota CIRCULAR.
     """
-    dx, dy = Lx / (Nx + 1), Ly / (Ny + 1)
-    dt = T_final / N
-    x, y = np.linspace(0, Lx, Nx + 2), np.linspace(0, Ly, Ny + 2)
-    X, Y = np.meshgrid(x, y, indexing='ij')
-
     # --- CONDICIÓN INICIAL CIRCULAR ---
-    cx, cy = Lx / 2.0, Ly / 2.0
+    # Distancias al centro exactamente simétricas (ver distancias_al_centro)
+    DX, DY = np.meshgrid(distancias_al_centro(Lx, Nx), distancias_al_centro(Ly, Ny), indexing='ij')
     R_gota = min(Lx, Ly) / 5.0
+    mask = DX ** 2 + DY ** 2 <= R_gota ** 2
 
-    # Inicialización
-    theta = np.ones_like(X) * 1e-4
-    mask = (X - cx) ** 2 + (Y - cy) ** 2 <= R_gota ** 2
-    theta[mask] = 0.90
-
-    # --- BUCLE TEMPORAL (ADI) ---
-    for n in range(N):
-        theta_k = theta.copy()
-        for _ in range(15):
-            theta_prev = theta_k.copy()
-            D_vals = D_func(theta_k)
-
-            # Promedios de D
-            D_x = 0.5 * (D_vals[:-1, :] + D_vals[1:, :])
-            D_y = 0.5 * (D_vals[:, :-1] + D_vals[:, 1:])
-
-            rx, ry = dt / dx ** 2, dt / dy ** 2
-
-            # --- Paso 1: Implícito en X ---
-            theta_half = theta_k.copy()
-            for j in range(1, Ny + 1):
-                term_y = ry * (D_y[1:-1, j] * (theta_k[1:-1, j + 1] - theta_k[1:-1, j]) -
-                               D_y[1:-1, j - 1] * (theta_k[1:-1, j] - theta_k[1:-1, j - 1]))
-
-                # Construcción de diagonales X
-                D_w = D_x[:-1, j]
-                D_e = D_x[1:, j]
-
-                main = 1.0 + rx * (D_w + D_e)
-                upper = -rx * D_e[:-1]
-                lower = -rx * D_w[1:]
-
-                rhs = theta[1:-1, j] + term_y
-
-                ab = np.zeros((3, Nx))
-                ab[0, 1:] = upper
-                ab[1, :] = main
-                ab[2, :-1] = lower
-                theta_half[1:-1, j] = solve_banded((1, 1), ab, rhs)
-
-            # --- Paso 2: Implícito en Y ---
-            theta_next = theta_half.copy()
-            for i in range(1, Nx + 1):
-                term_x = rx * (D_x[i, 1:-1] * (theta_half[i + 1, 1:-1] - theta_half[i, 1:-1]) -
-                               D_x[i - 1, 1:-1] * (theta_half[i, 1:-1] - theta_half[i - 1, 1:-1]))
-
-                # Construcción de diagonales Y
-                D_s = D_y[i, :-1]
-                D_n = D_y[i, 1:]
-
-                main = 1.0 + ry * (D_s + D_n)
-                upper = -ry * D_n[:-1]
-                lower = -ry * D_s[1:]
-
-                rhs = theta[i, 1:-1] + term_x
-
-                ab = np.zeros((3, Ny))
-                ab[0, 1:] = upper
-                ab[1, :] = main
-                ab[2, :-1] = lower
-                theta_next[i, 1:-1] = solve_banded((1, 1), ab, rhs)
-
-            theta_next[[0, -1], :] = 1e-4
-            theta_next[:, [0, -1]] = 1e-4
-            theta_k = theta_next
-            if np.linalg.norm(theta_k - theta_prev) < 1e-4: break
-        theta = theta_k
+    # --- BUCLE TEMPORAL (motor ADI + Picard común con la actividad E) ---
+    X, Y, theta = resolver_richards_2d_adi(D_func, Lx, Ly, T_final, Nx, Ny, N, mask, adaptativo=adaptativo,
+                                           tol_tiempo=tol_tiempo, estadisticas=estadisticas, snapshots=snapshots,
+                                           checkpoint=checkpoint, cada_checkpoint=cada_checkpoint, reanudar=reanudar,
+                                           metodo=metodo, simetria=simetria, region_activa=region_activa,
+                                           iteracion=iteracion, esquema=esquema)
 
     return X, Y, theta, R_gota
 
 
-def solver_1d_radial(D_func, R_max, T_final, Nr, N, R_gota):
-    """Solver 1D en coordenadas cilíndricas para validar."""
-    dr, dt = R_max / Nr, T_final / N
-    r = np.linspace(0, R_max, Nr + 1)
+def solver_richards_2d_circular_conjunto(D_func, Lx, Ly, T_final, Nx, Ny, N, radios, estadisticas=None,
+                                         esquema='euler'):
+    """
+    Resuelve Richards 2D para un conjunto de gotas CIRCULARES de distintos
+    radios sobre el mismo suelo y la misma malla, todas a la vez (ver
+    richards_2d.resolver_richards_2d_conjunto). Devuelve (X, Y, thetas,
+    iteraciones) con thetas de forma (len(radios), Nx+2, Ny+2).
+    """
+    # --- CONDICIONES INICIALES: una máscara circular por radio ---
+    DX, DY = np.meshgrid(distancias_al_centro(Lx, Nx), distancias_al_centro(Ly, Ny), indexing='ij')
+    R = np.asarray(radios, dtype=np.float64)[:, None, None]
+    masks = DX ** 2 + DY ** 2 <= R ** 2
+
+    return resolver_richards_2d_conjunto(D_func, Lx, Ly, T_final, Nx, Ny, N, masks, estadisticas=estadisticas,
+                                         esquema=esquema)
+
+
+def malla_radial(R_max, Nr, graduacion=0.0, r_foco=None):
+    """
+    Nodos radiales r_0=0 < ... < r_Nr=R_max. Con graduacion > 0 se concentran
+    alrededor de r_foco con el estiramiento de Roberts (seno hiperbólico):
+    graduacion es la intensidad (0 = malla uniforme, ~4-8 = fuerte).
+    """
+    if graduacion <= 0.0:
+        return np.linspace(0, R_max, Nr + 1)
+    c = (R_max / 2.0 if r_foco is None else r_foco) / R_max
+    b = graduacion
+    A = np.log((1 + (np.exp(b) - 1) * c) / (1 + (np.exp(-b) - 1) * c)) / (2 * b)
+    xi = np.linspace(0, 1, Nr + 1)
+    r = R_max * c * (1 + np.sinh(b * (xi - A)) / np.sinh(b * A))
+    r[0], r[-1] = 0.0, R_max
+    return r
+
+
+def solver_1d_radial(D_func, R_max, T_final, Nr, N, R_gota, estadisticas=None, graduacion=0.0, r_foco=None,
+                     iteracion=None):
+    """
+    Solver 1D en coordenadas cilíndricas para validar (Euler implícito +
+    Picard, volúmenes finitos en r con simetría en r=0 y theta=1e-4 en R_max).
+
+    El ensamblado es por rebanadas con D evaluada una vez por iteración y
+    coeficientes geométricos precalculados. Con graduacion > 0 la malla se
+    concentra alrededor de r_foco (por defecto R_gota, donde queda el frente),
+    ver malla_radial: con pocos nodos se obtiene la precisión de una malla
+    uniforme mucho más fina. Con iteracion (IteracionNoLineal) el Picard usa
+    Anderson, predictor y parada escalada en lugar de la tolerancia fija.
+
+    Returns:
+        tuple: (r, theta) nodos y saturación a T_final.
+    """
+    est = estadisticas_o_nulas(estadisticas)
+    est.iniciar()
+    dt = T_final / N
+    r = malla_radial(R_max, Nr, graduacion, R_gota if r_foco is None else r_foco)
+
+    # Volúmenes de control [r_i-1/2, r_i+1/2] (por unidad de ángulo) y
+    # coeficientes dt * r_cara / (V_i * h_cara) de cada cara
+    h = np.diff(r)
+    r_cara = 0.5 * (r[:-1] + r[1:])
+    volumen = np.empty(Nr)
+    volumen[0] = 0.5 * r_cara[0] ** 2
+    volumen[1:] = 0.5 * (r_cara[1:] ** 2 - r_cara[:-1] ** 2)
+    g_mas = dt * r_cara / (volumen * h)              # cara i+1/2 del nodo i (i = 0..Nr-1)
+    g_menos = dt * r_cara[:-1] / (volumen[1:] * h[:-1])  # cara i-1/2 del nodo i (i = 1..Nr-1)
 
     theta = np.ones(Nr + 1) * 1e-4
     theta[r <= R_gota] = 0.90
 
+    ab = np.zeros((3, Nr + 1))
+    ab[1, Nr] = 1.0
+
+    def barrido(theta_k):
+        with est.fase('evaluacion_D'):
+            D_nodos = D_func(theta_k)
+            D_mid = 0.5 * (D_nodos[:-1] + D_nodos[1:])
+        with est.fase('ensamblado'):
+            c_p = g_mas * D_mid
+            c_m = g_menos * D_mid[:-1]
+            ab[1, :Nr] = 1.0 + c_p
+            ab[1, 1:Nr] += c_m
+            ab[0, 1:] = -c_p        # superior
+            ab[2, :Nr - 1] = -c_m   # inferior
+            rhs = theta.copy()
+            rhs[Nr] = 1e-4
+        with est.fase('resolucion_lineal'):
+            theta_new = solve_banded((1, 1), ab, rhs)
+        est.contar_resoluciones()
+        return theta_new
+
+    previo = None
     for n in range(N):
+        if iteracion is not None:
+            theta_n = theta
+            theta, n_iter, _ = iteracion.resolver(barrido, theta_n, dt, 10, est, previo=previo)
+            previo = (theta_n, dt)
+            est.registrar_paso(n_iter)
+            continue
         theta_k = theta.copy()
+        n_iter = 0
         for _ in range(10):  # Picard
-            D_mid = 0.5 * (D_func(theta_k)[:-1] + D_func(theta_k)[1:])
-            main, upper, lower, rhs = np.zeros(Nr + 1), np.zeros(Nr), np.zeros(Nr), np.zeros(Nr + 1)
-
-            # Singularidad r=0
-            alpha_0 = 4.0 * dt / dr ** 2 * D_mid[0]
-            main[0], upper[0], rhs[0] = 1 + alpha_0, -alpha_0, theta[0]
-
-            # Nodos internos
-            for i in range(1, Nr):
-                c_p = (dt / (r[i] * dr ** 2)) * (r[i] + dr / 2) * D_mid[i]
-                c_m = (dt / (r[i] * dr ** 2)) * (r[i] - dr / 2) * D_mid[i - 1]
-                main[i], upper[i], lower[i - 1], rhs[i] = 1 + c_p + c_m, -c_p, -c_m, theta[i]
-
-            main[Nr], rhs[Nr] = 1.0, 1e-4
-            ab = np.vstack([np.insert(upper, 0, 0), main, np.append(lower, 0)])
-            theta_new = solve_banded((1, 1), ab, rhs)
+            n_iter += 1
+            theta_new = barrido(theta_k)
+            # Con convergencia se conserva el iterado previo, como siempre hizo este solver
             if np.linalg.norm(theta_new - theta_k) < 1e-5: break
             theta_k = theta_new
+        est.registrar_paso(n_iter)
         theta = theta_k
+    est.finalizar()
     return r, theta
 
 
@@ -1,86 +1,44 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.linalg import solve_banded
+from richards_2d import resolver_richards_2d_adi, resolver_richards_2d_conjunto, distancias_al_centro
 
-def solver_richards_2d_eliptica(D_func, Lx, Ly, T_final, Nx, Ny, N):
+def solver_richards_2d_eliptica(D_func, Lx, Ly, T_final, Nx, Ny, N, adaptativo=False, tol_tiempo=1e-3,
+                                estadisticas=None, snapshots=None, checkpoint=None, cada_checkpoint=None,
+                                reanudar=None, metodo='adi', simetria=False,
+                                region_activa=False, iteracion=None, esquema='euler'):
     """
     Resuelve Richards 2D para una gota ELÍPTICA (Relación 2:1).
     """
-    dx, dy = Lx / (Nx + 1), Ly / (Ny + 1)
-    dt = T_final / N
-    x, y = np.linspace(0, Lx, Nx + 2), np.linspace(0, Ly, Ny + 2)
-    X, Y = np.meshgrid(x, y, indexing='ij')
-
     # --- CONDICIÓN INICIAL ELÍPTICA ---
-    cx, cy = Lx / 2.0, Ly / 2.0
+    # Distancias al centro exactamente simétricas (ver distancias_al_centro)
+    DX, DY = np.meshgrid(distancias_al_centro(Lx, Nx), distancias_al_centro(Ly, Ny), indexing='ij')
     R_base = min(Lx, Ly) / 6.0
     a, b = R_base * 2.0, R_base
+    mask = (DX ** 2 / a ** 2) + (DY ** 2 / b ** 2) <= 1.0
 
-    theta = np.ones_like(X) * 1e-4
-    mask = ((X - cx) ** 2 / a ** 2) + ((Y - cy) ** 2 / b ** 2) <= 1.0
-    theta[mask] = 0.90
-
-    for n in range(N):
-        theta_k = theta.copy()
-        for _ in range(15):
-            theta_prev = theta_k.copy()
-            D_vals = D_func(theta_k)
-
-            # Promedios de D
-            D_x = 0.5 * (D_vals[:-1, :] + D_vals[1:, :])
-            D_y = 0.5 * (D_vals[:, :-1] + D_vals[:, 1:])
-
-            rx, ry = dt / dx ** 2, dt / dy ** 2
-
-            # --- Paso 1: Implícito X ---
-            theta_half = theta_k.copy()
-            for j in range(1, Ny + 1):
-                term_y = ry * (D_y[1:-1, j] * (theta_k[1:-1, j + 1] - theta_k[1:-1, j]) -
-                               D_y[1:-1, j - 1] * (theta_k[1:-1, j] - theta_k[1:-1, j - 1]))
-
-                D_w = D_x[:-1, j]  # i-1/2
-                D_e = D_x[1:, j]  # i+1/2
-
-                main = 1.0 + rx * (D_w + D_e)
-                upper = -rx * D_e[:-1]
-                lower = -rx * D_w[1:]
-
-                rhs = theta[1:-1, j] + term_y
-
-                ab = np.zeros((3, Nx))
-                ab[0, 1:] = upper
-                ab[1, :] = main
-                ab[2, :-1] = lower
-                theta_half[1:-1, j] = solve_banded((1, 1), ab, rhs)
+    return resolver_richards_2d_adi(D_func, Lx, Ly, T_final, Nx, Ny, N, mask,
+                                     adaptativo=adaptativo, tol_tiempo=tol_tiempo, estadisticas=estadisticas,
+                                     snapshots=snapshots, checkpoint=checkpoint, cada_checkpoint=cada_checkpoint,
+                                     reanudar=reanudar, metodo=metodo, simetria=simetria,
+                                     region_activa=region_activa, iteracion=iteracion, esquema=esquema)
 
-            # --- Paso 2: Implícito Y ---
-            theta_next = theta_half.copy()
-            for i in range(1, Nx + 1):
-                term_x = rx * (D_x[i, 1:-1] * (theta_half[i + 1, 1:-1] - theta_half[i, 1:-1]) -
-                               D_x[i - 1, 1:-1] * (theta_half[i, 1:-1] - theta_half[i - 1, 1:-1]))
-
-                D_s = D_y[i, :-1]  # j-1/2
-                D_n = D_y[i, 1:]  # j+1/2
-
-                main = 1.0 + ry * (D_s + D_n)
-                upper = -ry * D_n[:-1]
-                lower = -ry * D_s[1:]
-
-                rhs = theta[i, 1:-1] + term_x
-
-                ab = np.zeros((3, Ny))
-                ab[0, 1:] = upper
-                ab[1, :] = main
-                ab[2, :-1] = lower
-                theta_next[i, 1:-1] = solve_banded((1, 1), ab, rhs)
-
-            theta_next[[0, -1], :] = 1e-4
-            theta_next[:, [0, -1]] = 1e-4
-            theta_k = theta_next
-            if np.linalg.norm(theta_k - theta_prev) < 1e-4: break
-        theta = theta_k
+def solver_richards_2d_eliptica_conjunto(D_func, Lx, Ly, T_final, Nx, Ny, N, relaciones, estadisticas=None,
+                                         esquema='euler'):
+    """
+    Resuelve Richards 2D para un conjunto de gotas ELÍPTICAS con semiejes
+    (relacion * R_base, R_base), todas a la vez (ver
+    richards_2d.resolver_richards_2d_conjunto); relacion=2 es la gota de
+    solver_richards_2d_eliptica. Devuelve (X, Y, thetas, iteraciones).
+    """
+    # --- CONDICIONES INICIALES: una máscara elíptica por relación de aspecto ---
+    DX, DY = np.meshgrid(distancias_al_centro(Lx, Nx), distancias_al_centro(Ly, Ny), indexing='ij')
+    R_base = min(Lx, Ly) / 6.0
+    a = R_base * np.asarray(relaciones, dtype=np.float64)[:, None, None]
+    b = R_base
+    masks = (DX ** 2 / a ** 2) + (DY ** 2 / b ** 2) <= 1.0
 
-    return X, Y, theta
+    return resolver_richards_2d_conjunto(D_func, Lx, Ly, T_final, Nx, Ny, N, masks, estadisticas=estadisticas,
+                                         esquema=esquema)
 
 def graficar_resultados_E(X, Y, theta, Lx, Ly, T_final):
     """Grafica la gota elíptica."""
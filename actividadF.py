@@ -1,57 +1,40 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import time
-from actividadA import resolucion_ecuacion_difusion_linea_1D
-from actividadC import resolucion_ecuacion_difusion_2D
-
-def analisis_costo_computacional():
-    """Retorna un diccionario con los datos de tiempos."""
-    resultados = {}
+from benchmark import ejecutar_suite, imprimir_resultados
+
+def analisis_costo_computacional(repeticiones=3, calentamiento=1, max_workers=1):
+    """
+    Retorna un diccionario con los datos de tiempos de todos los solvers
+    (suite de benchmark.py: calentamiento, repeticiones, mediana/IQR y
+    exponente de escalamiento de cada caso).
+    """
     print(">>> Midiendo tiempos (Actividad F)...")
-
-    # A: 1D Lineal
-    M_values_A = [49, 99, 199, 399]
-    N_values_A = [500, 1000, 2000, 4000]
-    tiempos_A = []
-    for M, N in zip(M_values_A, N_values_A):
-        start = time.time()
-        resolucion_ecuacion_difusion_linea_1D(0.01, 1.0, 0.5, M, N)
-        tiempos_A.append(time.time() - start)
-    resultados['A'] = {'M': M_values_A, 'N': N_values_A, 'tiempos': tiempos_A}
-
-    # C: 2D Lineal
-    M_values_C = [9, 19, 39, 79]
-    tiempos_C = []
-    for M in M_values_C:
-        start = time.time()
-        resolucion_ecuacion_difusion_2D(0.01, 1.0, 1.0, 0.1, M, M, 100)
-        tiempos_C.append(time.time() - start)
-    resultados['C'] = {'M': M_values_C, 'tiempos': tiempos_C}
-
-    return resultados
+    resultados = ejecutar_suite(repeticiones=repeticiones, calentamiento=calentamiento, max_workers=max_workers)
+    imprimir_resultados(resultados)
+    return resultados['casos']
 
 
 def graficar_escalamiento_computacional(resultados):
     plt.figure(figsize=(10, 6))
 
-    # A
-    M_A, N_A = resultados['A']['M'], resultados['A']['N']
-    ops_A = [m * n for m, n in zip(M_A, N_A)]
-    plt.loglog(ops_A, resultados['A']['tiempos'], 'o-', label='Actividad A (1D Lineal)')
-
-    # C
-    M_C = resultados['C']['M']
-    ops_C = [100 * m ** 2 for m in M_C]
-    plt.loglog(ops_C, resultados['C']['tiempos'], 's-', label='Actividad C (2D Lineal ADI)')
-
-    # Referencias
-    x_ref = np.logspace(4, 7, 50)
-    plt.loglog(x_ref, x_ref * (resultados['A']['tiempos'][-1] / ops_A[-1]), 'k--', alpha=0.5, label='O(N)')
-
-    plt.xlabel('Operaciones')
-    plt.ylabel('Tiempo [s]')
+    # Casos con malla: tiempo mediano (barras = IQR) vs incógnitas x pasos
+    for nombre, r in resultados.items():
+        if r['exponente'] is None:
+            continue
+        plt.errorbar(r['trabajo'], r['mediana'], yerr=0.5 * np.array(r['iqr']), fmt='o-', capsize=3,
+                     label=f"{nombre}: {r['descripcion']} (p={r['exponente']:.2f})")
+
+    # Referencia O(N) anclada en el caso más costoso de A
+    ops_A, t_A = np.array(resultados['A']['trabajo']), resultados['A']['mediana'][-1]
+    x_ref = np.logspace(np.log10(ops_A[0]) - 1, np.log10(ops_A[-1]), 50)
+    plt.loglog(x_ref, x_ref * (t_A / ops_A[-1]), 'k--', alpha=0.5, label='O(N)')
+
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.xlabel('Trabajo (incógnitas x pasos)')
+    plt.ylabel('Tiempo mediano [s]')
     plt.title('Actividad F: Escalamiento')
-    plt.legend()
+    plt.legend(fontsize=8)
     plt.grid(True, which="both", alpha=0.2)
     plt.savefig('actividadF_escalamiento.png')
-    print("F: Gráfico 'actividadF_escalamiento.png' generado.")
\ No newline at end of file
+    print("F: Gráfico 'actividadF_escalamiento.png' generado.")
@@ -0,0 +1,102 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def grilla_parametros(fijos=None, **ejes):
+    """
+    Producto cartesiano de parámetros como lista de diccionarios de kwargs.
+
+    Ejemplo: grilla_parametros({'D0': 0.01}, Nx=[19, 39], N=[100, 200]) da
+    cuatro casos, todos con D0=0.01.
+    """
+    fijos = {} if fijos is None else dict(fijos)
+    nombres = list(ejes)
+    return [{**fijos, **dict(zip(nombres, valores))} for valores in itertools.product(*ejes.values())]
+
+
+def _ejecutar_caso(solver, indice, kwargs, extraer):
+    """
+    Ejecuta un caso en el proceso trabajador. Devuelve la fila de la tabla; las
+    excepciones se capturan para que un caso fallido no corte el barrido.
+    """
+    inicio = time.perf_counter()
+    try:
+        salida = solver(**kwargs)
+        resultado, error = (salida if extraer is None else extraer(salida)), None
+    except Exception as e:
+        resultado, error = None, f"{type(e).__name__}: {e}"
+    return {'indice': indice, 'parametros': kwargs, 'resultado': resultado,
+            'tiempo': time.perf_counter() - inicio, 'error': error}
+
+
+def iterar_barrido(solver, parametros, max_workers=None, extraer=None):
+    """
+    Ejecuta solver(**p) para cada p de parametros en un ProcessPoolExecutor y
+    entrega las filas a medida que terminan (no en el orden de entrada).
+
+    Args:
+        solver (callable): Función de nivel de módulo (debe poder serializarse).
+        parametros (list[dict]): kwargs de cada caso.
+        max_workers (int, opcional): Procesos; por defecto min(casos, núcleos).
+            Con max_workers=1 los casos corren en serie en este proceso.
+        extraer (callable, opcional): Reduce la salida del solver en el
+            trabajador antes de devolverla (p. ej. operator.itemgetter(2) para
+            quedarse solo con el error), evitando transferir campos completos.
+
+    Yields:
+        dict: Fila {'indice', 'parametros', 'resultado', 'tiempo', 'error'}.
+    """
+    parametros = [dict(p) for p in parametros]
+    if max_workers is None:
+        max_workers = min(len(parametros), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        for indice, kwargs in enumerate(parametros):
+            yield _ejecutar_caso(solver, indice, kwargs, extraer)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futuros = [pool.submit(_ejecutar_caso, solver, indice, kwargs, extraer)
+                   for indice, kwargs in enumerate(parametros)]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+def barrido_parametros(solver, parametros, max_workers=None, extraer=None, al_terminar=None):
+    """
+    Corre un estudio completo en paralelo y devuelve la tabla de resultados
+    ordenada como parametros. El tiempo total es el del caso más lento (con
+    núcleos suficientes) en lugar de la suma de todos.
+
+    Args:
+        solver, parametros, max_workers, extraer: Ver iterar_barrido.
+        al_terminar (callable, opcional): al_terminar(fila) se llama apenas
+            termina cada caso, para informar o graficar progresivamente.
+
+    Returns:
+        list[dict]: Filas {'indice', 'parametros', 'resultado', 'tiempo', 'error'}.
+    """
+    inicio = time.perf_counter()
+    tabla = []
+    for fila in iterar_barrido(solver, parametros, max_workers, extraer):
+        tabla.append(fila)
+        if al_terminar is not None:
+            al_terminar(fila)
+    tabla.sort(key=lambda fila: fila['indice'])
+
+    n_errores = sum(fila['error'] is not None for fila in tabla)
+    print(f"Barrido: {len(tabla)} casos en {time.perf_counter() - inicio:.2f} s "
+          f"(suma de casos {sum(fila['tiempo'] for fila in tabla):.2f} s, {n_errores} con error)")
+    return tabla
+
+
+def columna(tabla, nombre):
+    """
+    Valores de una columna de la tabla: 'resultado', 'tiempo', 'error' o el
+    nombre de un parámetro (None en los casos que no lo tienen).
+    """
+    if nombre in ('indice', 'resultado', 'tiempo', 'error'):
+        return [fila[nombre] for fila in tabla]
+    return [fila['parametros'].get(nombre) for fila in tabla]
@@ -0,0 +1,279 @@
+"""
+Suite de benchmarks de los solvers (actividades A-E, solver radial y EDO de
+Boltzmann) con calentamiento, repeticiones, mediana/IQR, exponentes de
+escalamiento ajustados y salida JSON comparable contra una corrida base.
+
+Uso:
+    python benchmark.py --json bench.json
+    python benchmark.py --base bench.json      # detecta regresiones
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import scipy
+
+from actividadA import resolucion_ecuacion_difusion_linea_1D
+from actividadB import (resolucion_ecuacion_richards_1D_no_lineal, resolucion_richards_1D_conjunto,
+                        condiciones_iniciales_gaussianas)
+from actividadC import resolucion_ecuacion_difusion_2D
+from actividadD import solver_richards_2d_circular, solver_richards_2d_circular_conjunto, solver_1d_radial
+from actividadE import solver_richards_2d_eliptica
+from barrido_parametros import barrido_parametros
+from boltzmann_edo import solve_boltzmann_edo
+from models_soil_models import diffusivity_brooks_corey
+
+REPETICIONES = 5
+CALENTAMIENTO = 1
+# Una regresión debe superar este aumento relativo de la mediana y, además, el ruido (suma de IQR)
+UMBRAL_REGRESION = 0.10
+
+
+# --- Casos: cada uno prepara la corrida fuera de la medición y devuelve (función, trabajo) ---
+# El trabajo es incógnitas x pasos temporales; el exponente ideal respecto de él es 1.
+
+def _caso_A(M):
+    N = 10 * (M + 1)
+    return (lambda: resolucion_ecuacion_difusion_linea_1D(0.01, 1.0, 0.5, M, N)), M * N
+
+
+def _caso_B(M):
+    # Horizonte en que el frente avanza (~0.1 en theta): Picard hace 3-4 iteraciones por
+    # paso; con T_final=0.1 hacía una sola y solo se medía el ensamblado lineal
+    L, T_final, N = 0.5, 1000.0, 200
+    x = np.linspace(0, L, M + 2)
+    theta_inicial = 0.8 * np.exp(-((x - L / 2) ** 2) / (2 * 0.05 ** 2))
+    return (lambda: resolucion_ecuacion_richards_1D_no_lineal(diffusivity_brooks_corey, L, T_final, M, N,
+                                                              theta_inicial)), M * N
+
+
+def _caso_B_conjunto(K):
+    # El tamaño es el número de miembros: un exponente menor que 1 es la ganancia del lote
+    L, T_final, M, N = 0.5, 1000.0, 200, 200
+    x = np.linspace(0, L, M + 2)
+    thetas_iniciales = condiciones_iniciales_gaussianas(x, np.linspace(0.03, 0.08, K))
+    return (lambda: resolucion_richards_1D_conjunto(diffusivity_brooks_corey, L, T_final, M, N,
+                                                    thetas_iniciales)), K * M * N
+
+
+def _caso_C(M):
+    N = 100
+    return (lambda: resolucion_ecuacion_difusion_2D(0.01, 1.0, 1.0, 0.1, M, M, N)), M * M * N
+
+
+def _caso_D(M):
+    N = 20
+    return (lambda: solver_richards_2d_circular(diffusivity_brooks_corey, 0.4, 0.4, 10.0, M, M, N)), M * M * N
+
+
+def _caso_D_krylov(M):
+    N = 20
+    return (lambda: solver_richards_2d_circular(diffusivity_brooks_corey, 0.4, 0.4, 10.0, M, M, N,
+                                                metodo='krylov')), M * M * N
+
+
+def _caso_D_conjunto(K):
+    M, N = 40, 20
+    radios = np.linspace(0.05, 0.1, K)
+    return (lambda: solver_richards_2d_circular_conjunto(diffusivity_brooks_corey, 0.4, 0.4, 10.0, M, M, N,
+                                                         radios)), K * M * M * N
+
+
+def _caso_E(M):
+    N = 20
+    return (lambda: solver_richards_2d_eliptica(diffusivity_brooks_corey, 0.4, 0.4, 10.0, M, M, N)), M * M * N
+
+
+def _caso_radial(Nr):
+    N = 100
+    return (lambda: solver_1d_radial(diffusivity_brooks_corey, 0.4 / 1.5, 10.0, Nr, N, 0.08)), (Nr + 1) * N
+
+
+def _caso_boltzmann(tol):
+    # Sin trabajo de malla: el costo depende de la tolerancia del disparo
+    return (lambda: solve_boltzmann_edo(0.9, 0.0, eta_max=50.0, n_points=300, metodo='disparo', tol=tol)), None
+
+
+CASOS = {
+    'A': {'descripcion': '1D lineal (Euler implícito)', 'preparar': _caso_A, 'tamanos': [99, 199, 399, 799]},
+    'B': {'descripcion': 'Richards 1D (Picard)', 'preparar': _caso_B, 'tamanos': [100, 200, 400, 800]},
+    'B_conjunto': {'descripcion': 'Richards 1D, conjunto de K miembros', 'preparar': _caso_B_conjunto,
+                   'tamanos': [4, 16, 64]},
+    'C': {'descripcion': '2D lineal (ADI)', 'preparar': _caso_C, 'tamanos': [19, 39, 79, 159]},
+    'D': {'descripcion': 'Richards 2D circular', 'preparar': _caso_D, 'tamanos': [40, 80, 160]},
+    'D_krylov': {'descripcion': 'Richards 2D circular (CG + multigrilla)', 'preparar': _caso_D_krylov,
+                 'tamanos': [40, 80, 160]},
+    'D_conjunto': {'descripcion': 'Richards 2D circular, conjunto de K miembros', 'preparar': _caso_D_conjunto,
+                   'tamanos': [4, 16, 64]},
+    'E': {'descripcion': 'Richards 2D elíptica', 'preparar': _caso_E, 'tamanos': [40, 80, 160]},
+    'radial': {'descripcion': 'Richards 1D radial', 'preparar': _caso_radial, 'tamanos': [50, 100, 200]},
+    'boltzmann': {'descripcion': 'EDO de Boltzmann (disparo)', 'preparar': _caso_boltzmann,
+                  'tamanos': [1e-4, 1e-6, 1e-8]},
+}
+
+
+def medir(funcion, repeticiones=REPETICIONES, calentamiento=CALENTAMIENTO):
+    """
+    Mide funcion() con perf_counter tras `calentamiento` corridas descartadas.
+    La salida por consola de los solvers se descarta durante la medición.
+
+    Returns:
+        dict: {'mediana', 'iqr', 'minimo', 'muestras'} en segundos.
+    """
+    muestras = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(calentamiento):
+            funcion()
+        for _ in range(repeticiones):
+            gc.collect()
+            inicio = time.perf_counter()
+            funcion()
+            muestras.append(time.perf_counter() - inicio)
+    q1, mediana, q3 = np.percentile(muestras, [25, 50, 75])
+    return {'mediana': float(mediana), 'iqr': float(q3 - q1), 'minimo': float(min(muestras)), 'muestras': muestras}
+
+
+def exponente_escalamiento(trabajo, tiempos):
+    """Pendiente del ajuste por cuadrados mínimos de log(tiempo) vs log(trabajo)."""
+    if len(trabajo) < 2 or any(w is None for w in trabajo):
+        return None
+    return float(np.polyfit(np.log(trabajo), np.log(tiempos), 1)[0])
+
+
+def medir_caso(nombre, repeticiones=REPETICIONES, calentamiento=CALENTAMIENTO):
+    """Mide todos los tamaños de un caso de CASOS y ajusta su exponente de escalamiento."""
+    caso = CASOS[nombre]
+    resultado = {'descripcion': caso['descripcion'], 'tamanos': list(caso['tamanos']), 'trabajo': [],
+                 'mediana': [], 'iqr': [], 'minimo': []}
+    for tamano in caso['tamanos']:
+        funcion, trabajo = caso['preparar'](tamano)
+        medicion = medir(funcion, repeticiones, calentamiento)
+        resultado['trabajo'].append(trabajo)
+        for clave in ('mediana', 'iqr', 'minimo'):
+            resultado[clave].append(medicion[clave])
+    resultado['exponente'] = exponente_escalamiento(resultado['trabajo'], resultado['mediana'])
+    return resultado
+
+
+def ejecutar_suite(casos=None, repeticiones=REPETICIONES, calentamiento=CALENTAMIENTO, max_workers=1):
+    """
+    Corre la suite y devuelve un diccionario serializable a JSON.
+
+    Args:
+        casos (list[str], opcional): Nombres de CASOS; por defecto todos.
+        repeticiones, calentamiento (int): Ver medir.
+        max_workers (int): Procesos para repartir los casos (barrido_parametros).
+            Por defecto 1: los casos en paralelo compiten por memoria y núcleos
+            y sesgan las medidas.
+
+    Returns:
+        dict: {'fecha', 'maquina', 'parametros', 'casos': {nombre: resultado}}.
+    """
+    casos = list(CASOS) if casos is None else list(casos)
+    desconocidos = [c for c in casos if c not in CASOS]
+    if desconocidos:
+        raise ValueError(f"casos desconocidos {desconocidos}; disponibles: {list(CASOS)}")
+
+    tabla = barrido_parametros(medir_caso, [dict(nombre=c, repeticiones=repeticiones, calentamiento=calentamiento)
+                                            for c in casos], max_workers)
+    errores = [f"{fila['parametros']['nombre']}: {fila['error']}" for fila in tabla if fila['error']]
+    if errores:
+        raise RuntimeError("falló la medición de " + "; ".join(errores))
+
+    return {
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'maquina': {'python': platform.python_version(), 'numpy': np.__version__, 'scipy': scipy.__version__,
+                    'plataforma': platform.platform(), 'procesador': platform.processor(),
+                    'nucleos': os.cpu_count()},
+        'parametros': {'repeticiones': repeticiones, 'calentamiento': calentamiento},
+        'casos': {fila['parametros']['nombre']: fila['resultado'] for fila in tabla},
+    }
+
+
+def guardar_json(resultados, ruta):
+    with open(ruta, 'w') as f:
+        json.dump(resultados, f, indent=2)
+
+
+def cargar_json(ruta):
+    with open(ruta) as f:
+        return json.load(f)
+
+
+def comparar_con_base(resultados, base, umbral=UMBRAL_REGRESION):
+    """
+    Compara la mediana de cada (caso, tamaño) presente en ambas corridas.
+
+    Es regresión si la mediana crece más que umbral * mediana_base y además
+    más que el ruido combinado (iqr + iqr_base).
+
+    Returns:
+        list[dict]: Una fila por comparación con 'caso', 'tamano', 'razon' y 'regresion'.
+    """
+    filas = []
+    for nombre, actual in resultados['casos'].items():
+        previo = base['casos'].get(nombre)
+        if previo is None:
+            continue
+        for i, tamano in enumerate(actual['tamanos']):
+            if tamano not in previo['tamanos']:
+                continue
+            j = previo['tamanos'].index(tamano)
+            m, m0 = actual['mediana'][i], previo['mediana'][j]
+            ruido = actual['iqr'][i] + previo['iqr'][j]
+            filas.append({'caso': nombre, 'tamano': tamano, 'mediana': m, 'mediana_base': m0,
+                          'razon': m / m0, 'regresion': m - m0 > max(umbral * m0, ruido)})
+    return filas
+
+
+def imprimir_resultados(resultados):
+    print(f"{'Caso':<10} | {'Tamaño':>8} | {'Trabajo':>9} | {'Mediana [s]':>11} | {'IQR [s]':>9} | Exponente")
+    print("-" * 72)
+    for nombre, r in resultados['casos'].items():
+        exponente = '-' if r['exponente'] is None else f"{r['exponente']:.2f}"
+        for k, tamano in enumerate(r['tamanos']):
+            trabajo = '-' if r['trabajo'][k] is None else f"{r['trabajo'][k]:.2e}"
+            print(f"{nombre if k == 0 else '':<10} | {tamano:>8g} | {trabajo:>9} | {r['mediana'][k]:>11.4f} | "
+                  f"{r['iqr'][k]:>9.4f} | {exponente if k == 0 else ''}")
+
+
+def imprimir_comparacion(filas):
+    print(f"{'Caso':<10} | {'Tamaño':>8} | {'Base [s]':>9} | {'Actual [s]':>10} | {'Razón':>6} |")
+    print("-" * 58)
+    for f in filas:
+        marca = 'REGRESIÓN' if f['regresion'] else ''
+        print(f"{f['caso']:<10} | {f['tamano']:>8g} | {f['mediana_base']:>9.4f} | {f['mediana']:>10.4f} | "
+              f"{f['razon']:>6.2f} | {marca}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de los solvers del TP")
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS), help="Casos a medir (por defecto todos)")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    parser.add_argument('--calentamiento', type=int, default=CALENTAMIENTO)
+    parser.add_argument('--workers', type=int, default=1, help="Procesos para repartir los casos")
+    parser.add_argument('--json', help="Ruta donde guardar los resultados")
+    parser.add_argument('--base', help="JSON de una corrida anterior para comparar")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION)
+    args = parser.parse_args()
+
+    resultados = ejecutar_suite(args.casos, args.repeticiones, args.calentamiento, args.workers)
+    imprimir_resultados(resultados)
+    if args.json:
+        guardar_json(resultados, args.json)
+        print(f"Resultados guardados en {args.json}")
+
+    if args.base:
+        filas = comparar_con_base(resultados, cargar_json(args.base), args.umbral)
+        imprimir_comparacion(filas)
+        if any(f['regresion'] for f in filas):
+            sys.exit(1)
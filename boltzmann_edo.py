@@ -1,34 +1,215 @@
 import numpy as np
-from scipy.integrate import solve_ivp
-from models_soil_models import diffusivity_brooks_corey, dD_dtheta_brooks_corey
+from scipy.integrate import solve_ivp, solve_bvp
+from scipy.optimize import brentq
+from scipy.special import erfc
+from models_soil_models import diffusivity_brooks_corey, brooks_corey_escalar, D_SAT
+
+# Métodos disponibles en solve_boltzmann_edo
+METODOS_BOLTZMANN = ('barrido', 'disparo', 'colocacion')
+
+# Por debajo de este D la ecuación se trata como no difusiva (igual que boltzmann_ode)
+D_MIN = 1e-12
+
+# Malla de salida del disparo y la colocación: FRACCION_FRENTE de los puntos
+# en [0, MARGEN_FRENTE * eta_frente] y el resto en una cola geométrica
+FRACCION_FRENTE = 0.75
+MARGEN_FRENTE = 1.25
+
+# Tolerancias de LSODA en el disparo; Brent no afina la pendiente por debajo de la relativa
+RTOL_DISPARO = 1e-8
+ATOL_DISPARO = 1e-10
+# Tolerancia absoluta de Brent sobre la pendiente inicial (la relativa es tol)
+XTOL_DISPARO = 1e-12
 
 
 def boltzmann_ode(eta, y):
     """Ecuación de Boltzmann para difusión no lineal."""
     theta, dtheta = y
 
-    # Asegurar que son escalares
-    theta = float(theta)
-    dtheta = float(dtheta)
-
-    # Limitar valores físicamente razonables
-    theta = np.clip(theta, 1e-4, 0.99)
+    # Limitar valores físicamente razonables (floats de Python: sin arreglos por llamada)
+    theta = min(max(float(theta), 1e-4), 0.99)
     # Permitir pendientes más pronunciadas para difusividad fuertemente no lineal
-    dtheta = np.clip(dtheta, -100.0, -1e-6)  # Rango ampliado
+    dtheta = min(max(float(dtheta), -100.0), -1e-6)  # Rango ampliado
 
-    D = diffusivity_brooks_corey(theta)
+    D, dD = brooks_corey_escalar(theta)
 
     # Evitar división por cero
-    if D < 1e-12:
+    if D < D_MIN:
         d2theta = -eta * dtheta / 2.0
     else:
-        dD = dD_dtheta_brooks_corey(theta)
         d2theta = -((eta / 2) * dtheta + dD * (dtheta ** 2)) / D
 
     return [dtheta, d2theta]
 
 
-def solve_boltzmann_edo(theta_a, theta_b, eta_max=10.0, n_points=200):
+def _boltzmann_ode_disparo(eta, y):
+    """
+    Misma ecuación que boltzmann_ode pero sin recortar la pendiente: el método
+    de disparo necesita que y[1] sea la pendiente real para detectar el giro.
+    """
+    theta, dtheta = y
+    dtheta = float(dtheta)
+
+    D, dD = brooks_corey_escalar(min(max(float(theta), 1e-4), 0.99))
+    if D < D_MIN:
+        return [dtheta, -eta * dtheta / 2.0]
+    return [dtheta, -((eta / 2) * dtheta + dD * (dtheta ** 2)) / D]
+
+
+def _integrar_disparo(s0, theta_a, theta_b, eta_max, dense_output=False):
+    """
+    Integra desde eta=0 con pendiente s0 hasta que theta cruza theta_b (pendiente
+    demasiado empinada), la pendiente se anula antes (demasiado suave) o se llega
+    a eta_max. Usa LSODA porque la EDO es rígida cuando D -> 0 en el frente.
+    """
+    def cruce(eta, y):
+        return y[0] - theta_b
+    cruce.terminal, cruce.direction = True, -1
+
+    def giro(eta, y):
+        return y[1]
+    giro.terminal, giro.direction = True, 1
+
+    return solve_ivp(_boltzmann_ode_disparo, [0, eta_max], [theta_a, s0], method='LSODA',
+                     rtol=RTOL_DISPARO, atol=ATOL_DISPARO, events=[cruce, giro], dense_output=dense_output)
+
+
+def malla_hacia_frente(eta_frente, eta_max, n_points):
+    """
+    n_points valores de eta en [0, eta_max] concentrados en el perfil: con
+    Brooks-Corey el frente queda en eta ~ 1e-3 y una malla uniforme hasta
+    eta_max = 50 lo deja entre los dos primeros nodos. Una fracción
+    FRACCION_FRENTE de los puntos cubre uniformemente [0, MARGEN_FRENTE *
+    eta_frente] y el resto crece geométricamente hasta eta_max.
+    """
+    eta_corte = MARGEN_FRENTE * eta_frente
+    n_frente = int(FRACCION_FRENTE * n_points)
+    if not 0.0 < eta_corte < eta_max or n_frente < 2 or n_points - n_frente < 1:
+        return np.linspace(0, eta_max, n_points)
+    frente = np.linspace(0, eta_corte, n_frente)
+    cola = np.geomspace(eta_corte, eta_max, n_points - n_frente + 1)[1:]
+    cola[-1] = eta_max
+    return np.concatenate([frente, cola])
+
+
+def _perfil_en_malla(sol, eta, theta_b):
+    """
+    Evalúa la solución de disparo en eta y vale theta_b más allá del evento
+    final: pasado el frente D < D_MIN y el agua no avanza (difusión degenerada).
+    """
+    theta = np.full(eta.shape, float(theta_b))
+    dentro = eta <= sol.t[-1]
+    theta[dentro] = sol.sol(eta[dentro])[0]
+    return theta
+
+
+def _resolver_por_disparo(theta_a, theta_b, eta_max, n_points, tol):
+    """
+    Disparo con horquillado + Brent sobre la pendiente inicial s0.
+
+    La función de error es positiva si la pendiente se anula con theta > theta_b
+    (vale theta_giro - theta_b) y negativa si theta cruza theta_b antes de
+    eta_max (vale -(theta_a - theta_b) * (1 - eta_cruce / eta_max)). El perfil
+    se devuelve en la malla de malla_hacia_frente, graduada hacia el punto
+    donde el disparo final cruza theta_b o se aplana.
+    """
+    n_integraciones = 0
+
+    def error_disparo(s0):
+        nonlocal n_integraciones
+        n_integraciones += 1
+        sol = _integrar_disparo(s0, theta_a, theta_b, eta_max)
+        if sol.t_events[0].size:
+            return -(theta_a - theta_b) * (1.0 - sol.t_events[0][0] / eta_max)
+        return sol.y[0, -1] - theta_b
+
+    # Horquillado geométrico de la pendiente: suave (error > 0) y empinada (error < 0)
+    s_suave = -1e-3 * (theta_a - theta_b)
+    while error_disparo(s_suave) < 0:
+        s_suave /= 10.0
+        if abs(s_suave) < 1e-12:
+            raise RuntimeError("no se encontró una pendiente inicial suficientemente suave")
+    s_empinada = 10.0 * s_suave
+    while error_disparo(s_empinada) > 0:
+        s_suave, s_empinada = s_empinada, 10.0 * s_empinada
+        if abs(s_empinada) > 1e12:
+            raise RuntimeError("no se encontró una pendiente inicial que alcance theta_b")
+
+    tol = max(tol, RTOL_DISPARO)
+    s0 = brentq(error_disparo, s_empinada, s_suave, xtol=XTOL_DISPARO, rtol=tol)
+
+    n_integraciones += 1
+    sol = _integrar_disparo(s0, theta_a, theta_b, eta_max, dense_output=True)
+    if sol.t_events[0].size:
+        # Si D(theta_b) < D_MIN el error salta en la raíz: del lado empinado el
+        # cruce se aleja sin límite al achicar tol (cola casi plana sin difusión)
+        # y del lado suave el frente converge. Se toma el extremo suave del
+        # intervalo de Brent, a menos de tol |s0| de la raíz.
+        s0 += 2.0 * (XTOL_DISPARO + tol * abs(s0))
+        n_integraciones += 1
+        sol = _integrar_disparo(s0, theta_a, theta_b, eta_max, dense_output=True)
+    eta = malla_hacia_frente(sol.t[-1], eta_max, n_points)
+    theta_eta = _perfil_en_malla(sol, eta, theta_b)
+
+    print(f"  Disparo: s0={s0:.6e}, frente en eta={sol.t[-1]:.6g} (theta={sol.y[0, -1]:.3e}), "
+          f"{n_integraciones} integraciones")
+    return eta, theta_eta
+
+
+def _resolver_por_colocacion(theta_a, theta_b, eta_max, n_points, tol):
+    """
+    Colocación (solve_bvp) en forma de flujo, con xi = eta / sqrt(D_SAT) y
+    q = (D/D_SAT) dtheta/dxi para evitar dividir por D en la ecuación de q:
+        dtheta/dxi = q / D_hat,   dq/dxi = -(xi/2) dtheta/dxi.
+    El piso de D_hat se baja por continuación (1, 0.1, ..., D_MIN/D_SAT)
+    usando cada solución como estimación inicial de la siguiente. Por el piso
+    de D, la cola con D < D_MIN difiere de la del disparo (que ahí usa la
+    ecuación sin difusión de boltzmann_ode); el perfil principal coincide.
+    Como en el disparo, el perfil se devuelve en malla_hacia_frente.
+    """
+    # El perfil se anula antes de xi ~ 10 porque D/D_SAT <= 1
+    xi_max = min(eta_max / np.sqrt(D_SAT), 10.0)
+
+    def condiciones(ya, yb):
+        return np.array([ya[0] - theta_a, yb[0] - theta_b])
+
+    # Estimación inicial: perfil lineal con D constante (erfc)
+    xi = np.linspace(0, xi_max, 100)
+    y = np.vstack([theta_b + (theta_a - theta_b) * erfc(xi / 2),
+                   -(theta_a - theta_b) / np.sqrt(np.pi) * np.exp(-xi ** 2 / 4)])
+
+    pisos = 10.0 ** np.arange(0, np.log10(D_MIN / D_SAT), -1.0)
+    n_resoluciones, n_iter = 0, 0
+    for piso in np.append(pisos, D_MIN / D_SAT):
+        def edo(xi, y, piso=piso):
+            theta = np.clip(y[0], 1e-4, 0.99)
+            D_hat = np.maximum(diffusivity_brooks_corey(theta) / D_SAT, piso)
+            dtheta = y[1] / D_hat
+            return np.vstack([dtheta, -(xi / 2) * dtheta])
+
+        sol = solve_bvp(edo, condiciones, xi, y, tol=tol, max_nodes=100000)
+        n_resoluciones += 1
+        n_iter += sol.niter
+        if not sol.success:
+            raise RuntimeError(f"solve_bvp no convergió con D_min/D_SAT={piso:.1e}: {sol.message}")
+        xi, y = sol.x, sol.y
+
+    # Frente: primer nodo donde theta llega a theta_b (a 1e-3 del salto)
+    llega = np.flatnonzero(y[0] - theta_b <= 1e-3 * (theta_a - theta_b))
+    eta_frente = (xi[llega[0]] if llega.size else xi_max) * np.sqrt(D_SAT)
+    eta = malla_hacia_frente(eta_frente, eta_max, n_points)
+    xi_eval = eta / np.sqrt(D_SAT)
+    theta_eta = np.full(eta.shape, float(theta_b))
+    dentro = xi_eval <= xi_max
+    theta_eta[dentro] = sol.sol(xi_eval[dentro])[0]
+
+    s0 = y[1, 0] / (diffusivity_brooks_corey(theta_a) / D_SAT) / np.sqrt(D_SAT)
+    print(f"  Colocación: s0={s0:.6e}, {n_resoluciones} resoluciones solve_bvp, "
+          f"{n_iter} iteraciones de Newton, {len(xi)} nodos")
+    return eta, theta_eta
+
+
+def solve_boltzmann_edo(theta_a, theta_b, eta_max=10.0, n_points=200, metodo='barrido', tol=1e-8):
     """
     Método de Boltzmann MEJORADO con manejo robusto.
     Usa un dominio más amplio y pendientes iniciales más apropiadas.
@@ -38,8 +219,21 @@ def solve_boltzmann_edo(theta_a, theta_b, eta_max=10.0, n_points=200):
         theta_b: theta(eta=inf) - condicion de frontera
         eta_max: maximo valor de eta (variable de similaridad)
         n_points: numero de puntos en la solucion
+        metodo: 'barrido' (8 pendientes fijas, se queda con la mejor),
+            'disparo' (horquillado + Brent sobre la pendiente hasta tol) o
+            'colocacion' (solve_bvp con continuación en el piso de D)
+        tol: tolerancia relativa de la pendiente (disparo, no menor que la de la
+            integración, RTOL_DISPARO) o del residuo (colocación)
     """
-    print(f"Boltzmann: Resolviendo EDO - theta(0)={theta_a:.3f}, theta(inf)={theta_b}")
+    if metodo not in METODOS_BOLTZMANN:
+        raise ValueError(f"metodo debe ser uno de {METODOS_BOLTZMANN}, no {metodo!r}")
+
+    print(f"Boltzmann: Resolviendo EDO - theta(0)={theta_a:.3f}, theta(inf)={theta_b} [{metodo}]")
+
+    if metodo == 'disparo':
+        return _resolver_por_disparo(theta_a, theta_b, eta_max, n_points, tol)
+    if metodo == 'colocacion':
+        return _resolver_por_colocacion(theta_a, theta_b, eta_max, n_points, max(tol, 1e-6))
 
     # Expandir el rango de pendientes iniciales para difusividad fuertemente no lineal
     pendientes_prueba = [-0.001, -0.01, -0.05, -0.1, -0.5, -1.0, -2.0, -5.0]
@@ -77,7 +271,8 @@ def solve_boltzmann_edo(theta_a, theta_b, eta_max=10.0, n_points=200):
 
     if mejor_sol is not None:
         eta, theta_eta = mejor_sol
-        print(f"  Mejor solución: s0={mejor_s0:.3f}, error={mejor_error:.3f}")
+        print(f"  Mejor solución: s0={mejor_s0:.3f}, error={mejor_error:.3f}, "
+              f"{len(pendientes_prueba)} integraciones")
         
         # Si el error sigue siendo alto, advertir al usuario
         if mejor_error > 0.1:
@@ -0,0 +1,171 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+import models_soil_models
+from boltzmann_edo import solve_boltzmann_edo
+
+# Directorio del caché en disco (se puede cambiar con la variable de entorno TP6_CACHE_BOLTZMANN)
+DIRECTORIO_CACHE = os.environ.get('TP6_CACHE_BOLTZMANN', '.cache_boltzmann')
+# Máximo de perfiles retenidos en memoria y en disco (se descarta el menos usado)
+MAX_PERFILES_MEMORIA = 32
+MAX_PERFILES_DISCO = 256
+
+# Versión de los perfiles de solve_boltzmann_edo en la clave: cambia si cambian
+# su malla o su método (2: malla graduada hacia el frente y raíz de Brent)
+VERSION_PERFIL = 2
+
+_perfiles_memoria = OrderedDict()
+
+
+def _clave_perfil(theta_a, theta_b, eta_max, n_points, metodo, tol):
+    """
+    Clave del perfil: valores de contorno, parámetros numéricos, parámetros
+    del suelo (leídos al momento de la llamada, para que un cambio en
+    models_soil_models invalide las entradas viejas) y VERSION_PERFIL.
+    """
+    suelo = (models_soil_models.THETA_R, models_soil_models.THETA_S,
+             models_soil_models.D_SAT, models_soil_models.N_BC)
+    numericos = (float(theta_a), float(theta_b), float(eta_max), int(n_points), metodo, float(tol))
+    return numericos + suelo + (VERSION_PERFIL,)
+
+
+def _archivo_perfil(clave, directorio):
+    """Ruta del .npz de una clave (hash estable de su repr)."""
+    resumen = hashlib.sha1(repr(clave).encode()).hexdigest()[:20]
+    return os.path.join(directorio, f"perfil_{resumen}.npz")
+
+
+def _recordar(clave, eta, theta_eta):
+    """Guarda el perfil en memoria (solo lectura) y descarta el menos usado si sobra."""
+    eta.setflags(write=False)
+    theta_eta.setflags(write=False)
+    _perfiles_memoria[clave] = (eta, theta_eta)
+    _perfiles_memoria.move_to_end(clave)
+    while len(_perfiles_memoria) > MAX_PERFILES_MEMORIA:
+        _perfiles_memoria.popitem(last=False)
+
+
+def _leer_disco(clave, directorio):
+    """Lee el perfil de disco o devuelve None; marca el archivo como recién usado."""
+    archivo = _archivo_perfil(clave, directorio)
+    try:
+        with np.load(archivo) as datos:
+            if tuple(datos['clave'].tolist()) != tuple(map(str, clave)):
+                return None  # colisión de hash
+            eta, theta_eta = datos['eta'], datos['theta']
+    except (OSError, KeyError, ValueError):
+        return None
+    os.utime(archivo)
+    return eta, theta_eta
+
+
+def _escribir_disco(clave, eta, theta_eta, directorio):
+    """Escribe el perfil de forma atómica y recorta el directorio a MAX_PERFILES_DISCO."""
+    os.makedirs(directorio, exist_ok=True)
+    archivo = _archivo_perfil(clave, directorio)
+    temporal = f"{archivo[:-4]}.{os.getpid()}.tmp.npz"
+    np.savez(temporal, eta=eta, theta=theta_eta, clave=np.array(list(map(str, clave))))
+    os.replace(temporal, archivo)
+
+    perfiles = [os.path.join(directorio, f) for f in os.listdir(directorio)
+                if f.startswith('perfil_') and f.endswith('.npz') and '.tmp.' not in f]
+    if len(perfiles) > MAX_PERFILES_DISCO:
+        perfiles.sort(key=os.path.getmtime)
+        for viejo in perfiles[:len(perfiles) - MAX_PERFILES_DISCO]:
+            try:
+                os.remove(viejo)
+            except OSError:
+                pass
+
+
+def perfil_boltzmann(theta_a, theta_b, eta_max=10.0, n_points=200, metodo='disparo', tol=1e-8,
+                     usar_disco=True, directorio=None):
+    """
+    Perfil de similaridad theta(eta) con caché en memoria y en disco.
+
+    El perfil depende solo de los valores de contorno y de los parámetros del
+    suelo (no de t ni de L), así que se resuelve una vez con solve_boltzmann_edo
+    y luego se sirve desde el caché. Los arreglos devueltos son de solo lectura.
+
+    Args:
+        theta_a, theta_b (float): theta(eta=0) y theta(eta=inf).
+        eta_max, n_points, metodo, tol: Ver solve_boltzmann_edo.
+        usar_disco (bool): Si es False solo se usa el caché en memoria.
+        directorio (str, opcional): Directorio del caché en disco; por defecto DIRECTORIO_CACHE.
+
+    Returns:
+        tuple: (eta, theta_eta)
+    """
+    clave = _clave_perfil(theta_a, theta_b, eta_max, n_points, metodo, tol)
+    if clave in _perfiles_memoria:
+        _perfiles_memoria.move_to_end(clave)
+        return _perfiles_memoria[clave]
+
+    directorio = DIRECTORIO_CACHE if directorio is None else directorio
+    perfil = _leer_disco(clave, directorio) if usar_disco else None
+    if perfil is not None:
+        print(f"Boltzmann: Perfil theta(0)={theta_a:.3f}, theta(inf)={theta_b} leído del caché en disco")
+    else:
+        perfil = solve_boltzmann_edo(theta_a, theta_b, eta_max=eta_max, n_points=n_points,
+                                     metodo=metodo, tol=tol)
+        perfil = tuple(np.asarray(p, dtype=np.float64) for p in perfil)
+        if usar_disco:
+            _escribir_disco(clave, *perfil, directorio)
+
+    _recordar(clave, *perfil)
+    return _perfiles_memoria[clave]
+
+
+def theta_boltzmann(x, t, D0, theta_a, theta_b, **kwargs):
+    """
+    theta(x, t) interpolando el perfil cacheado en eta = x / sqrt(4 D0 t);
+    más allá de eta_max vale theta_b.
+
+    Args:
+        x (float o np.array): Posiciones.
+        t (float): Tiempo (> 0).
+        D0 (float): Difusividad de referencia de la transformación.
+        theta_a, theta_b (float): Valores de contorno del perfil.
+        **kwargs: Parámetros de perfil_boltzmann (eta_max, n_points, metodo, ...).
+
+    Returns:
+        np.array: theta en cada x.
+    """
+    eta, theta_eta = perfil_boltzmann(theta_a, theta_b, **kwargs)
+    eta_x = np.asarray(x, dtype=np.float64) / np.sqrt(4 * D0 * t)
+    return np.interp(eta_x, eta, theta_eta, right=theta_b)
+
+
+def precalcular_perfiles(valores_theta_a, valores_theta_b, eta_max=10.0, n_points=200, metodo='disparo',
+                         tol=1e-8, directorio=None):
+    """
+    Resuelve por adelantado y guarda en disco los perfiles de la grilla
+    valores_theta_a x valores_theta_b, para que las corridas posteriores
+    (en este u otro proceso) solo interpolen. Devuelve cuántos se resolvieron.
+    """
+    directorio = DIRECTORIO_CACHE if directorio is None else directorio
+    grilla = [(float(a), float(b)) for a in np.atleast_1d(valores_theta_a) for b in np.atleast_1d(valores_theta_b)]
+
+    n_resueltos = 0
+    for theta_a, theta_b in grilla:
+        clave = _clave_perfil(theta_a, theta_b, eta_max, n_points, metodo, tol)
+        if clave not in _perfiles_memoria and _leer_disco(clave, directorio) is None:
+            n_resueltos += 1
+        perfil_boltzmann(theta_a, theta_b, eta_max, n_points, metodo, tol, directorio=directorio)
+
+    print(f"Boltzmann: Precálculo - {n_resueltos} perfiles resueltos, {len(grilla) - n_resueltos} ya en caché")
+    return n_resueltos
+
+
+def limpiar_cache(disco=False, directorio=None):
+    """Vacía el caché en memoria y, si disco=True, borra los perfiles guardados."""
+    _perfiles_memoria.clear()
+    if disco:
+        directorio = DIRECTORIO_CACHE if directorio is None else directorio
+        if os.path.isdir(directorio):
+            for f in os.listdir(directorio):
+                if f.startswith('perfil_') and f.endswith('.npz'):
+                    os.remove(os.path.join(directorio, f))
@@ -0,0 +1,71 @@
+import json
+import os
+
+import numpy as np
+
+# Versión del formato; cambia si cambian los campos guardados
+# (2: clave 'esquema' en la configuración y estado theta_esquema/dt_esquema del paso anterior)
+VERSION_CHECKPOINT = 2
+
+
+def guardar_checkpoint(ruta, configuracion, **estado):
+    """
+    Guarda un checkpoint binario (np.savez, sin comprimir) de forma atómica:
+    se escribe un temporal en el mismo directorio y se renombra, así un corte
+    durante la escritura deja intacto el checkpoint anterior.
+
+    Args:
+        ruta (str): Archivo .npz de destino.
+        configuracion (dict): Parámetros del solver (serializables a JSON) que
+            deben coincidir al reanudar.
+        **estado: Arreglos y escalares del estado (None se guarda como arreglo vacío).
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    campos = {k: (np.empty(0) if v is None else np.asarray(v)) for k, v in estado.items()}
+    campos['configuracion'] = np.array(json.dumps(configuracion, sort_keys=True))
+    campos['version'] = np.array(VERSION_CHECKPOINT)
+
+    base = ruta[:-4] if ruta.endswith('.npz') else ruta
+    temporal = f"{base}.{os.getpid()}.tmp.npz"
+    np.savez(temporal, **campos)
+    os.replace(temporal, base + '.npz')
+
+
+def cargar_checkpoint(ruta, configuracion=None):
+    """
+    Lee un checkpoint de guardar_checkpoint.
+
+    Args:
+        ruta (str): Archivo .npz.
+        configuracion (dict, opcional): Si se pasa, cada clave debe coincidir
+            con la guardada; si no, se lanza ValueError.
+
+    Returns:
+        dict: Estado guardado (escalares como tipos de Python, arreglos vacíos
+            como None) más la clave 'configuracion'.
+    """
+    with np.load(ruta) as datos:
+        if int(datos['version']) != VERSION_CHECKPOINT:
+            raise ValueError(f"versión de checkpoint {int(datos['version'])} no soportada en {ruta} "
+                             f"(se espera {VERSION_CHECKPOINT})")
+        estado = {}
+        for clave in datos.files:
+            if clave in ('configuracion', 'version'):
+                continue
+            valor = datos[clave]
+            if valor.ndim == 0:
+                estado[clave] = valor.item()
+            else:
+                estado[clave] = None if valor.size == 0 else valor
+        estado['configuracion'] = json.loads(datos['configuracion'].item())
+
+    if configuracion is not None:
+        guardada = estado['configuracion']
+        distintas = {k: (guardada.get(k), v) for k, v in json.loads(json.dumps(configuracion)).items()
+                     if guardada.get(k) != v}
+        if distintas:
+            detalle = ", ".join(f"{k}: checkpoint={a!r}, pedido={b!r}" for k, (a, b) in distintas.items())
+            raise ValueError(f"el checkpoint {ruta} no corresponde a esta corrida ({detalle})")
+    return estado
@@ -0,0 +1,153 @@
+"""
+Reporte de convergencia temporal de los esquemas de esquemas_temporales
+(Euler implícito, Crank-Nicolson, BDF2 y TR-BDF2) sobre los solvers de las
+actividades A, B y D: error contra una referencia de paso fino para varios
+N, orden observado y pasos necesarios para alcanzar un mismo error.
+
+Uso:
+    python convergencia_temporal.py
+    python convergencia_temporal.py --casos B D --error 1e-4 --workers 4
+"""
+
+import argparse
+import contextlib
+import io
+
+import numpy as np
+
+from actividadA import resolucion_ecuacion_difusion_linea_1D
+from actividadB import resolucion_ecuacion_richards_1D_no_lineal
+from actividadD import solver_richards_2d_circular
+from barrido_parametros import barrido_parametros, columna
+from esquemas_temporales import ESQUEMAS
+from iteracion_no_lineal import IteracionNoLineal
+from models_soil_models import diffusivity_brooks_corey
+
+N_VALORES = (5, 10, 20, 40, 80)
+# La referencia se integra con TR-BDF2 y N_REFERENCIA pasos
+N_REFERENCIA = 1280
+
+
+# --- Casos: T_final largo frente a dx^2/D para que el error temporal domine ---
+# Las iteraciones no lineales se cierran muy por debajo del error temporal.
+
+def _caso_A(esquema, N):
+    return resolucion_ecuacion_difusion_linea_1D(0.01, 1.0, 5.0, 199, N, esquema=esquema)[1]
+
+
+def _caso_B(esquema, N):
+    L, M = 0.5, 50
+    x = np.linspace(0, L, M + 2)
+    theta_inicial = 0.8 * np.exp(-((x - L / 2) ** 2) / (2 * 0.05 ** 2))
+    return resolucion_ecuacion_richards_1D_no_lineal(diffusivity_brooks_corey, L, 1000.0, M, N, theta_inicial,
+                                                     picard_tol=1e-10, picard_maxiter=50, esquema=esquema)[1]
+
+
+def _caso_D(esquema, N):
+    iteracion = IteracionNoLineal(atol=1e-10, rtol=1e-10, maxiter=200)
+    return solver_richards_2d_circular(diffusivity_brooks_corey, 0.4, 0.4, 3000.0, 21, 21, N, simetria=True,
+                                       iteracion=iteracion, esquema=esquema)[2]
+
+
+CASOS = {'A': _caso_A, 'B': _caso_B, 'D': _caso_D}
+
+
+def _resolver_caso(caso, esquema, N):
+    """Corre un caso sin su salida por pantalla (se ejecuta en los procesos del barrido)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return CASOS[caso](esquema, N)
+
+
+def orden_observado(N_valores, errores):
+    """Pendiente log(error) / log(1/N) entre cada par de N consecutivos."""
+    N_valores, errores = np.asarray(N_valores, dtype=float), np.asarray(errores, dtype=float)
+    return np.log(errores[:-1] / errores[1:]) / np.log(N_valores[1:] / N_valores[:-1])
+
+
+def pasos_para_error(N_valores, errores, objetivo):
+    """
+    Menor N que alcanza error <= objetivo, interpolando log(error) contra
+    log(N) entre los N medidos. Fuera de ese rango se extrapola con el orden
+    observado en el extremo (el primero si todos los errores ya cumplen).
+
+    Returns:
+        int: Pasos temporales estimados.
+    """
+    logN, loge = np.log(np.asarray(N_valores, dtype=float)), np.log(np.asarray(errores, dtype=float))
+    if loge[0] <= np.log(objetivo):
+        k = 0
+    else:
+        cumplen = np.flatnonzero(loge <= np.log(objetivo))
+        k = cumplen[0] - 1 if len(cumplen) else len(logN) - 2
+    pendiente = (loge[k + 1] - loge[k]) / (logN[k + 1] - logN[k])
+    return max(1, int(np.ceil(np.exp(logN[k] + (np.log(objetivo) - loge[k]) / pendiente) - 1e-9)))
+
+
+def convergencia_temporal(caso, esquemas=ESQUEMAS, N_valores=N_VALORES, N_referencia=N_REFERENCIA,
+                          max_workers=None):
+    """
+    Error RMS nodal de cada esquema contra la referencia TR-BDF2 con
+    N_referencia pasos, en la misma malla (solo error temporal).
+
+    Returns:
+        dict: {esquema: lista de errores, uno por N de N_valores}.
+    """
+    parametros = [dict(caso=caso, esquema='trbdf2', N=N_referencia)]
+    parametros += [dict(caso=caso, esquema=e, N=N) for e in esquemas for N in N_valores]
+    tabla = barrido_parametros(_resolver_caso, parametros, max_workers=max_workers)
+    fallidos = [f"{f['parametros']}: {f['error']}" for f in tabla if f['error'] is not None]
+    if fallidos:
+        raise RuntimeError("casos fallidos en el reporte de convergencia: " + "; ".join(fallidos))
+
+    referencia, *soluciones = columna(tabla, 'resultado')
+    errores = {}
+    for k, esquema in enumerate(esquemas):
+        bloque = soluciones[k * len(N_valores):(k + 1) * len(N_valores)]
+        errores[esquema] = [float(np.sqrt(np.mean((theta - referencia) ** 2))) for theta in bloque]
+    return errores
+
+
+def reporte_convergencia_temporal(casos=tuple(CASOS), esquemas=ESQUEMAS, N_valores=N_VALORES,
+                                  N_referencia=N_REFERENCIA, error_objetivo=None, max_workers=None):
+    """
+    Imprime, por caso, el error y el orden observado de cada esquema y los
+    pasos que cada uno necesita para un mismo error: error_objetivo, o por
+    defecto el de Euler implícito con el mayor N medido.
+
+    Returns:
+        dict: {caso: {'errores': {...}, 'objetivo': float, 'pasos': {esquema: N}}}.
+    """
+    reporte = {}
+    for caso in casos:
+        errores = convergencia_temporal(caso, esquemas, N_valores, N_referencia, max_workers)
+        objetivo = error_objetivo
+        if objetivo is None:
+            objetivo = errores['euler'][-1] if 'euler' in errores else min(min(e) for e in errores.values())
+        pasos = {e: pasos_para_error(N_valores, errores[e], objetivo) for e in esquemas}
+
+        print(f"\nCaso {caso} (referencia TR-BDF2 con N={N_referencia})")
+        print(f"{'Esquema':<8} | " + " | ".join(f"N={N:<6d}" for N in N_valores) + " | Orden")
+        print("-" * (20 + 11 * len(N_valores)))
+        for e in esquemas:
+            orden = orden_observado(N_valores, errores[e])[-1]
+            print(f"{e:<8} | " + " | ".join(f"{err:8.2e}" for err in errores[e]) + f" | {orden:5.2f}")
+        print(f"Pasos para error {objetivo:.2e}: " +
+              ", ".join(f"{e} {pasos[e]}" + (f" ({pasos['euler'] / pasos[e]:.1f}x menos)"
+                                              if 'euler' in pasos and e != 'euler' else '')
+                        for e in esquemas))
+        reporte[caso] = {'errores': errores, 'objetivo': objetivo, 'pasos': pasos}
+    return reporte
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convergencia temporal de los esquemas de orden 1 y 2")
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS), default=list(CASOS))
+    parser.add_argument('--esquemas', nargs='+', choices=ESQUEMAS, default=list(ESQUEMAS))
+    parser.add_argument('--N', nargs='+', type=int, default=list(N_VALORES), help="Pasos temporales a medir")
+    parser.add_argument('--referencia', type=int, default=N_REFERENCIA, help="Pasos de la referencia TR-BDF2")
+    parser.add_argument('--error', type=float, help="Error objetivo (por defecto el de Euler con el mayor N)")
+    parser.add_argument('--workers', type=int, help="Procesos para repartir las corridas")
+    args = parser.parse_args()
+
+    reporte_convergencia_temporal(args.casos, args.esquemas, sorted(args.N), args.referencia, args.error,
+                                  args.workers)
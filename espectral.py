@@ -0,0 +1,136 @@
+import numpy as np
+from scipy.fft import dstn
+
+# Esquemas temporales cuyos factores de amplificación reproduce el motor
+ESQUEMAS = ('exacto', 'euler_implicito', 'adi')
+
+
+def _autovalores_laplaciano(n, h):
+    """Autovalores (positivos) de -d²/dx² en diferencias centradas con Dirichlet homogéneo."""
+    k = np.arange(1, n + 1)
+    return (4.0 / h ** 2) * np.sin(k * np.pi / (2 * (n + 1))) ** 2
+
+
+def _factor_amplificacion(mu, tiempos, esquema, dt):
+    """
+    Factor por el que se multiplica cada modo tras cada tiempo pedido.
+
+    mu es D0*lambda para 'exacto' y 'euler_implicito'; para 'adi' es la tupla
+    (mu_x, mu_y) de cada dirección. Los esquemas discretos sólo tienen estado
+    tras un número entero de pasos: si algún t no es múltiplo de dt se lanza
+    ValueError (en ADI el factor es negativo en los modos altos con
+    0.5*dt*mu > 1 y un exponente real daría NaN).
+    """
+    mu_total = mu[0] + mu[1] if esquema == 'adi' else mu
+    tiempos = np.asarray(tiempos, dtype=np.float64).reshape((-1,) + (1,) * np.ndim(mu_total))
+
+    if esquema == 'exacto':
+        return np.exp(-mu * tiempos)
+
+    # Número de pasos, entero (se redondea el error de t/dt en punto flotante)
+    pasos = tiempos / dt
+    fraccionarios = np.abs(pasos - np.round(pasos)) > 1e-9 * np.maximum(1.0, np.abs(pasos))
+    if np.any(fraccionarios):
+        raise ValueError(f"el esquema {esquema!r} sólo admite tiempos múltiplos de dt={dt}; "
+                         f"t={tiempos[fraccionarios][0]} da {pasos[fraccionarios][0]:.6g} pasos")
+    pasos = np.round(pasos)
+    if esquema == 'euler_implicito':
+        return (1.0 + dt * mu) ** (-pasos)
+
+    # ADI de la actividad C: (1 - a_y)(1 - a_x) / ((1 + a_x)(1 + a_y)) por paso
+    a_x, a_y = 0.5 * dt * mu[0], 0.5 * dt * mu[1]
+    return ((1.0 - a_x) * (1.0 - a_y) / ((1.0 + a_x) * (1.0 + a_y))) ** pasos
+
+
+def difusion_1D_espectral(D0, L, M, tiempos, theta_inicial=None, esquema='exacto', dt=None):
+    """
+    Resuelve la difusión lineal 1D con D0 constante y Dirichlet homogéneo
+    (actividad A) diagonalizando el operador discreto con una DST-I: cuesta
+    O(M log M) por tiempo pedido, sin avanzar en el tiempo.
+
+    Con esquema='exacto' integra exactamente en el tiempo el sistema
+    semidiscreto; con 'euler_implicito' reproduce (salvo redondeo) el resultado
+    de resolucion_ecuacion_difusion_linea_1D con paso dt. Sirve como
+    referencia casi gratuita en estudios de convergencia.
+
+    Args:
+        D0 (float): Difusividad constante.
+        L (float): Longitud del dominio.
+        M (int): Puntos interiores (M+2 nodos).
+        tiempos (float o array): Uno o varios tiempos de consulta.
+        theta_inicial (np.array, opcional): Condición inicial (M+2,); por defecto sin(pi x / L).
+        esquema (str): 'exacto' o 'euler_implicito'.
+        dt (float): Paso temporal, obligatorio para 'euler_implicito'; los
+            tiempos deben ser múltiplos de dt.
+
+    Returns:
+        tuple: (x, theta) con theta de forma (M+2,) para un tiempo escalar o
+            (n_tiempos, M+2) para un arreglo de tiempos.
+    """
+    if esquema not in ('exacto', 'euler_implicito'):
+        raise ValueError(f"esquema 1D debe ser 'exacto' o 'euler_implicito', no {esquema!r}")
+    if esquema != 'exacto' and dt is None:
+        raise ValueError(f"el esquema {esquema!r} requiere dt")
+
+    dx = L / (M + 1)
+    x = np.linspace(0, L, M + 2)
+    if theta_inicial is None:
+        theta_inicial = np.sin(np.pi * x / L)
+
+    # Coeficientes modales de la condición inicial (DST-I ortonormal)
+    coef = dstn(np.asarray(theta_inicial, dtype=np.float64)[1:-1], type=1, norm='ortho')
+    mu = D0 * _autovalores_laplaciano(M, dx)
+
+    modos = coef * _factor_amplificacion(mu, tiempos, esquema, dt)
+    theta = np.zeros(modos.shape[:-1] + (M + 2,))
+    theta[..., 1:-1] = dstn(modos, type=1, norm='ortho', axes=-1)
+
+    return x, theta[0] if np.ndim(tiempos) == 0 else theta
+
+
+def difusion_2D_espectral(D0, Lx, Ly, Nx, Ny, tiempos, theta_inicial=None, esquema='exacto', dt=None):
+    """
+    Análogo 2D (actividad C): DST-I en ambas direcciones, O(Nx Ny log(Nx Ny))
+    por tiempo pedido. Con esquema='adi' reproduce el esquema ADI de
+    resolucion_ecuacion_difusion_2D con paso dt; también admite 'exacto' y
+    'euler_implicito' (Euler implícito sin partición de direcciones).
+
+    Args:
+        D0 (float): Difusividad constante.
+        Lx, Ly (float): Dimensiones del dominio.
+        Nx, Ny (int): Puntos interiores en cada dirección.
+        tiempos (float o array): Uno o varios tiempos de consulta.
+        theta_inicial (np.array, opcional): Campo inicial (Nx+2, Ny+2); por
+            defecto sin(pi x/Lx) sin(pi y/Ly).
+        esquema (str): 'exacto', 'euler_implicito' o 'adi'.
+        dt (float): Paso temporal, obligatorio salvo para 'exacto'; los
+            tiempos deben ser múltiplos de dt.
+
+    Returns:
+        tuple: (x, y, theta) con theta de forma (Nx+2, Ny+2) o (n_tiempos, Nx+2, Ny+2).
+    """
+    if esquema not in ESQUEMAS:
+        raise ValueError(f"esquema debe ser uno de {ESQUEMAS}, no {esquema!r}")
+    if esquema != 'exacto' and dt is None:
+        raise ValueError(f"el esquema {esquema!r} requiere dt")
+
+    dx, dy = Lx / (Nx + 1), Ly / (Ny + 1)
+    x, y = np.linspace(0, Lx, Nx + 2), np.linspace(0, Ly, Ny + 2)
+    if theta_inicial is None:
+        X, Y = np.meshgrid(x, y, indexing='ij')
+        theta_inicial = np.sin(np.pi * X / Lx) * np.sin(np.pi * Y / Ly)
+
+    coef = dstn(np.asarray(theta_inicial, dtype=np.float64)[1:-1, 1:-1], type=1, norm='ortho')
+    mu_x = D0 * _autovalores_laplaciano(Nx, dx)[:, None]
+    mu_y = D0 * _autovalores_laplaciano(Ny, dy)[None, :]
+
+    if esquema == 'adi':
+        factor = _factor_amplificacion((mu_x, mu_y), tiempos, esquema, dt)
+    else:
+        factor = _factor_amplificacion(mu_x + mu_y, tiempos, esquema, dt)
+
+    modos = coef * factor
+    theta = np.zeros(modos.shape[:-2] + (Nx + 2, Ny + 2))
+    theta[..., 1:-1, 1:-1] = dstn(modos, type=1, norm='ortho', axes=(-2, -1))
+
+    return x, y, theta[0] if np.ndim(tiempos) == 0 else theta
@@ -0,0 +1,111 @@
+import numpy as np
+
+# Esquemas de integración temporal: Euler implícito (orden 1) y de orden 2
+ESQUEMAS = ('euler', 'cn', 'bdf2', 'trbdf2')
+
+# Fracción del paso de la etapa trapecial de TR-BDF2 (con 2 - sqrt(2) ambas
+# etapas tienen la misma matriz y el esquema es L-estable)
+GAMMA_TRBDF2 = 2.0 - np.sqrt(2.0)
+
+
+class IntegradorTemporal:
+    """
+    Avanza un paso de theta' = L(theta) theta con el esquema elegido,
+    reduciendo cada etapa implícita a la forma de Euler implícito
+
+        x - w dt L(x) x = rhs,
+
+    que los solvers ya saben resolver (con Picard, Newton o una factorización
+    lineal) tomando rhs en el lugar de theta_old:
+
+    - 'euler': Euler implícito, w = 1, rhs = theta_n (orden 1).
+    - 'cn': Crank-Nicolson, w = 1/2, rhs = theta_n + dt/2 L(theta_n) theta_n.
+      Orden 2 pero solo A-estable: en frentes empinados puede oscilar.
+    - 'bdf2': BDF2 de paso variable sobre los dos últimos estados aceptados
+      (el primer paso, sin historia, es de Euler). L-estable.
+    - 'trbdf2': TR-BDF2, una etapa trapecial hasta t + gamma dt seguida de
+      BDF2 con theta_n y el estado intermedio. L-estable y de un paso; el
+      recomendado para frentes de Brooks-Corey.
+
+    'cn' y 'trbdf2' empiezan con un arranque de Rannacher (ver _arranque)
+    cuando el paso parte de un estado sin historia, como la condición
+    inicial discontinua de una gota.
+
+    El paso aceptado anterior (estado y dt) lo pasa explícitamente el bucle
+    temporal, que es quien sabe qué pasos se aceptaron: el integrador no
+    guarda estado entre pasos, así que un reintento, una reanudación desde
+    un checkpoint o una región activa no cambian el esquema.
+
+    Como los coeficientes de cada rhs suman 1 y L se anula en los nodos
+    Dirichlet, el contorno de rhs conserva los valores de theta_n.
+
+    Args:
+        esquema (str): Uno de ESQUEMAS.
+    """
+
+    def __init__(self, esquema='euler'):
+        if esquema not in ESQUEMAS:
+            raise ValueError(f"esquema debe ser uno de {ESQUEMAS}, no {esquema!r}")
+        self.esquema = esquema
+
+    def paso(self, resolver_etapa, aplicar_operador, theta, dt, previo=None):
+        """
+        Un paso del esquema.
+
+        Args:
+            resolver_etapa (callable): resolver_etapa(rhs, dt_etapa, previo=None)
+                -> (x, iteraciones, convergido), la solución de
+                x - dt_etapa L(x) x = rhs (un paso de Euler implícito desde rhs).
+                Cuando rhs es un estado recibe en previo el paso que llevó a él,
+                (estado, dt), p. ej. para el predictor de IteracionNoLineal.
+            aplicar_operador (callable): aplicar_operador(theta) -> L(theta) theta,
+                con ceros en los nodos Dirichlet (no se usa con 'euler' ni 'bdf2').
+            theta (np.array): Estado al inicio del paso.
+            dt (float): Paso temporal.
+            previo (tuple, opcional): (estado, dt) del paso aceptado que llevó
+                a theta, o None si theta no tiene historia (el estado inicial).
+
+        Returns:
+            tuple: (theta_nuevo, iteraciones, convergido), con las iteraciones
+                sumadas sobre las etapas (por miembro si la etapa las devuelve
+                como arreglos, ver iteracion_no_lineal.picard_por_miembro).
+        """
+        if self.esquema == 'euler':
+            return resolver_etapa(theta, dt, previo)
+        if self.esquema == 'bdf2':
+            return self._paso_bdf2(resolver_etapa, theta, dt, previo)
+        if previo is None:
+            return self._arranque(resolver_etapa, theta, dt)
+        if self.esquema == 'cn':
+            return resolver_etapa(theta + (0.5 * dt) * aplicar_operador(theta), 0.5 * dt)
+        return self._paso_trbdf2(resolver_etapa, aplicar_operador, theta, dt)
+
+    def _arranque(self, resolver_etapa, theta, dt):
+        """
+        Arranque de Rannacher: desde un estado sin historia (el inicial, en
+        general discontinuo) dos medios pasos de Euler implícito amortiguan las
+        componentes rígidas que la etapa trapecial no amortigua. El error local
+        es O(dt^2) una sola vez, así que el orden global sigue siendo 2.
+        """
+        theta_medio, iter_1, conv_1 = resolver_etapa(theta, 0.5 * dt)
+        theta_nuevo, iter_2, conv_2 = resolver_etapa(theta_medio, 0.5 * dt, (theta, 0.5 * dt))
+        return theta_nuevo, iter_1 + iter_2, conv_1 & conv_2
+
+    def _paso_bdf2(self, resolver_etapa, theta, dt, previo):
+        """BDF2 de paso variable con omega = dt / dt_previo, normalizado a la forma de Euler."""
+        if previo is None:
+            return resolver_etapa(theta, dt)
+        theta_previo, dt_previo = previo
+        omega = dt / dt_previo
+        a0 = (1.0 + 2.0 * omega) / (1.0 + omega)
+        rhs = ((1.0 + omega) * theta - (omega ** 2 / (1.0 + omega)) * theta_previo) / a0
+        return resolver_etapa(rhs, dt / a0)
+
+    def _paso_trbdf2(self, resolver_etapa, aplicar_operador, theta, dt):
+        """TR-BDF2: trapecio hasta t + gamma dt y BDF2 sobre (theta_n, theta_gamma)."""
+        g = GAMMA_TRBDF2
+        rhs = theta + (0.5 * g * dt) * aplicar_operador(theta)
+        theta_g, iter_1, conv_1 = resolver_etapa(rhs, 0.5 * g * dt)
+        rhs = (theta_g - (1.0 - g) ** 2 * theta) / (g * (2.0 - g))
+        theta_nuevo, iter_2, conv_2 = resolver_etapa(rhs, (1.0 - g) / (2.0 - g) * dt)
+        return theta_nuevo, iter_1 + iter_2, conv_1 & conv_2
@@ -0,0 +1,180 @@
+import time
+import tracemalloc
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class _Fase:
+    """Cronómetro de una fase: suma el tiempo transcurrido al salir del bloque with."""
+    __slots__ = ('tiempos', 'nombre', 'inicio')
+
+    def __init__(self, tiempos, nombre):
+        self.tiempos = tiempos
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.tiempos[self.nombre] += time.perf_counter() - self.inicio
+        return False
+
+
+class Estadisticas:
+    """
+    Estadísticas opcionales de una corrida de un solver: tiempo de pared por
+    fase, iteraciones no lineales por paso, sistemas lineales resueltos (e
+    iteraciones de los solvers lineales iterativos) y memoria pico. Se pasa
+    al solver con estadisticas=Estadisticas() y se consulta al terminar
+    (resumen() o print).
+
+    Fases usadas por los solvers: 'evaluacion_D', 'ensamblado',
+    'resolucion_lineal', 'factorizacion' y 'convergencia'; 'total' es el
+    tiempo completo de la llamada.
+
+    Args:
+        memoria_detallada (bool): Si es True, mide con tracemalloc el pico de
+            memoria reservada durante esta corrida (memoria_pico; incluye los
+            arreglos de numpy, pero enlentece el solver). Siempre se registra
+            además, sin costo, el pico de memoria residente del proceso
+            (rss_pico_proceso, de getrusage): es el máximo desde que arrancó
+            el proceso y nunca baja, así que tras una corrida grande las
+            siguientes informan ese pico y no el suyo.
+    """
+    activo = True
+
+    def __init__(self, memoria_detallada=False):
+        self.memoria_detallada = memoria_detallada
+        self.tiempos = defaultdict(float)
+        self.iteraciones_por_paso = []
+        self.resoluciones_lineales = 0
+        self.iteraciones_lineales = 0
+        self.memoria_pico = None
+        self.rss_pico_proceso = None
+        self._inicio = None
+        self._inicio_tracemalloc = False
+
+    def fase(self, nombre):
+        """Contexto que acumula su duración en tiempos[nombre]."""
+        return _Fase(self.tiempos, nombre)
+
+    def registrar_paso(self, iteraciones):
+        """Registra las iteraciones no lineales de un paso temporal (aceptado o no)."""
+        self.iteraciones_por_paso.append(int(iteraciones))
+
+    def contar_resoluciones(self, n=1):
+        """Suma n sistemas lineales resueltos (un barrido ADI cuenta una por línea)."""
+        self.resoluciones_lineales += n
+
+    def contar_iteraciones_lineales(self, n):
+        """Suma n iteraciones de un solver lineal iterativo (p. ej. gradiente conjugado)."""
+        self.iteraciones_lineales += n
+
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        if self.memoria_detallada and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_tracemalloc = True
+        if self.memoria_detallada:
+            tracemalloc.reset_peak()
+
+    def finalizar(self):
+        self.tiempos['total'] += time.perf_counter() - self._inicio
+        if self.memoria_detallada:
+            self.memoria_pico = tracemalloc.get_traced_memory()[1]
+            if self._inicio_tracemalloc:
+                tracemalloc.stop()
+                self._inicio_tracemalloc = False
+        if resource is not None:
+            # ru_maxrss está en KiB en Linux (pico del proceso completo, no de la corrida)
+            self.rss_pico_proceso = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    @property
+    def iteraciones_totales(self):
+        return sum(self.iteraciones_por_paso)
+
+    def resumen(self):
+        """Diccionario con todas las estadísticas (serializable a JSON)."""
+        pasos = len(self.iteraciones_por_paso)
+        return {
+            'tiempos': dict(self.tiempos),
+            'pasos': pasos,
+            'iteraciones_totales': self.iteraciones_totales,
+            'iteraciones_por_paso': list(self.iteraciones_por_paso),
+            'iteraciones_promedio': self.iteraciones_totales / pasos if pasos else 0.0,
+            'iteraciones_maximas': max(self.iteraciones_por_paso, default=0),
+            'resoluciones_lineales': self.resoluciones_lineales,
+            'iteraciones_lineales': self.iteraciones_lineales,
+            'memoria_pico': self.memoria_pico,
+            'rss_pico_proceso': self.rss_pico_proceso,
+        }
+
+    def __str__(self):
+        r = self.resumen()
+        total = r['tiempos'].get('total', 0.0)
+        lineas = [f"{'Fase':<20} | {'Tiempo [s]':>10} | {'%':>6}"]
+        for nombre, t in sorted(r['tiempos'].items(), key=lambda item: -item[1]):
+            if nombre != 'total':
+                lineas.append(f"{nombre:<20} | {t:>10.4f} | {100 * t / total if total else 0:>6.1f}")
+        lineas.append(f"{'total':<20} | {total:>10.4f} |")
+        if r['pasos']:  # los solvers lineales no registran iteraciones
+            lineas.append(f"Pasos: {r['pasos']}, iteraciones: {r['iteraciones_totales']} "
+                          f"({r['iteraciones_promedio']:.2f} por paso, máx. {r['iteraciones_maximas']})")
+        lineas.append(f"Sistemas lineales resueltos: {r['resoluciones_lineales']}")
+        if r['iteraciones_lineales']:
+            promedio = r['iteraciones_lineales'] / max(r['resoluciones_lineales'], 1)
+            lineas.append(f"Iteraciones lineales: {r['iteraciones_lineales']} ({promedio:.1f} por sistema)")
+        if r['memoria_pico'] is not None:
+            lineas.append(f"Memoria pico de la corrida: {r['memoria_pico'] / 2 ** 20:.1f} MiB (tracemalloc)")
+        if r['rss_pico_proceso'] is not None:
+            lineas.append(f"RSS pico del proceso: {r['rss_pico_proceso'] / 2 ** 20:.1f} MiB "
+                          f"(desde el inicio del proceso, no de esta corrida)")
+        return "\n".join(lineas)
+
+
+class _FaseNula:
+    """Contexto vacío compartido por todas las fases cuando no se mide."""
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _EstadisticasNulas:
+    """Objeto nulo con la interfaz de Estadisticas: no mide nada y no reserva memoria."""
+    __slots__ = ()
+    activo = False
+    _FASE = _FaseNula()
+
+    def fase(self, nombre):
+        return self._FASE
+
+    def registrar_paso(self, iteraciones):
+        pass
+
+    def contar_resoluciones(self, n=1):
+        pass
+
+    def contar_iteraciones_lineales(self, n):
+        pass
+
+    def iniciar(self):
+        pass
+
+    def finalizar(self):
+        pass
+
+
+ESTADISTICAS_NULAS = _EstadisticasNulas()
+
+
+def estadisticas_o_nulas(estadisticas):
+    """Devuelve el objeto recibido o, si es None, el objeto nulo compartido."""
+    return ESTADISTICAS_NULAS if estadisticas is None else estadisticas
@@ -0,0 +1,157 @@
+import numpy as np
+from instrumentacion import ESTADISTICAS_NULAS
+
+# Tolerancias de la norma escalada: |delta| / (ATOL + RTOL |theta|) en RMS <= 1
+ATOL = 1e-6
+RTOL = 1e-5
+PROFUNDIDAD_ANDERSON = 3
+
+
+def norma_escalada(delta, theta, atol=ATOL, rtol=RTOL, pesos=None):
+    """
+    Norma RMS de delta / (atol + rtol |theta|). Al ser un promedio no crece
+    con el número de nodos, a diferencia de np.linalg.norm(delta). pesos
+    (opcional) es la multiplicidad de cada nodo, p. ej. en modo simetría.
+    """
+    e = (delta / (atol + rtol * np.abs(theta))) ** 2
+    if pesos is None:
+        return float(np.sqrt(np.mean(e)))
+    return float(np.sqrt(np.sum(pesos * e) / np.sum(pesos)))
+
+
+class IteracionNoLineal:
+    """
+    Iteración de punto fijo compartida por los pasos de Picard (B, D/E y el
+    solver radial): theta <- G(theta), donde G arma el sistema con D(theta)
+    y lo resuelve.
+
+    - Aceleración de Anderson de profundidad `profundidad` (0 = Picard puro):
+      el nuevo iterado combina los últimos G(theta) minimizando la
+      combinación de sus residuos G(theta) - theta.
+    - Predictor: con predictor=True el primer iterado de cada paso es la
+      extrapolación lineal de los dos pasos anteriores (acotada al rango del
+      estado actual, que por el principio del máximo contiene la solución)
+      en lugar del estado actual.
+    - Parada con norma_escalada(G(theta) - theta, G(theta)) <= 1, que no
+      depende del tamaño de la malla.
+
+    El paso aceptado anterior para el predictor lo pasa el solver en cada
+    llamada (previo), así que un paso rechazado y reintentado (paso
+    adaptativo) o el primero tras reanudar un checkpoint extrapolan desde el
+    mismo paso aceptado, y el objeto no guarda estado entre pasos.
+
+    Args:
+        profundidad (int): Iterados previos usados por Anderson.
+        predictor (bool): Extrapolar el iterado inicial de cada paso.
+        atol, rtol (float): Tolerancias de la norma escalada.
+        maxiter (int, opcional): Iteraciones máximas por paso; por defecto
+            las del solver.
+    """
+
+    def __init__(self, profundidad=PROFUNDIDAD_ANDERSON, predictor=True, atol=ATOL, rtol=RTOL, maxiter=None):
+        self.profundidad = profundidad
+        self.predictor = predictor
+        self.atol, self.rtol = atol, rtol
+        self.maxiter = maxiter
+
+    def _inicial(self, theta, dt, previo):
+        """Primer iterado del paso: theta o la extrapolación desde el paso aceptado anterior."""
+        if not self.predictor or previo is None:
+            return theta.copy()
+        previo, dt_previo = previo
+        inicial = theta + (dt / dt_previo) * (theta - previo)
+        return np.clip(inicial, theta.min(), theta.max())
+
+    def resolver(self, G, theta, dt, maxiter, est=ESTADISTICAS_NULAS, pesos=None, previo=None):
+        """
+        Resuelve el paso theta -> theta_nuevo = G(theta_nuevo).
+
+        Args:
+            G (callable): G(theta_k) -> nuevo iterado (un barrido de Picard).
+            theta (np.array): Estado al inicio del paso.
+            dt (float): Paso temporal (para el predictor).
+            maxiter (int): Iteraciones máximas si el objeto no fija otras.
+            est (Estadisticas): Fase 'convergencia' para la norma y la mezcla.
+            pesos (np.array, opcional): Multiplicidades para norma_escalada.
+            previo (tuple, opcional): (estado, dt) del paso aceptado que llevó
+                a theta, para el predictor; None en el primer paso.
+
+        Returns:
+            tuple: (theta_nuevo, iteraciones, convergido).
+        """
+        maxiter = self.maxiter or maxiter
+        x = self._inicial(theta, dt, previo)
+        cota_inf, cota_sup = theta.min(), theta.max()
+        historia_G, historia_f = [], []
+
+        n_iter = 0
+        convergido = False
+        for _ in range(maxiter):
+            n_iter += 1
+            g = G(x)
+            with est.fase('convergencia'):
+                f = g - x
+                if norma_escalada(f, g, self.atol, self.rtol, pesos) <= 1.0:
+                    x = g
+                    convergido = True
+                    break
+                x = self._mezclar(g, f, historia_G, historia_f, cota_inf, cota_sup)
+
+        return x, n_iter, convergido
+
+    def _mezclar(self, g, f, historia_G, historia_f, cota_inf, cota_sup):
+        """Paso de Anderson (tipo II, sin amortiguar) sobre los últimos `profundidad` residuos."""
+        if self.profundidad == 0:
+            return g
+        historia_G.append(g)
+        historia_f.append(f)
+        if len(historia_f) > self.profundidad + 1:
+            del historia_G[0], historia_f[0]
+        if len(historia_f) == 1:
+            return g
+
+        # Diferencias sucesivas de residuos y de iterados: min || f - dF gamma ||
+        dF = np.stack([(b - a).ravel() for a, b in zip(historia_f[:-1], historia_f[1:])], axis=1)
+        dG = np.stack([(b - a).ravel() for a, b in zip(historia_G[:-1], historia_G[1:])], axis=1)
+        gamma = np.linalg.lstsq(dF, f.ravel(), rcond=1e-10)[0]
+        mezcla = (g.ravel() - dG @ gamma).reshape(g.shape)
+        return np.clip(mezcla, cota_inf, cota_sup)
+
+
+def picard_por_miembro(G, theta, maxiter, tol, est=ESTADISTICAS_NULAS):
+    """
+    Picard sobre un conjunto de problemas independientes (eje 0 = miembro)
+    con convergencia por miembro: cada uno se detiene cuando la norma 2 de
+    su cambio, ||G(theta_k) - theta_k||, baja de tol (el mismo criterio que
+    el Picard de un solo problema) y deja de iterarse. Así los miembros que
+    convergen rápido no pagan las iteraciones de los lentos.
+
+    Args:
+        G (callable): G(theta_k, activos) -> nuevo iterado de los miembros
+            activos (índices en el eje 0); theta_k son solo esos miembros.
+        theta (np.array): Estado al inicio del paso, de forma (K, ...).
+        maxiter (int): Iteraciones máximas por miembro.
+        tol (float): Tolerancia sobre la norma 2 del cambio de cada miembro.
+        est (Estadisticas): Fase 'convergencia' para las normas.
+
+    Returns:
+        tuple: (theta_nuevo, iteraciones, convergido), los dos últimos de forma (K,).
+    """
+    K = theta.shape[0]
+    theta_k = theta.copy()
+    iteraciones = np.zeros(K, dtype=int)
+    convergido = np.zeros(K, dtype=bool)
+    activos = np.arange(K)
+    for _ in range(maxiter):
+        previo = theta_k if len(activos) == K else theta_k[activos]
+        nuevo = G(previo, activos)
+        iteraciones[activos] += 1
+        with est.fase('convergencia'):
+            norma = np.sqrt(np.sum((nuevo - previo) ** 2, axis=tuple(range(1, nuevo.ndim))))
+            theta_k[activos] = nuevo
+        listos = norma < tol
+        convergido[activos[listos]] = True
+        activos = activos[~listos]
+        if activos.size == 0:
+            break
+    return theta_k, iteraciones, convergido
@@ -1,4 +1,5 @@
 import numpy as np
+from operator import itemgetter
 from actividadA import resolucion_ecuacion_difusion_linea_1D, graficar_imagen_A
 from actividadB import (resolucion_ecuacion_richards_1D_no_lineal, validacion_con_boltzmann, graficar_comparacion_B)
 from actividadC import resolucion_ecuacion_difusion_2D, grafica_convergencia
@@ -6,12 +7,20 @@ from actividadD import solver_richards_2d_circular, solver_1d_radial, graficar_r
 from actividadE import solver_richards_2d_eliptica, graficar_resultados_E
 from actividadF import analisis_costo_computacional, graficar_escalamiento_computacional
 from models_soil_models import diffusivity_brooks_corey
+from barrido_parametros import barrido_parametros, columna
 
 def separador(titulo):
     print("\n" + "=" * 60)
     print(f" {titulo}")
     print("=" * 60)
 
+def informar_malla_c(fila):
+    m = fila['parametros']['Nx']
+    if fila['error'] is None:
+        print(f"C: Malla {m}x{m} -> Error {fila['resultado']:.2e}")
+    else:
+        print(f"C: Malla {m}x{m} -> Falló ({fila['error']})")
+
 if __name__ == "__main__":
     # =========================================================
     # EJERCICIO A
@@ -51,11 +60,14 @@ if __name__ == "__main__":
     separador("EJERCICIO C: Difusión 2D Lineal")
 
     M_vals_c = [19, 39, 79]
-    errs_c = []
-    for m in M_vals_c:
-        _, _, err = resolucion_ecuacion_difusion_2D(0.01, 1.0, 1.0, 0.1, m, m, 100)
-        errs_c.append(err)
-        print(f"C: Malla {m}x{m} -> Error {err:.2e}")
+    # Las mallas son independientes: se resuelven en paralelo y solo vuelve el error
+    casos_c = [dict(D0=0.01, Lx=1.0, Ly=1.0, T_final=0.1, Nx=m, Ny=m, N=100) for m in M_vals_c]
+    tabla_c = barrido_parametros(resolucion_ecuacion_difusion_2D, casos_c, extraer=itemgetter(2),
+                                 al_terminar=informar_malla_c)
+    fallidos_c = [f"{f['parametros']['Nx']}: {f['error']}" for f in tabla_c if f['error'] is not None]
+    if fallidos_c:
+        raise RuntimeError("mallas fallidas en la convergencia de C: " + "; ".join(fallidos_c))
+    errs_c = columna(tabla_c, 'resultado')
     grafica_convergencia(M_vals_c, errs_c)
 
     # =========================================================
@@ -70,7 +82,8 @@ if __name__ == "__main__":
     X_d, Y_d, th_d, R_g = solver_richards_2d_circular(diffusivity_brooks_corey, Lx, Ly, T_de, Nx, Ny, N_de)
 
     print("D: Resolviendo Richards 1D Radial para validar...")
-    r_d, th_radial_d = solver_1d_radial(diffusivity_brooks_corey, Lx / 1.5, T_de, 100, 100, R_g)
+    # Malla graduada alrededor del borde de la gota: mismo costo, ~3x menos error que la uniforme
+    r_d, th_radial_d = solver_1d_radial(diffusivity_brooks_corey, Lx / 1.5, T_de, 100, 100, R_g, graduacion=6.0)
 
     graficar_resultados_D(X_d, Y_d, th_d, r_d, th_radial_d, Lx, Ly, T_de)
 
@@ -92,47 +105,29 @@ if __name__ == "__main__":
     res_f = analisis_costo_computacional()
     graficar_escalamiento_computacional(res_f)
 
-    print("\n" + "=" * 85)
+    # Columna de actividad tan ancha como la etiqueta más larga (sin recortar)
+    etiquetas = {nombre: f"{nombre} ({r['descripcion']})" for nombre, r in res_f.items()}
+    ancho = max([len('Actividad')] + [len(e) for e in etiquetas.values()])
+    ancho_tabla = ancho + 57
+
+    print("\n" + "=" * ancho_tabla)
     print("RESUMEN FINAL: DISCRETIZACIÓN Y COSTO COMPUTACIONAL (Consigna F)")
-    print("=" * 85)
-    print(f"{'Actividad':<20} | {'Malla (Espacial)':<15} | {'Pasos (N)':<10} | {'Costo / Tiempo'}")
-    print("-" * 85)
-
-    # --- 1. Datos de Actividad A (Tomamos el caso más costoso del benchmark) ---
-    idx_a = -1  # Último elemento
-    m_a = res_f['A']['M'][idx_a]
-    n_a = res_f['A']['N'][idx_a]
-    t_a = res_f['A']['tiempos'][idx_a]
-    print(f"{'A (1D Lineal)':<20} | {m_a:<15} | {n_a:<10} | {t_a:.4f} s (Benchmark)")
-
-    # --- 2. Datos de Actividad B (Usamos las variables definidas arriba: M_b, N_b) ---
-    # Costo teórico: O(N * M * Picard_iter). Asumimos ~5 iteraciones promedio.
-    ops_b = N_b * M_b * 5
-    print(f"{'B (1D No Lineal)':<20} | {M_b:<15} | {N_b:<10} | ~{ops_b:.1e} ops (Teórico)")
-
-    # --- 3. Datos de Actividad C (Tomamos el caso más costoso del benchmark) ---
-    idx_c = -1
-    m_c = res_f['C']['M'][idx_c]
-    # En actividadF.py, N está fijo en 100 para el benchmark de C
-    n_c = 100
-    t_c = res_f['C']['tiempos'][idx_c]
-    print(f"{'C (2D Lineal ADI)':<20} | {m_c}x{m_c:<12} | {n_c:<10} | {t_c:.4f} s (Benchmark)")
-
-    # --- 4. Datos de Actividad D (Usamos variables definidas: Nx, Ny, N_de) ---
-    # Costo teórico: O(N * Nx * Ny * Picard). Asumimos ~10 iteraciones.
-    ops_d = N_de * Nx * Ny * 10
-    print(f"{'D (2D Circular)':<20} | {Nx}x{Ny:<12} | {N_de:<10} | ~{ops_d:.1e} ops (Teórico)")
-
-    # --- 5. Datos de Actividad E (Usamos variables definidas) ---
-    # En E usamos Nx=60, Ny=60 (definido en la llamada a la función)
-    Nx_e, Ny_e = 60, 60
-    ops_e = N_de * Nx_e * Ny_e * 10
-    print(f"{'E (2D Elíptica)':<20} | {Nx_e}x{Ny_e:<12} | {N_de:<10} | ~{ops_e:.1e} ops (Teórico)")
-
-    print("-" * 85)
-    print("NOTA: 'ops' = Operaciones de punto flotante estimadas.")
-    print("      Las actividades A y C reportan tiempo real de ejecución medido.")
-    print("      Las actividades B, D y E reportan complejidad teórica (O) basada en la malla.")
-    print("=" * 85)
+    print("=" * ancho_tabla)
+    print(f"{'Actividad':<{ancho}} | {'Malla / tol':<12} | {'Trabajo':<10} | {'Mediana ± IQR [s]':<20} | Exponente")
+    print("-" * ancho_tabla)
+
+    # Caso más costoso de cada solver, medido (benchmark.py)
+    for nombre, r in res_f.items():
+        malla = f"{r['tamanos'][-1]:g}"
+        trabajo = '-' if r['trabajo'][-1] is None else f"{r['trabajo'][-1]:.1e}"
+        tiempo = f"{r['mediana'][-1]:.4f} ± {r['iqr'][-1]:.4f}"
+        exponente = '-' if r['exponente'] is None else f"{r['exponente']:.2f}"
+        print(f"{etiquetas[nombre]:<{ancho}} | {malla:<12} | {trabajo:<10} | {tiempo:<20} | {exponente}")
+
+    print("-" * ancho_tabla)
+    print("NOTA: 'Trabajo' = incógnitas x pasos temporales; 'Exponente' = pendiente de log(tiempo) vs")
+    print("      log(trabajo) sobre todos los tamaños (1 = escalamiento lineal).")
+    print("      Todos los tiempos son medidos (mediana de varias repeticiones tras calentamiento).")
+    print("=" * ancho_tabla)
 
     print("\nFIN DEL PROGRAMA.")
\ No newline at end of file
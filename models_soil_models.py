@@ -16,12 +16,41 @@ def _ensure_array(theta):
         theta = np.asarray(theta, dtype=np.float64)
     return theta, was_scalar
 
+def _saturacion_efectiva_escalar(theta):
+    """Interna: Se recortada a [1e-12/(THETA_S-THETA_R), 1] para un theta escalar."""
+    return min(max(float(theta) - THETA_R, 1e-12) / (THETA_S - THETA_R), 1.0)
+
+def diffusivity_brooks_corey_escalar(theta):
+    """
+    D(theta) para un único theta, con aritmética de floats de Python: evita los
+    arreglos, máscaras y recortes de numpy en llamadas punto a punto (EDO de
+    Boltzmann). Coincide con diffusivity_brooks_corey salvo redondeo (1 ulp).
+    """
+    return D_SAT * _saturacion_efectiva_escalar(theta) ** N_BC
+
+def dD_dtheta_brooks_corey_escalar(theta):
+    """dD/dtheta para un único theta; ver diffusivity_brooks_corey_escalar."""
+    Se = _saturacion_efectiva_escalar(theta)
+    if Se > 1e-12:
+        return D_SAT * N_BC * Se ** (N_BC - 1) / (THETA_S - THETA_R)
+    return 0.0
+
+def brooks_corey_escalar(theta):
+    """(D, dD/dtheta) para un único theta, calculando Se una sola vez."""
+    Se = _saturacion_efectiva_escalar(theta)
+    D = D_SAT * Se ** N_BC
+    if Se > 1e-12:
+        return D, D_SAT * N_BC * Se ** (N_BC - 1) / (THETA_S - THETA_R)
+    return D, 0.0
+
 def diffusivity_brooks_corey(theta):
     """
     D(theta) según Brooks-Corey (forma empírica dada en la consigna).
     Acepta theta escalar o array. Devuelve escalar si la entrada fue escalar,
     o array si la entrada fue array.
     """
+    if np.isscalar(theta):
+        return diffusivity_brooks_corey_escalar(theta)
     theta_arr, was_scalar = _ensure_array(theta)
 
     delta_theta = THETA_S - THETA_R
@@ -41,6 +70,8 @@ def dD_dtheta_brooks_corey(theta):
     Derivada dD/dtheta analítica para Brooks-Corey.
     Acepta scalar o array; devuelve del mismo tipo (scalar o array).
     """
+    if np.isscalar(theta):
+        return dD_dtheta_brooks_corey_escalar(theta)
     theta_arr, was_scalar = _ensure_array(theta)
 
     delta_theta = THETA_S - THETA_R
@@ -57,3 +88,98 @@ def dD_dtheta_brooks_corey(theta):
     if was_scalar:
         return float(deriv[0])
     return deriv
+
+
+# Tablas de D(theta) ya construidas, indexadas por (THETA_R, D_SAT, N_BC, tol)
+_TABLAS_DIFUSIVIDAD = {}
+
+
+class DifusividadTabulada:
+    """
+    D(theta) de Brooks-Corey tabulada en una malla uniforme sobre [theta_r, THETA_S]
+    con interpolación lineal vectorizada, para evitar evaluar la potencia
+    no entera Se ** n_bc en cada nodo y en cada iteración.
+
+    El número de puntos se elige a partir de la cota del error de interpolación
+    lineal, h^2/8 * max|f''|, de modo que
+        |D_tab - D| <= tol * d_sat   y   |dD_tab - dD| <= tol * d_sat * n_bc / (THETA_S - theta_r).
+    Fuera de [theta_r, THETA_S] se usan los valores extremos, igual que el
+    recorte de diffusivity_brooks_corey.
+
+    Se usa como D_func (llamándola) y derivada() sirve como dD_func.
+    Conviene obtenerla con difusividad_tabulada(), que reutiliza las tablas.
+    """
+
+    def __init__(self, theta_r=THETA_R, d_sat=D_SAT, n_bc=N_BC, tol=1e-6):
+        if n_bc < 3:
+            raise ValueError(f"la cota de error de la tabla requiere n_bc >= 3, no {n_bc}")
+
+        delta_theta = THETA_S - theta_r
+        # Cotas de |f''| en unidades de Se para D/d_sat y para su derivada normalizada
+        h_D = np.sqrt(8.0 * tol / (n_bc * (n_bc - 1)))
+        h_dD = np.sqrt(8.0 * tol / ((n_bc - 1) * (n_bc - 2)))
+        self.n_puntos = int(np.ceil(1.0 / min(h_D, h_dD))) + 1
+
+        self.theta_r, self.d_sat, self.n_bc, self.tol = theta_r, d_sat, n_bc, tol
+        self.theta = np.linspace(theta_r, THETA_S, self.n_puntos)
+        Se = np.linspace(0.0, 1.0, self.n_puntos)
+        D = d_sat * Se ** n_bc
+        dD = d_sat * n_bc * Se ** (n_bc - 1) / delta_theta
+
+        # Valor en el nodo izquierdo y pendiente de cada intervalo
+        self._D0, self._dD_pend = D[:-1].copy(), np.diff(D)
+        self._dD0, self._ddD_pend = dD[:-1].copy(), np.diff(dD)
+        self._escala = (self.n_puntos - 1) / delta_theta
+        self._s_max = self.n_puntos - 1 - 1e-9
+
+    def _ubicar(self, theta):
+        """Índice del intervalo y coordenada local en [0, 1) de cada theta."""
+        theta = np.asarray(theta, dtype=np.float64)
+        s = np.subtract(theta, self.theta_r, out=np.empty(theta.shape))
+        s *= self._escala
+        np.maximum(s, 0.0, out=s)
+        np.minimum(s, self._s_max, out=s)
+        piso = np.floor(s)
+        s -= piso
+        return piso.astype(np.intp), s
+
+    @staticmethod
+    def _interpolar(base, pendiente, idx, w):
+        valor = pendiente.take(idx)
+        valor *= w
+        valor += base.take(idx)
+        return valor
+
+    def __call__(self, theta):
+        """D(theta) interpolada; escalar si theta es escalar."""
+        idx, w = self._ubicar(theta)
+        D = self._interpolar(self._D0, self._dD_pend, idx, w)
+        return float(D) if np.ndim(theta) == 0 else D
+
+    def derivada(self, theta):
+        """dD/dtheta interpolada; escalar si theta es escalar."""
+        idx, w = self._ubicar(theta)
+        dD = self._interpolar(self._dD0, self._ddD_pend, idx, w)
+        return float(dD) if np.ndim(theta) == 0 else dD
+
+    def evaluar(self, theta):
+        """(D, dD/dtheta) compartiendo la búsqueda en la tabla."""
+        idx, w = self._ubicar(theta)
+        D = self._interpolar(self._D0, self._dD_pend, idx, w)
+        dD = self._interpolar(self._dD0, self._ddD_pend, idx, w)
+        if np.ndim(theta) == 0:
+            return float(D), float(dD)
+        return D, dD
+
+
+def difusividad_tabulada(theta_r=THETA_R, d_sat=D_SAT, n_bc=N_BC, tol=1e-6):
+    """
+    Devuelve la DifusividadTabulada de estos parámetros, construyéndola solo
+    la primera vez; las siguientes llamadas reutilizan la tabla en caché.
+    """
+    clave = (theta_r, d_sat, n_bc, tol)
+    tabla = _TABLAS_DIFUSIVIDAD.get(clave)
+    if tabla is None:
+        tabla = DifusividadTabulada(theta_r, d_sat, n_bc, tol)
+        _TABLAS_DIFUSIVIDAD[clave] = tabla
+    return tabla
@@ -0,0 +1,118 @@
+import numpy as np
+
+# Parámetros del controlador de paso
+SEGURIDAD = 0.9
+FACTOR_MIN = 0.2
+FACTOR_MAX = 2.0
+ITER_OBJETIVO = 6
+
+
+def estimar_error_local(theta_new, theta_old, theta_anterior, dt, dt_prev, tol, T_final):
+    """
+    Estima el error local de truncamiento de Euler implícito comparando la
+    solución con el predictor de extrapolación lineal de los dos pasos previos:
+
+        pred = theta_old + dt/dt_prev * (theta_old - theta_anterior)
+        LTE ≈ dt / (2 dt + dt_prev) * (theta_new - pred)
+
+    El error se controla por unidad de tiempo (|LTE| <= tol * dt/T_final), de
+    modo que la suma de errores locales hasta T_final queda acotada por tol.
+    Devuelve el máximo nodal de |LTE| / (tol * dt/T_final * (1 + |theta_new|));
+    el paso es aceptable si el resultado es <= 1.
+    """
+    pred = theta_old + (dt / dt_prev) * (theta_old - theta_anterior)
+    lte = dt / (2.0 * dt + dt_prev) * (theta_new - pred)
+    escala = tol * (dt / T_final) * (1.0 + np.abs(theta_new))
+    return float(np.max(np.abs(lte) / escala))
+
+
+def factor_paso(error, iteraciones, iter_objetivo=ITER_OBJETIVO):
+    """
+    Factor multiplicativo para el próximo dt: combina el control de error
+    por unidad de tiempo (orden 1, exponente 1) con la velocidad de
+    convergencia de Picard.
+    """
+    factor = SEGURIDAD / max(error, 1e-10)
+    if iteraciones > iter_objetivo:
+        factor = min(factor, iter_objetivo / iteraciones)
+    return min(FACTOR_MAX, max(FACTOR_MIN, factor))
+
+
+def integrar_adaptativo(paso, theta0, T_final, dt0, tol, iter_objetivo=ITER_OBJETIVO, dt_min=None,
+                        al_aceptar=None, estado=None):
+    """
+    Avanza theta0 hasta T_final con paso variable.
+
+    Args:
+        paso (callable): paso(theta, dt, previo) -> (theta_new, iteraciones, convergido),
+            un paso implícito con su iteración no lineal; previo es (estado, dt)
+            del último paso aceptado, o None antes del primero.
+        theta0 (np.array): Estado inicial.
+        T_final (float): Tiempo final.
+        dt0 (float): Paso inicial (el primer paso se acepta si converge).
+        tol (float): Tolerancia del error acumulado hasta T_final.
+        iter_objetivo (int): Iteraciones no lineales deseadas por paso.
+        dt_min (float): Paso mínimo; por debajo se aborta. Por defecto 1e-12 * T_final.
+        al_aceptar (callable, opcional): al_aceptar(n, t, theta) tras cada paso
+            aceptado (n = pasos aceptados hasta ahora), p. ej. para guardar snapshots.
+        estado (dict, opcional): Estado del controlador {'t', 'dt', 'dt_prev',
+            'theta_anterior', 'aceptados'}. Si trae 't', la integración se
+            reanuda desde ahí (theta0 es el estado en ese t); tras cada paso
+            aceptado se actualiza en el lugar, antes de llamar a al_aceptar,
+            para poder guardarlo en un checkpoint.
+
+    Returns:
+        tuple: (theta, info) con info = {'aceptados', 'rechazados', 'iteraciones', 'dt'},
+            donde 'dt' es la lista de pasos aceptados.
+    """
+    if dt_min is None:
+        dt_min = 1e-12 * T_final
+
+    theta = theta0
+    theta_anterior = None
+    dt_prev = None
+    t = 0.0
+    dt = dt0
+    n_previos = 0
+    if estado is not None and 't' in estado:
+        t, dt, dt_prev = estado['t'], estado['dt'], estado['dt_prev']
+        theta_anterior, n_previos = estado['theta_anterior'], estado['aceptados']
+    info = {'aceptados': 0, 'rechazados': 0, 'iteraciones': 0, 'dt': []}
+
+    while t < T_final * (1.0 - 1e-12):
+        dt = min(dt, T_final - t)
+        previo = None if theta_anterior is None else (theta_anterior, dt_prev)
+        theta_new, n_iter, convergido = paso(theta, dt, previo)
+        info['iteraciones'] += n_iter
+
+        if not convergido:
+            error, factor = np.inf, FACTOR_MIN
+        elif theta_anterior is None:
+            error, factor = 0.0, 1.0
+        else:
+            error = estimar_error_local(theta_new, theta, theta_anterior, dt, dt_prev, tol, T_final)
+            factor = factor_paso(error, n_iter, iter_objetivo)
+
+        aceptado = error <= 1.0
+        if aceptado:
+            theta_anterior, theta = theta, theta_new
+            dt_prev = dt
+            t += dt
+            info['aceptados'] += 1
+            info['dt'].append(dt)
+        else:
+            info['rechazados'] += 1
+            factor = min(factor, 0.5)
+
+        dt *= factor
+        if dt < dt_min:
+            raise RuntimeError(f"paso temporal por debajo del mínimo ({dt:.3e}) en t={t:.6e}")
+
+        if aceptado:
+            if estado is not None:
+                estado.update(t=t, dt=dt, dt_prev=dt_prev, theta_anterior=theta_anterior,
+                              aceptados=n_previos + info['aceptados'])
+            if al_aceptar is not None:
+                al_aceptar(n_previos + info['aceptados'], t, theta)
+
+    return theta, info
@@ -0,0 +1,315 @@
+"""
+Resolución a precisión pedida para las actividades A, C (difusión lineal)
+y B, D (Richards): en lugar de adivinar M, N (Nx = Ny = M en 2D), se estima
+el error con una jerarquía gruesa y extrapolación de Richardson y se elige
+la discretización más barata que cumple la tolerancia L2.
+
+Uso:
+    python precision_objetivo.py A 1e-5
+    python precision_objetivo.py B 1e-4 --T_final 1000 --esquema trbdf2
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from actividadA import resolucion_ecuacion_difusion_linea_1D
+from actividadB import resolucion_ecuacion_richards_1D_no_lineal
+from actividadC import resolucion_ecuacion_difusion_2D
+from actividadD import solver_richards_2d_circular
+from models_soil_models import diffusivity_brooks_corey
+
+# Jerarquía gruesa: NIVELES mallas anidadas (M+1 intervalos -> 2(M+1)) con
+# N_GRUESO pasos y NIVELES pasos temporales (N -> 2N) en la malla más gruesa;
+# se agregan niveles (hasta MAX_NIVELES) mientras no esté en régimen asintótico
+NIVELES = 4
+MAX_NIVELES = 7
+N_GRUESO = 8
+M_GRUESA_1D = 19
+M_GRUESA_2D = 9
+# Gota de D (R = L/5): 16 celdas en el radio; con menos el frente no está resuelto
+M_GRUESA_D = 79
+
+# Régimen asintótico: los dos últimos órdenes observados caen en este rango
+# y difieren en menos de TOL_ORDEN
+ORDEN_MIN, ORDEN_MAX = 0.5, 4.0
+TOL_ORDEN = 0.2
+
+# El modelo de error apunta a SEGURIDAD * tol (es una estimación)
+SEGURIDAD = 0.8
+
+# Límites de la corrida final: incógnitas (memoria) e incógnitas x pasos (tiempo)
+MAX_INCOGNITAS = 1e6
+MAX_TRABAJO = 1e9
+
+# Fracciones de la tolerancia asignadas al error espacial al buscar la (M, N) más barata
+FRACCIONES_ESPACIO = np.linspace(0.05, 0.95, 19)
+
+
+# --- Problemas: cada uno fija la física y expone resolver(M, N) -> salida del solver ---
+# 'campo' extrae theta de la salida; 'medida' es la longitud o el área del dominio;
+# 'M_grueso' es la malla más gruesa de la jerarquía.
+
+def _problema_A(D0=0.01, L=1.0, T_final=0.5, esquema='euler'):
+    return {'dims': 1, 'medida': L, 'campo': lambda salida: salida[1], 'M_grueso': M_GRUESA_1D,
+            'resolver': lambda M, N: resolucion_ecuacion_difusion_linea_1D(D0, L, T_final, M, N, esquema=esquema)}
+
+
+def _problema_B(D_func=diffusivity_brooks_corey, L=0.5, T_final=0.1, theta_inicial=None, **opciones):
+    if theta_inicial is None:
+        def theta_inicial(x):
+            return 0.8 * np.exp(-((x - L / 2) ** 2) / (2 * 0.05 ** 2))
+
+    def resolver(M, N):
+        x = np.linspace(0, L, M + 2)
+        return resolucion_ecuacion_richards_1D_no_lineal(D_func, L, T_final, M, N, theta_inicial(x), **opciones)
+    return {'dims': 1, 'medida': L, 'campo': lambda salida: salida[1], 'M_grueso': M_GRUESA_1D,
+            'resolver': resolver}
+
+
+def _problema_C(D0=0.01, Lx=1.0, Ly=1.0, T_final=0.1):
+    return {'dims': 2, 'medida': Lx * Ly, 'campo': lambda salida: salida[0], 'M_grueso': M_GRUESA_2D,
+            'resolver': lambda M, N: resolucion_ecuacion_difusion_2D(D0, Lx, Ly, T_final, M, M, N)}
+
+
+def _problema_D(D_func=diffusivity_brooks_corey, Lx=0.4, Ly=0.4, T_final=10.0, **opciones):
+    return {'dims': 2, 'medida': Lx * Ly, 'campo': lambda salida: salida[2], 'M_grueso': M_GRUESA_D,
+            'resolver': lambda M, N: solver_richards_2d_circular(D_func, Lx, Ly, T_final, M, M, N, **opciones)}
+
+
+PROBLEMAS = {'A': _problema_A, 'B': _problema_B, 'C': _problema_C, 'D': _problema_D}
+
+
+def _norma_L2(delta, medida, M, dims):
+    """Norma L2 discreta sqrt(sum delta^2 * volumen de celda) en una malla de M+1 intervalos por eje."""
+    return float(np.sqrt(np.sum(delta ** 2) * medida / (M + 1) ** dims))
+
+
+def _restringir(theta_fino, dims):
+    """Valores de una malla fina (2(M+1) intervalos) en los nodos de la gruesa (M+1 intervalos)."""
+    return theta_fino[(slice(None, None, 2),) * dims]
+
+
+def ordenes_observados(diferencias, razon=2.0):
+    """Orden log(d_k / d_k+1) / log(razon) de cada par de diferencias consecutivas de una jerarquía."""
+    d = np.asarray(diferencias, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log(d[:-1] / d[1:]) / np.log(razon)
+
+
+def regimen_asintotico(diferencias, razon=2.0):
+    """
+    Indica si una jerarquía está en el régimen asintótico, donde el modelo
+    C n^-p vale: los dos últimos órdenes observados (hacen falta tres
+    diferencias) están en [ORDEN_MIN, ORDEN_MAX] y difieren en menos de
+    TOL_ORDEN. Una última diferencia nula (error nulo en ese eje) también.
+
+    Args:
+        diferencias (list): ||u_k - u_k+1|| para niveles consecutivos.
+        razon (float): Factor de refinamiento entre niveles.
+
+    Returns:
+        bool
+    """
+    if diferencias[-1] == 0.0:
+        return True
+    ordenes = ordenes_observados(diferencias, razon)[-2:]
+    return bool(len(ordenes) == 2 and np.all((ordenes >= ORDEN_MIN) & (ordenes <= ORDEN_MAX))
+                and abs(ordenes[1] - ordenes[0]) <= TOL_ORDEN)
+
+
+def ajuste_richardson(diferencias, razon=2.0):
+    """
+    Modelo error(n) = C n^-p a partir de las diferencias entre soluciones
+    sucesivas de una jerarquía con n -> razon * n: el orden observado sale del
+    cociente de las dos últimas diferencias y, con él, la extrapolación de
+    Richardson da el error del nivel más fino, error_f = d / (razon^p - 1).
+    Sólo es una cota si la jerarquía está en régimen asintótico (ver
+    regimen_asintotico).
+
+    Args:
+        diferencias (list): ||u_k - u_k+1|| para niveles consecutivos (al menos dos).
+        razon (float): Factor de refinamiento entre niveles.
+
+    Returns:
+        tuple: (error del nivel más fino, orden p); con diferencia nula, (0, 1).
+    """
+    d = diferencias[-1]
+    if d == 0.0:
+        return 0.0, 1.0
+    p = float(ordenes_observados(diferencias, razon)[-1])
+    return d / (razon ** p - 1.0), p
+
+
+def elegir_discretizacion(tol, modelo, dims, M_min=1, N_min=1):
+    """
+    (M, N) más barata (costo M^dims * N) con error_x(M) + error_t(N) <= tol,
+    repartiendo la tolerancia entre espacio y tiempo (FRACCIONES_ESPACIO).
+
+    Args:
+        tol (float): Error L2 pedido.
+        modelo (dict): {'C_x', 'p', 'C_t', 'q'} con error_x = C_x (M+1)^-p y
+            error_t = C_t N^-q.
+        dims (int): Dimensiones espaciales.
+        M_min, N_min (int): Cotas inferiores.
+
+    Returns:
+        tuple: (M, N).
+    """
+    mejor = None
+    for f in FRACCIONES_ESPACIO:
+        M = M_min if modelo['C_x'] == 0.0 else int(np.ceil((modelo['C_x'] / (f * tol)) ** (1.0 / modelo['p']))) - 1
+        N = N_min if modelo['C_t'] == 0.0 else int(np.ceil((modelo['C_t'] / ((1.0 - f) * tol)) ** (1.0 / modelo['q'])))
+        M, N = max(M, M_min), max(N, N_min)
+        if mejor is None or M ** dims * N < mejor[0]:
+            mejor = (M ** dims * N, M, N)
+    return mejor[1], mejor[2]
+
+
+def resolver_con_tolerancia(problema, tol, M0=None, N0=N_GRUESO, niveles=NIVELES, max_trabajo=MAX_TRABAJO,
+                            **parametros):
+    """
+    Resuelve el problema de la actividad A, B, C o D con error L2 estimado
+    menor que tol, eligiendo la discretización en lugar de adivinarla.
+
+    1. Jerarquía gruesa: niveles mallas anidadas (M0, 2(M0+1)-1, ...) con N0
+       pasos y niveles pasos (N0, 2 N0, ...) en la malla M0. Las diferencias
+       entre niveles consecutivos, restringidas a los nodos comunes, aíslan
+       el error espacial (el temporal casi no depende de M) y el temporal.
+       Mientras una jerarquía no esté en régimen asintótico se le agrega un
+       nivel; si llega a MAX_NIVELES o a max_trabajo sin alcanzarlo se lanza
+       RuntimeError en lugar de devolver una solución sin cota de error.
+    2. Richardson (ajuste_richardson) da el orden observado y la constante de
+       cada error: error(M, N) ~ C_x (M+1)^-p + C_t N^-q.
+    3. Se toma la (M, N) de menor costo M^dims * N que cumple tol según el
+       modelo (elegir_discretizacion) y se resuelve; si una corrida de la
+       jerarquía ya la cubre (M y N mayores o iguales), se reutiliza. Si el
+       campo no es finito (divergió la iteración no lineal) se duplica N
+       mientras el trabajo no supere max_trabajo.
+
+    La salida por pantalla de los solvers se suprime; la elección se informa
+    con imprimir_resultado.
+
+    Args:
+        problema (str): 'A', 'B', 'C' o 'D'.
+        tol (float): Error L2 pedido (norma de _norma_L2, como error_L2 en A y C).
+        M0 (int, opcional): Malla más gruesa; por defecto la del problema
+            (M_GRUESA_1D, M_GRUESA_2D o M_GRUESA_D).
+        N0 (int): Pasos temporales del nivel más grueso.
+        niveles (int): Niveles iniciales de cada jerarquía (>= 2).
+        max_trabajo (float): Si la (M, N) elegida supera este trabajo (o
+            MAX_INCOGNITAS incógnitas) se lanza ValueError sin resolverla; si
+            un nivel más de la jerarquía o duplicar N ante una solución no
+            finita lo supera, RuntimeError.
+        **parametros: Física y opciones del problema (ver _problema_A ... _problema_D),
+            p. ej. D0, L, T_final, esquema, metodo o iteracion.
+
+    Returns:
+        tuple: (salida, info) con la salida del solver en la (M, N) elegida e
+            info = {'M', 'N', 'error_estimado', 'modelo', 'corridas', 'trabajo',
+            'tiempo'}; 'corridas' lista (M, N, segundos) de todas las
+            resoluciones hechas y 'trabajo' suma incógnitas x pasos, como el
+            costo total gastado (jerarquía incluida).
+    """
+    if problema not in PROBLEMAS:
+        raise ValueError(f"problema debe ser uno de {tuple(PROBLEMAS)}, no {problema!r}")
+    if niveles < 2:
+        raise ValueError("niveles debe ser >= 2 para estimar el error")
+    definicion = PROBLEMAS[problema](**parametros)
+    dims, medida, campo = definicion['dims'], definicion['medida'], definicion['campo']
+    if M0 is None:
+        M0 = definicion['M_grueso']
+
+    corridas = []
+    salidas = {}
+
+    def correr(M, N):
+        if (M, N) not in salidas:
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()), np.errstate(all='ignore'):
+                salidas[(M, N)] = definicion['resolver'](M, N)
+            corridas.append((M, N, time.perf_counter() - inicio))
+        return salidas[(M, N)]
+
+    def jerarquia(inicial, refinar, diferencia, admisible, eje):
+        """Niveles inicial, refinar(inicial), ... hasta el régimen asintótico, y sus diferencias."""
+        valores = [inicial]
+        for _ in range(niveles - 1):
+            valores.append(refinar(valores[-1]))
+        diferencias = [diferencia(a, b) for a, b in zip(valores[:-1], valores[1:])]
+        while not regimen_asintotico(diferencias):
+            siguiente = refinar(valores[-1])
+            if len(valores) == MAX_NIVELES or not admisible(siguiente):
+                ordenes = ", ".join(f"{o:.2f}" for o in ordenes_observados(diferencias))
+                raise RuntimeError(f"la jerarquía {eje} de {problema} ({valores[0]} ... {valores[-1]}) no está "
+                                   f"en el régimen asintótico (órdenes observados {ordenes}); aumentar M0, "
+                                   f"N0 o max_trabajo")
+            diferencias.append(diferencia(valores[-1], siguiente))
+            valores.append(siguiente)
+        return valores, diferencias
+
+    # 1. Jerarquías espacial (N0 fijo) y temporal (M0 fijo)
+    def dif_espacial(M, M_fina):
+        delta = campo(correr(M, N0)) - _restringir(campo(correr(M_fina, N0)), dims)
+        return _norma_L2(delta, medida, M, dims)
+
+    def dif_temporal(N, N_fino):
+        return _norma_L2(campo(correr(M0, N)) - campo(correr(M0, N_fino)), medida, M0, dims)
+
+    mallas, dif_x = jerarquia(M0, lambda M: 2 * (M + 1) - 1, dif_espacial,
+                              lambda M: M ** dims <= MAX_INCOGNITAS and M ** dims * N0 <= max_trabajo, 'espacial')
+    pasos, dif_t = jerarquia(N0, lambda N: 2 * N, dif_temporal, lambda N: M0 ** dims * N <= max_trabajo, 'temporal')
+
+    # 2. Modelo de error con Richardson (error del nivel más fino -> constante)
+    error_x, p = ajuste_richardson(dif_x)
+    error_t, q = ajuste_richardson(dif_t)
+    modelo = {'C_x': error_x * (mallas[-1] + 1) ** p, 'p': p, 'C_t': error_t * pasos[-1] ** q, 'q': q}
+
+    # 3. Discretización más barata que cumple tol (o una corrida ya hecha que la cubre)
+    M, N = elegir_discretizacion(SEGURIDAD * tol, modelo, dims, M_min=M0, N_min=N0)
+    cubren = [(Mc ** dims * Nc, Mc, Nc) for (Mc, Nc) in salidas if Mc >= M and Nc >= N]
+    if cubren:
+        _, M, N = min(cubren)
+    elif M ** dims > MAX_INCOGNITAS or M ** dims * N > max_trabajo:
+        raise ValueError(f"tol={tol:.2e} requiere M={M}, N={N} (trabajo {M ** dims * N:.2e}) según el modelo "
+                         f"(orden espacial {p:.2f}, temporal {q:.2f}); aumentar tol o max_trabajo")
+    salida = correr(M, N)
+    while not np.all(np.isfinite(campo(salida))):
+        if M ** dims * 2 * N > max_trabajo:
+            raise RuntimeError(f"la solución de {problema} no es finita con M={M}, N={N} y duplicar N "
+                               f"supera max_trabajo={max_trabajo:.2e}")
+        N *= 2
+        salida = correr(M, N)
+
+    error_estimado = modelo['C_x'] * (M + 1) ** -p + modelo['C_t'] * N ** -q
+    info = {'M': M, 'N': N, 'error_estimado': error_estimado, 'modelo': modelo, 'corridas': corridas,
+            'trabajo': sum(Mc ** dims * Nc for Mc, Nc, _ in corridas),
+            'tiempo': sum(s for _, _, s in corridas)}
+    return salida, info
+
+
+def imprimir_resultado(problema, tol, info):
+    modelo = info['modelo']
+    print(f"Precisión objetivo {problema}: tol={tol:.2e} -> M={info['M']}, N={info['N']} "
+          f"(error estimado {info['error_estimado']:.2e}; orden espacial {modelo['p']:.2f}, "
+          f"temporal {modelo['q']:.2f}; {len(info['corridas'])} corridas, trabajo {info['trabajo']:.2e}, "
+          f"{info['tiempo']:.2f} s)")
+    for M, N, segundos in info['corridas']:
+        print(f"  M={M:<6d} N={N:<6d} {segundos:8.3f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resolución con tolerancia L2 pedida")
+    parser.add_argument('problema', choices=list(PROBLEMAS))
+    parser.add_argument('tol', type=float, help="Error L2 pedido")
+    parser.add_argument('--T_final', type=float, help="Tiempo final (por defecto el de cada actividad)")
+    parser.add_argument('--esquema', help="Esquema temporal (A, B y D; ver esquemas_temporales)")
+    parser.add_argument('--max_trabajo', type=float, default=MAX_TRABAJO)
+    args = parser.parse_args()
+
+    parametros = {k: v for k, v in (('T_final', args.T_final), ('esquema', args.esquema)) if v is not None}
+    _, info = resolver_con_tolerancia(args.problema, args.tol, max_trabajo=args.max_trabajo, **parametros)
+    imprimir_resultado(args.problema, args.tol, info)
@@ -0,0 +1,541 @@
+import numpy as np
+from solver_tridiagonal import resolver_tridiagonal_lotes
+from paso_adaptativo import integrar_adaptativo
+from instrumentacion import ESTADISTICAS_NULAS, estadisticas_o_nulas
+from checkpoint import guardar_checkpoint, cargar_checkpoint
+from richards_2d_disperso import OperadorImplicito2D, _paso_implicito_picard
+from richards_2d_krylov import OperadorKrylov2D
+from region_activa import TOL_REGION, paso_en_region_activa
+from esquemas_temporales import IntegradorTemporal
+from iteracion_no_lineal import picard_por_miembro
+
+# Saturaciones usadas por las gotas de las actividades D y E
+THETA_FONDO = 1e-4
+THETA_GOTA = 0.90
+
+# Resolución de cada paso: ADI + Picard o sistema implícito completo, por LU
+# dispersa o por gradiente conjugado con multigrilla (sin matriz)
+METODOS_2D = ('adi', 'implicito', 'krylov')
+
+
+def condicion_inicial_gota(mascara, theta_gota=THETA_GOTA, theta_fondo=THETA_FONDO):
+    """Campo inicial: theta_gota dentro de la máscara y theta_fondo fuera."""
+    theta = np.full(mascara.shape, theta_fondo, dtype=np.float64)
+    theta[mascara] = theta_gota
+    return theta
+
+
+def distancias_al_centro(L, n):
+    """
+    |x - L/2| en los n+2 nodos de np.linspace(0, L, n+2), exactamente simétrica
+    (el redondeo de linspace no lo es): las máscaras de gota construidas con
+    ella son simétricas respecto de los ejes centrales, como pide simetria=True.
+    """
+    d = np.abs(np.linspace(0, L, n + 2) - L / 2.0)
+    return np.minimum(d, d[::-1])
+
+
+def es_simetrica(theta):
+    """True si theta (..., Nx+2, Ny+2) coincide con sus reflejos respecto de ambos ejes centrales."""
+    return np.allclose(theta, theta[..., ::-1, :]) and np.allclose(theta, theta[..., :, ::-1])
+
+
+def reducir_cuadrante(theta, Nx, Ny):
+    """
+    Cuadrante x >= Lx/2, y >= Ly/2 de un campo simétrico respecto de ambos
+    ejes centrales, con una fila y una columna fantasma (índice 0) delante
+    del eje de simetría. Con Nx impar el eje pasa por un nodo (índice 1 del
+    cuadrante) y con Nx par pasa entre dos nodos; ídem en y.
+    """
+    cuarto = theta[..., Nx // 2:, Ny // 2:].copy()
+    _reflejar(cuarto, _espejos(Nx, Ny))
+    return cuarto
+
+
+def reconstruir_cuadrante(cuarto, Nx, Ny):
+    """Campo completo (Nx+2, Ny+2) a partir del cuadrante de reducir_cuadrante."""
+    i0, j0 = Nx // 2, Ny // 2
+    theta = np.empty(cuarto.shape[:-2] + (Nx + 2, Ny + 2))
+    theta[..., i0:, j0:] = cuarto
+    theta[..., :i0, j0:] = theta[..., Nx + 2 - i0:, j0:][..., ::-1, :]
+    theta[..., :, :j0] = theta[..., :, Ny + 2 - j0:][..., :, ::-1]
+    return theta
+
+
+def _espejos(Nx, Ny):
+    """Índice del cuadrante que refleja la fila/columna fantasma: 2 si el eje pasa por un nodo, 1 si no."""
+    return (2 if Nx % 2 else 1, 2 if Ny % 2 else 1)
+
+
+def _reflejar(theta, espejos):
+    """Copia en la fila y la columna fantasma del cuadrante sus valores espejo."""
+    theta[..., 0, :] = theta[..., espejos[0], :]
+    theta[..., :, 0] = theta[..., :, espejos[1]]
+
+
+def _pesos_cuadrante(Nx, Ny):
+    """Multiplicidad de cada nodo del cuadrante en el campo completo (0 en las fantasmas)."""
+    pesos = []
+    for n, espejo in zip((Nx, Ny), _espejos(Nx, Ny)):
+        w = np.full(n + 2 - n // 2, 2.0)
+        w[0] = 0.0
+        if espejo == 2:
+            w[1] = 1.0  # nodos sobre el eje de simetría
+        pesos.append(w)
+    return np.outer(*pesos)
+
+
+def _plegar_espejo(inferior, diagonal, superior, espejo, eje):
+    """
+    Con simetría, la primera incógnita de cada línea se acopla con la fantasma,
+    que vale lo mismo que su espejo: ese coeficiente se suma al de la propia
+    incógnita (eje entre nodos) o al de la siguiente (eje sobre un nodo).
+    """
+    primera = (Ellipsis, 0, slice(None)) if eje == -2 else (Ellipsis, 0)
+    destino = superior if espejo == 2 else diagonal
+    destino[primera] += inferior[primera]
+
+
+def _operador_richards_2d(D_vals, theta, dx, dy, espejos=None):
+    """
+    L(theta) theta = div(D grad theta) con D promediada en las caras, nula en
+    el contorno Dirichlet. Con espejos la fila/columna fantasma copia su espejo.
+    """
+    D_x = 0.5 * (D_vals[..., :-1, :] + D_vals[..., 1:, :])
+    D_y = 0.5 * (D_vals[..., :, :-1] + D_vals[..., :, 1:])
+    flujo_x = D_x[..., :, 1:-1] * np.diff(theta[..., :, 1:-1], axis=-2)
+    flujo_y = D_y[..., 1:-1, :] * np.diff(theta[..., 1:-1, :], axis=-1)
+
+    L_theta = np.zeros(theta.shape)
+    L_theta[..., 1:-1, 1:-1] = np.diff(flujo_x, axis=-2) / dx ** 2 + np.diff(flujo_y, axis=-1) / dy ** 2
+    if espejos is not None:
+        _reflejar(L_theta, espejos)
+    return L_theta
+
+
+def _barrido_x(theta_k, theta_old, D_x, D_y, rx, ry, est=ESTADISTICAS_NULAS, espejo=None):
+    """
+    Paso implícito en X para todas las líneas j a la vez: arma las diagonales
+    de coeficiente variable de cada línea y las resuelve en un solo Thomas.
+    Con espejo (modo simetría) la fila 0 es la fantasma del eje de simetría.
+    """
+    with est.fase('ensamblado'):
+        term_y = ry * (D_y[..., 1:-1, 1:] * (theta_k[..., 1:-1, 2:] - theta_k[..., 1:-1, 1:-1]) -
+                       D_y[..., 1:-1, :-1] * (theta_k[..., 1:-1, 1:-1] - theta_k[..., 1:-1, :-2]))
+
+        D_w = D_x[..., :-1, 1:-1]  # i-1/2
+        D_e = D_x[..., 1:, 1:-1]   # i+1/2
+
+        inferior, main, superior = -rx * D_w, 1.0 + rx * (D_w + D_e), -rx * D_e
+        if espejo is not None:
+            _plegar_espejo(inferior, main, superior, espejo, eje=-2)
+        rhs = theta_old[..., 1:-1, 1:-1] + term_y
+
+    theta_half = theta_k.copy()
+    with est.fase('resolucion_lineal'):
+        theta_half[..., 1:-1, 1:-1] = resolver_tridiagonal_lotes(inferior, main, superior, rhs, eje=-2)
+    est.contar_resoluciones(rhs.size // rhs.shape[-2])
+    return theta_half
+
+
+def _barrido_y(theta_half, theta_old, D_x, D_y, rx, ry, est=ESTADISTICAS_NULAS, espejo=None):
+    """Paso implícito en Y para todas las líneas i a la vez."""
+    with est.fase('ensamblado'):
+        term_x = rx * (D_x[..., 1:, 1:-1] * (theta_half[..., 2:, 1:-1] - theta_half[..., 1:-1, 1:-1]) -
+                       D_x[..., :-1, 1:-1] * (theta_half[..., 1:-1, 1:-1] - theta_half[..., :-2, 1:-1]))
+
+        D_s = D_y[..., 1:-1, :-1]  # j-1/2
+        D_n = D_y[..., 1:-1, 1:]   # j+1/2
+
+        inferior, main, superior = -ry * D_s, 1.0 + ry * (D_s + D_n), -ry * D_n
+        if espejo is not None:
+            _plegar_espejo(inferior, main, superior, espejo, eje=-1)
+        rhs = theta_old[..., 1:-1, 1:-1] + term_x
+
+    theta_next = theta_half.copy()
+    with est.fase('resolucion_lineal'):
+        theta_next[..., 1:-1, 1:-1] = resolver_tridiagonal_lotes(inferior, main, superior, rhs, eje=-1)
+    est.contar_resoluciones(rhs.size // rhs.shape[-1])
+    return theta_next
+
+
+def _iteracion_adi(D_func, theta_k, theta_old, rx, ry, theta_borde, est=ESTADISTICAS_NULAS, espejos=None):
+    """Una iteración de Picard sobre ADI: D(theta_k) en las caras, barrido en X, barrido en Y y bordes."""
+    espejo_x, espejo_y = (None, None) if espejos is None else espejos
+    with est.fase('evaluacion_D'):
+        D_vals = D_func(theta_k)
+
+        # Promedios de D en las caras
+        D_x = 0.5 * (D_vals[..., :-1, :] + D_vals[..., 1:, :])
+        D_y = 0.5 * (D_vals[..., :, :-1] + D_vals[..., :, 1:])
+
+    theta_half = _barrido_x(theta_k, theta_old, D_x, D_y, rx, ry, est, espejo_x)
+    if espejos is not None:
+        _reflejar(theta_half, espejos)
+    theta_next = _barrido_y(theta_half, theta_old, D_x, D_y, rx, ry, est, espejo_y)
+
+    theta_next[..., [0, -1], :] = theta_borde
+    theta_next[..., :, [0, -1]] = theta_borde
+    if espejos is not None:
+        _reflejar(theta_next, espejos)
+    return theta_next
+
+
+def _paso_adi_picard(D_func, theta, dt, dx, dy, theta_borde, picard_maxiter=15, picard_tol=1e-4,
+                     est=ESTADISTICAS_NULAS, espejos=None, pesos=None, iteracion=None, previo=None):
+    """
+    Un paso de Euler implícito resuelto con iteraciones de Picard sobre ADI.
+    Con espejos/pesos (de _espejos y _pesos_cuadrante) theta es un cuadrante
+    de reducir_cuadrante y la norma de Picard es la del campo completo.
+    Con iteracion (IteracionNoLineal) el bucle de Picard lo maneja esa capa
+    (Anderson, predictor desde previo y parada escalada) en lugar de picard_tol.
+    Devuelve (theta, iteraciones, convergido).
+    """
+    rx, ry = dt / dx ** 2, dt / dy ** 2
+
+    def barrido(theta_k):
+        return _iteracion_adi(D_func, theta_k, theta, rx, ry, theta_borde, est, espejos)
+
+    if iteracion is not None:
+        return iteracion.resolver(barrido, theta, dt, picard_maxiter, est, pesos, previo)
+
+    theta_k = theta.copy()
+    n_iter = 0
+    convergido = False
+    for _ in range(picard_maxiter):
+        theta_prev = theta_k
+        n_iter += 1
+        theta_k = barrido(theta_k)
+        with est.fase('convergencia'):
+            if pesos is None:
+                norma = np.linalg.norm(theta_k - theta_prev)
+            else:
+                norma = np.sqrt(np.sum(pesos * (theta_k - theta_prev) ** 2))
+        if norma < picard_tol:
+            convergido = True
+            break
+    return theta_k, n_iter, convergido
+
+
+def _paso_adi_picard_conjunto(D_func, theta, dt, dx, dy, theta_borde, picard_maxiter=15, picard_tol=1e-4,
+                              est=ESTADISTICAS_NULAS):
+    """
+    Un paso de Euler implícito + ADI + Picard para un conjunto de campos
+    (eje 0 = miembro): D, las diagonales y los Thomas de todos los miembros
+    activos van en las mismas operaciones, y cada miembro sale del bucle al
+    converger (ver iteracion_no_lineal.picard_por_miembro).
+    Devuelve (theta, iteraciones, convergido), los dos últimos por miembro.
+    """
+    rx, ry = dt / dx ** 2, dt / dy ** 2
+
+    def barrido(theta_k, activos):
+        theta_old = theta if len(activos) == len(theta) else theta[activos]
+        return _iteracion_adi(D_func, theta_k, theta_old, rx, ry, theta_borde, est)
+
+    return picard_por_miembro(barrido, theta, picard_maxiter, picard_tol, est)
+
+
+def resolver_richards_2d_conjunto(D_func, Lx, Ly, T_final, Nx, Ny, N, thetas_iniciales, theta_borde=THETA_FONDO,
+                                  estadisticas=None, esquema='euler'):
+    """
+    Motor de Richards 2D (ADI + Picard, paso fijo) para un conjunto de K
+    condiciones iniciales sobre el mismo suelo y la misma malla, p. ej. gotas
+    de distintos radios o relaciones de aspecto.
+
+    Los K campos se avanzan juntos con un eje de lote delante: D se evalúa y
+    las diagonales se arman para todos a la vez y cada barrido resuelve en
+    un solo Thomas las líneas de todos los miembros. La convergencia de
+    Picard es por miembro y los que convergen dejan de iterarse en ese paso,
+    así que cada miembro da (al redondeo) el mismo resultado que su corrida
+    individual con resolver_richards_2d_adi, con una sola pasada de Python
+    por iteración para todo el conjunto.
+
+    Args:
+        D_func (callable): Difusividad D(theta), vectorizada.
+        Lx, Ly (float): Dimensiones del dominio.
+        T_final (float): Tiempo final.
+        Nx, Ny (int): Puntos interiores en cada dirección.
+        N (int): Número de pasos temporales.
+        thetas_iniciales (np.array): Campos iniciales (K, Nx+2, Ny+2), o
+            máscaras booleanas de las gotas (theta=0.90 dentro, 1e-4 fuera).
+        theta_borde (float): Valor Dirichlet en el contorno.
+        estadisticas (Estadisticas, opcional): Tiempos por fase, iteraciones
+            de Picard de cada paso (sumadas sobre los miembros) y líneas
+            tridiagonales resueltas.
+        esquema (str): Esquema temporal (ver esquemas_temporales).
+
+    Returns:
+        tuple: (X, Y, thetas, iteraciones) con la malla, los campos
+            (K, Nx+2, Ny+2) a T_final y las iteraciones de Picard de cada miembro.
+    """
+    est = estadisticas_o_nulas(estadisticas)
+    est.iniciar()
+
+    dx, dy = Lx / (Nx + 1), Ly / (Ny + 1)
+    dt = T_final / N
+    x, y = np.linspace(0, Lx, Nx + 2), np.linspace(0, Ly, Ny + 2)
+    X, Y = np.meshgrid(x, y, indexing='ij')
+
+    thetas_iniciales = np.asarray(thetas_iniciales)
+    if thetas_iniciales.ndim != 3 or thetas_iniciales.shape[1:] != X.shape:
+        raise ValueError(f"thetas_iniciales debe tener forma (K,) + {X.shape}, no {thetas_iniciales.shape}")
+    if thetas_iniciales.dtype == bool:
+        theta = condicion_inicial_gota(thetas_iniciales)
+    else:
+        theta = thetas_iniciales.astype(np.float64)
+    K = theta.shape[0]
+
+    integrador = IntegradorTemporal(esquema)
+
+    def paso(theta_n, dt_n, previo=None):
+        resultado = _paso_adi_picard_conjunto(D_func, theta_n, dt_n, dx, dy, theta_borde, est=est)
+        est.registrar_paso(resultado[1].sum())
+        return resultado
+
+    def aplicar_operador(theta_n):
+        with est.fase('evaluacion_D'):
+            D_vals = D_func(theta_n)
+        return _operador_richards_2d(D_vals, theta_n, dx, dy)
+
+    iteraciones = np.zeros(K, dtype=int)
+    sin_converger = np.zeros(K, dtype=int)
+    previo = None
+    for _ in range(N):
+        theta_n = theta
+        theta, iteraciones_paso, convergido = integrador.paso(paso, aplicar_operador, theta_n, dt, previo)
+        previo = (theta_n, dt)
+        iteraciones += iteraciones_paso
+        sin_converger += ~convergido
+
+    print(f"Richards 2D: Conjunto de {K} miembros - {iteraciones.sum()} iteraciones de Picard "
+          f"(por miembro entre {iteraciones.min()} y {iteraciones.max()})")
+    if sin_converger.any():
+        print(f"Richards 2D: {np.count_nonzero(sin_converger)} miembros con pasos sin converger")
+
+    est.finalizar()
+    return X, Y, theta, iteraciones
+
+
+def resolver_richards_2d_adi(D_func, Lx, Ly, T_final, Nx, Ny, N, theta_inicial, theta_borde=THETA_FONDO,
+                             adaptativo=False, tol_tiempo=1e-3, estadisticas=None, snapshots=None,
+                             checkpoint=None, cada_checkpoint=None, reanudar=None, metodo='adi',
+                             simetria=False, region_activa=False, tol_region=TOL_REGION, iteracion=None,
+                             esquema='euler'):
+    """
+    Motor común de Richards 2D (Euler implícito + ADI + Picard) usado por las
+    gotas circular (actividad D) y elíptica (actividad E).
+
+    Con metodo='implicito' cada iteración de Picard resuelve el operador de
+    5 puntos completo (matriz dispersa de patrón fijo, ver
+    richards_2d_disperso) en lugar de los dos barridos ADI, con un criterio
+    de parada escalado más estricto; sirve para comparar costo por precisión.
+    Con metodo='krylov' el mismo sistema se resuelve sin matriz por gradiente
+    conjugado precondicionado con multigrilla (ver richards_2d_krylov): sin
+    factorización, con memoria lineal en Nx*Ny, para mallas grandes.
+
+    Con simetria=True (solo ADI) se resuelve únicamente el cuadrante
+    x >= Lx/2, y >= Ly/2 con flujo nulo a través de los ejes centrales y el
+    campo completo se reconstruye por reflexión al devolverlo: un cuarto del
+    trabajo y de la memoria, con el mismo resultado (al redondeo) que el
+    dominio completo. theta_inicial debe ser simétrica respecto de ambos
+    ejes (ver es_simetrica; las máscaras, construidas con
+    distancias_al_centro): si no lo es se lanza ValueError.
+
+    Con region_activa=True cada paso se resuelve solo en la caja que envuelve
+    la zona mojada (D dt/dx^2 > tol_region) más un margen, que crece cuando
+    el frente lo alcanza (ver region_activa.paso_en_region_activa); el
+    resultado coincide con el de todo el dominio a menos de ~tol_region.
+
+    Con esquema='cn', 'bdf2' o 'trbdf2' el tiempo se integra con orden 2 (ver
+    esquemas_temporales): cada etapa es un paso de Euler implícito desde un
+    lado derecho combinado, resuelto con el método, la simetría, la región
+    activa y la iteracion elegidos. Como el error de Picard se suma al
+    temporal, para aprovechar el orden 2 conviene una parada más estricta que
+    la del ADI por defecto (p. ej. iteracion=IteracionNoLineal()).
+
+    Args:
+        D_func (callable): Difusividad D(theta), vectorizada.
+        Lx, Ly (float): Dimensiones del dominio.
+        T_final (float): Tiempo final.
+        Nx, Ny (int): Puntos interiores en cada dirección.
+        N (int): Número de pasos temporales.
+        theta_inicial (np.array): Campo inicial de forma (Nx+2, Ny+2), o máscara
+            booleana de la gota (theta=0.90 dentro, 1e-4 fuera).
+        theta_borde (float): Valor Dirichlet en el contorno.
+        adaptativo (bool): Si es True, el paso arranca en T_final/N y se ajusta
+            con el error local estimado (tolerancia tol_tiempo) y la velocidad
+            de convergencia de Picard.
+        tol_tiempo (float): Tolerancia temporal del modo adaptativo.
+        estadisticas (Estadisticas, opcional): Registro de tiempos por fase,
+            iteraciones de Picard por paso y líneas tridiagonales resueltas.
+        snapshots (EscritorSnapshots, opcional): Recibe el campo inicial y el
+            de cada paso (aceptado) para guardar la historia temporal en disco.
+        checkpoint (str, opcional): Archivo .npz donde guardar el estado (campo,
+            t, dt, estado del controlador adaptativo y configuración) cada
+            cada_checkpoint pasos aceptados y al terminar.
+        cada_checkpoint (int, opcional): Frecuencia de los checkpoints; por
+            defecto solo se guarda al final.
+        reanudar (str, opcional): Checkpoint desde el que continuar en lugar de
+            empezar en t=0 (se ignora theta_inicial). La continuación es
+            idéntica bit a bit a la corrida sin interrumpir. T_final puede ser
+            mayor que el de la corrida original para extenderla; con paso fijo
+            se conserva el dt guardado (N no se usa) y con paso adaptativo el
+            error se sigue controlando respecto del nuevo T_final.
+        metodo (str): 'adi', 'implicito' o 'krylov'.
+        simetria (bool): Resolver solo un cuadrante (ver arriba). Los
+            checkpoints guardan el cuadrante; los snapshots, el campo completo.
+        region_activa (bool): Resolver solo la región mojada (ver arriba).
+        tol_region (float): Tolerancia de la región activa.
+        iteracion (IteracionNoLineal, opcional): Capa no lineal con Anderson,
+            predictor y parada escalada (ver iteracion_no_lineal) en lugar del
+            Picard simple con tolerancia fija de cada método.
+        esquema (str): 'euler', 'cn', 'bdf2' o 'trbdf2'. Con los de orden 2
+            (o con iteracion, por su predictor) los checkpoints de paso fijo
+            guardan también el estado del paso anterior.
+
+    Returns:
+        tuple: (X, Y, theta) con la malla y la saturación a T_final.
+    """
+    if metodo not in METODOS_2D:
+        raise ValueError(f"metodo debe ser uno de {METODOS_2D}, no {metodo!r}")
+    if simetria and metodo != 'adi':
+        raise ValueError("simetria=True solo está disponible con metodo='adi'")
+    est = estadisticas_o_nulas(estadisticas)
+    est.iniciar()
+
+    dx, dy = Lx / (Nx + 1), Ly / (Ny + 1)
+    dt = T_final / N
+    x, y = np.linspace(0, Lx, Nx + 2), np.linspace(0, Ly, Ny + 2)
+    X, Y = np.meshgrid(x, y, indexing='ij')
+
+    configuracion = {'Lx': Lx, 'Ly': Ly, 'Nx': Nx, 'Ny': Ny, 'theta_borde': theta_borde,
+                     'adaptativo': adaptativo, 'tol_tiempo': tol_tiempo if adaptativo else None,
+                     'D_func': getattr(D_func, '__qualname__', type(D_func).__name__), 'metodo': metodo,
+                     'simetria': simetria, 'esquema': esquema}
+
+    # Modo simetría: el estado es el cuadrante; los snapshots y la salida, el campo completo
+    espejos, pesos = (_espejos(Nx, Ny), _pesos_cuadrante(Nx, Ny)) if simetria else (None, None)
+    completo = (lambda th: reconstruir_cuadrante(th, Nx, Ny)) if simetria else (lambda th: th)
+
+    # Estado del bucle: pasos aceptados, tiempo y (adaptativo) controlador de paso
+    n0, t0 = 0, 0.0
+    estado_adaptativo = {}
+    integrador = IntegradorTemporal(esquema)
+    # Paso aceptado anterior (estado, dt) del paso fijo; el adaptativo lo lleva su controlador
+    previo = None
+    if reanudar is not None:
+        guardado = cargar_checkpoint(reanudar, configuracion)
+        theta, n0, t0, dt = guardado['theta'], guardado['n'], guardado['t'], guardado['dt']
+        if guardado.get('theta_esquema') is not None:
+            previo = (guardado['theta_esquema'], guardado['dt_esquema'])
+        if adaptativo:
+            estado_adaptativo = {'t': t0, 'dt': dt, 'dt_prev': guardado['dt_prev'],
+                                 'theta_anterior': guardado['theta_anterior'], 'aceptados': n0}
+        print(f"Richards 2D: Reanudando desde {reanudar} (t={t0:.6g}, {n0} pasos) hasta T_final={T_final:.6g}")
+    else:
+        theta_inicial = np.asarray(theta_inicial)
+        if theta_inicial.shape != X.shape:
+            raise ValueError(f"theta_inicial debe tener forma {X.shape}, no {theta_inicial.shape}")
+        if theta_inicial.dtype == bool:
+            theta = condicion_inicial_gota(theta_inicial)
+        else:
+            theta = theta_inicial.astype(np.float64)
+        if simetria:
+            if not es_simetrica(theta):
+                raise ValueError("simetria=True requiere theta_inicial simétrica respecto de ambos ejes centrales")
+            theta = reducir_cuadrante(theta, Nx, Ny)
+
+        if snapshots is not None:
+            snapshots.registrar(0, 0.0, completo(theta))
+
+    # El paso anterior solo hace falta al reanudar con un esquema de orden 2 o con el predictor
+    guardar_previo = esquema != 'euler' or iteracion is not None
+
+    def guardar(n, t, theta_n, dt_siguiente, previo=None):
+        if checkpoint is not None:
+            theta_esquema, dt_esquema = previo if previo is not None and guardar_previo else (None, None)
+            guardar_checkpoint(checkpoint, configuracion, theta=theta_n, n=n, t=t, dt=dt_siguiente,
+                               dt_prev=estado_adaptativo.get('dt_prev'),
+                               theta_anterior=estado_adaptativo.get('theta_anterior'),
+                               theta_esquema=theta_esquema, dt_esquema=dt_esquema)
+
+    # Operadores dispersos por tamaño de (sub)dominio: con región activa la caja cambia
+    operadores = {}
+
+    def paso_dominio(theta_n, dt_n, previo=None):
+        nx, ny = theta_n.shape[-2] - 2, theta_n.shape[-1] - 2
+        if metodo == 'adi':
+            resultado = _paso_adi_picard(D_func, theta_n, dt_n, dx, dy, theta_borde, est=est, espejos=espejos,
+                                         pesos=None if pesos is None else pesos[:nx + 2, :ny + 2],
+                                         iteracion=iteracion, previo=previo)
+        else:
+            if (nx, ny) not in operadores:
+                operadores[(nx, ny)] = (OperadorImplicito2D(nx, ny) if metodo == 'implicito'
+                                        else OperadorKrylov2D(nx, ny, est=est))
+            resultado = _paso_implicito_picard(operadores[(nx, ny)], D_func, theta_n, dt_n, dx, dy, theta_borde,
+                                               est=est, iteracion=iteracion, previo=previo)
+        est.registrar_paso(resultado[1])
+        return resultado
+
+    estado_region = {}
+
+    def paso(theta_n, dt_n, previo=None):
+        if not region_activa:
+            return paso_dominio(theta_n, dt_n, previo)
+        resultado = paso_en_region_activa(paso_dominio, theta_n, dt_n, D_func, dt_n / min(dx, dy) ** 2,
+                                          estado_region, tol_region, desde_cero=simetria, previo=previo)
+        if simetria:
+            _reflejar(resultado[0], espejos)
+        return resultado
+
+    def aplicar_operador(theta_n):
+        with est.fase('evaluacion_D'):
+            D_vals = D_func(theta_n)
+        return _operador_richards_2d(D_vals, theta_n, dx, dy, espejos)
+
+    def paso_temporal(theta_n, dt_n, previo):
+        return integrador.paso(paso, aplicar_operador, theta_n, dt_n, previo)
+
+    if adaptativo:
+        def al_aceptar(n, t, theta_n):
+            if snapshots is not None:
+                snapshots.registrar(n, t, completo(theta_n))
+            if cada_checkpoint and n % cada_checkpoint == 0:
+                # El paso anterior va en el estado del controlador (theta_anterior, dt_prev)
+                guardar(n, t, theta_n, estado_adaptativo['dt'])
+
+        theta, info = integrar_adaptativo(paso_temporal, theta, T_final, dt, tol_tiempo, al_aceptar=al_aceptar,
+                                          estado=estado_adaptativo)
+        print(f"Richards 2D: Paso adaptativo - {info['aceptados']} pasos aceptados, "
+              f"{info['rechazados']} rechazados, {info['iteraciones']} iteraciones de Picard")
+        n_final, t_final = estado_adaptativo.get('aceptados', n0), estado_adaptativo.get('t', t0)
+        dt = estado_adaptativo.get('dt', dt)
+    else:
+        # Pasos de tamaño dt hasta T_final; si T_final no es múltiplo de dt el
+        # último se acorta y el desfase se arrastra a los tiempos siguientes
+        desfase = t0 - n0 * dt
+        n, t = n0, t0
+        while T_final - t > 1e-9 * dt:
+            dt_n = dt if T_final - t > dt * (1 - 1e-9) else T_final - t
+            theta_n = theta
+            theta, _, _ = paso_temporal(theta_n, dt_n, previo)
+            previo = (theta_n, dt_n)
+            n += 1
+            desfase += dt_n - dt
+            t = n * dt + desfase
+            if snapshots is not None:
+                snapshots.registrar(n, t, completo(theta))
+            if cada_checkpoint and n % cada_checkpoint == 0:
+                guardar(n, t, theta, dt, previo)
+        n_final, t_final = n, t
+
+    guardar(n_final, t_final, theta, dt, previo)
+    if region_activa and estado_region.get('caja') is not None:
+        forma = tuple(c.stop - c.start for c in estado_region['caja'])
+        print(f"Richards 2D: Región activa final {forma[0]}x{forma[1]} de {theta.shape[0]}x{theta.shape[1]} "
+              f"nodos (margen {estado_region['margen']})")
+
+    if snapshots is not None:
+        snapshots.volcar()
+    est.finalizar()
+    return X, Y, completo(theta)
@@ -0,0 +1,146 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+from instrumentacion import ESTADISTICAS_NULAS
+
+# A es simétrica y diagonalmente dominante: LU sin pivoteo en modo simétrico
+_OPCIONES_SPLU = {'diag_pivot_thresh': 0.0, 'options': {'SymmetricMode': True}}
+
+# Iteración de Picard del esquema totalmente implícito
+PICARD_MAXITER_IMPLICITO = 50
+PICARD_TOL_IMPLICITO = 1e-8
+
+
+class OperadorImplicito2D:
+    """
+    Operador de 5 puntos de Euler implícito para Richards 2D sobre los
+    Nx x Ny nodos interiores, como matriz dispersa CSC de patrón fijo
+    (CSC y no CSR porque es el formato que splu factoriza sin convertir):
+
+        A = I + rx (D_w + D_e) - rx D_w E_w - rx D_e E_e + (análogo en y)
+
+    El patrón, el reordenamiento de mínimo grado (sobre A^T + A, calculado
+    una vez por SuperLU sobre el laplaciano) y la posición de cada
+    coeficiente dentro de A.data se calculan una sola vez; en cada iteración
+    solo se sobrescriben los valores y se factoriza con splu sin volver a
+    ordenar (permc_spec='NATURAL'). Solo se reutiliza el orden de columnas:
+    splu no expone su análisis simbólico, así que cada factorización vuelve
+    a calcular la estructura del relleno (igual en todos los pasos, porque
+    el patrón y el orden no cambian).
+
+    Args:
+        Nx, Ny (int): Puntos interiores en cada dirección.
+    """
+
+    def __init__(self, Nx, Ny):
+        self.Nx, self.Ny = Nx, Ny
+        n = Nx * Ny
+        k = np.arange(n).reshape(Nx, Ny)  # incógnita k = i * Ny + j
+
+        # Entradas del estencil en un orden fijo: diagonal, oeste, este, sur, norte
+        filas = [k.ravel(), k[1:, :].ravel(), k[:-1, :].ravel(), k[:, 1:].ravel(), k[:, :-1].ravel()]
+        columnas = [k.ravel(), k[:-1, :].ravel(), k[1:, :].ravel(), k[:, :-1].ravel(), k[:, 1:].ravel()]
+        filas, columnas = np.concatenate(filas), np.concatenate(columnas)
+        nnz = len(filas)
+
+        # Ordenamiento de mínimo grado del patrón (valores del laplaciano discreto)
+        valores = np.where(filas == columnas, 5.0, -1.0)
+        laplaciano = sp.csc_matrix((valores, (filas, columnas)), shape=(n, n))
+        orden_superlu = splu(laplaciano, permc_spec='MMD_AT_PLUS_A', **_OPCIONES_SPLU).perm_c
+        self.permutacion = np.argsort(orden_superlu)
+        self.inversa = np.empty(n, dtype=np.intp)
+        self.inversa[self.permutacion] = np.arange(n)
+
+        # Matriz permutada P A P^T con el número de entrada (1..nnz) como dato,
+        # para saber qué coeficiente ocupa cada posición de A.data
+        ids = sp.csc_matrix((np.arange(1, nnz + 1, dtype=np.float64),
+                             (self.inversa[filas], self.inversa[columnas])), shape=(n, n))
+        ids.sort_indices()
+        self._orden = ids.data.astype(np.intp) - 1
+        self.A = ids.copy()
+        self._valores = np.empty(nnz)
+        n_x, n_y = (Nx - 1) * Ny, Nx * (Ny - 1)
+        self._cortes = np.cumsum([0, n, n_x, n_x, n_y, n_y])
+
+    def actualizar(self, D_w, D_e, D_s, D_n, rx, ry):
+        """Escribe en A los coeficientes de las difusividades en las caras (arreglos (Nx, Ny))."""
+        v, cortes = self._valores, self._cortes
+        v[cortes[0]:cortes[1]] = (1.0 + rx * (D_w + D_e) + ry * (D_s + D_n)).ravel()
+        v[cortes[1]:cortes[2]] = (-rx * D_w[1:, :]).ravel()
+        v[cortes[2]:cortes[3]] = (-rx * D_e[:-1, :]).ravel()
+        v[cortes[3]:cortes[4]] = (-ry * D_s[:, 1:]).ravel()
+        v[cortes[4]:cortes[5]] = (-ry * D_n[:, :-1]).ravel()
+        self.A.data[:] = v[self._orden]
+
+    def factorizar(self):
+        """LU de A en el orden precalculado (sin reordenar columnas ni pivotear; el simbólico se rehace)."""
+        return splu(self.A, permc_spec='NATURAL', **_OPCIONES_SPLU)
+
+    def resolver(self, factor, rhs, inicial=None):
+        """
+        Resuelve A x = rhs (rhs de forma (Nx, Ny)) con una factorización de
+        factorizar(). inicial se ignora (solo lo usan los solvers iterativos).
+        """
+        x = factor.solve(rhs.ravel()[self.permutacion])
+        return x[self.inversa].reshape(self.Nx, self.Ny)
+
+
+def _paso_implicito_picard(operador, D_func, theta, dt, dx, dy, theta_borde,
+                           picard_maxiter=PICARD_MAXITER_IMPLICITO, picard_tol=PICARD_TOL_IMPLICITO,
+                           est=ESTADISTICAS_NULAS, iteracion=None, previo=None):
+    """
+    Un paso de Euler implícito sin partición de direcciones: cada iteración
+    de Picard resuelve el sistema completo de 5 puntos con D(theta_k) fijo.
+    Se detiene cuando max|theta_k+1 - theta_k| / (1 + |theta_k+1|) < picard_tol,
+    o con el criterio de iteracion (IteracionNoLineal) si se pasa, con
+    previo = (estado, dt) del paso aceptado anterior para su predictor.
+    Devuelve (theta, iteraciones, convergido).
+    """
+    rx, ry = dt / dx ** 2, dt / dy ** 2
+
+    def barrido(theta_k):
+        with est.fase('evaluacion_D'):
+            D_vals = D_func(theta_k)
+            D_x = 0.5 * (D_vals[:-1, :] + D_vals[1:, :])
+            D_y = 0.5 * (D_vals[:, :-1] + D_vals[:, 1:])
+            D_w, D_e = D_x[:-1, 1:-1], D_x[1:, 1:-1]
+            D_s, D_n = D_y[1:-1, :-1], D_y[1:-1, 1:]
+
+        with est.fase('ensamblado'):
+            operador.actualizar(D_w, D_e, D_s, D_n, rx, ry)
+            # Lado derecho con los valores Dirichlet del contorno
+            rhs = theta[1:-1, 1:-1].copy()
+            rhs[0, :] += rx * D_w[0, :] * theta_k[0, 1:-1]
+            rhs[-1, :] += rx * D_e[-1, :] * theta_k[-1, 1:-1]
+            rhs[:, 0] += ry * D_s[:, 0] * theta_k[1:-1, 0]
+            rhs[:, -1] += ry * D_n[:, -1] * theta_k[1:-1, -1]
+
+        with est.fase('factorizacion'):
+            factor = operador.factorizar()
+        with est.fase('resolucion_lineal'):
+            interior = operador.resolver(factor, rhs, theta_k[1:-1, 1:-1])
+        est.contar_resoluciones()
+
+        theta_next = theta_k.copy()
+        theta_next[1:-1, 1:-1] = interior
+        theta_next[[0, -1], :] = theta_borde
+        theta_next[:, [0, -1]] = theta_borde
+        return theta_next
+
+    if iteracion is not None:
+        return iteracion.resolver(barrido, theta, dt, picard_maxiter, est, previo=previo)
+
+    theta_k = theta.copy()
+    n_iter = 0
+    convergido = False
+    for _ in range(picard_maxiter):
+        n_iter += 1
+        theta_next = barrido(theta_k)
+        with est.fase('convergencia'):
+            interior = theta_next[1:-1, 1:-1]
+            cambio = np.max(np.abs(interior - theta_k[1:-1, 1:-1]) / (1.0 + np.abs(interior)))
+        theta_k = theta_next
+        if cambio < picard_tol:
+            convergido = True
+            break
+    return theta_k, n_iter, convergido
@@ -0,0 +1,164 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+from instrumentacion import ESTADISTICAS_NULAS
+
+# Gradiente conjugado: ||r||_2 <= TOL_CG acota el error en norma infinito
+# por TOL_CG, porque el operador es I + (difusión) con autovalores >= 1
+TOL_CG = 1e-10
+MAXITER_CG = 200
+
+# Multigrilla: Jacobi amortiguado antes y después de cada corrección gruesa
+OMEGA_JACOBI = 0.8
+SUAVIZADOS = 2
+# Nivel más grueso (se resuelve por LU, que a este tamaño es despreciable)
+NODOS_GRUESOS = 400
+
+
+def _interpolacion_1d(n):
+    """
+    Interpolación lineal (n, n // 2) de la grilla gruesa (nodos finos impares
+    1, 3, ...) a la fina, con ceros de Dirichlet en el contorno. Con n par el
+    último nodo grueso queda a un paso fino del contorno; la matriz gruesa de
+    Galerkin lo tiene en cuenta sin casos especiales.
+    """
+    m = n // 2
+    k = np.arange(m)
+    filas = np.concatenate([2 * k + 1, 2 * k, 2 * k[:-1] + 2])
+    columnas = np.concatenate([k, k, k[:-1]])
+    valores = np.concatenate([np.ones(m), np.full(m, 0.5), np.full(m - 1, 0.5)])
+    if n % 2:  # el último nodo fino (par) también toma la mitad del último grueso
+        filas, columnas, valores = np.append(filas, n - 1), np.append(columnas, m - 1), np.append(valores, 0.5)
+    return sp.csr_matrix((valores, (filas, columnas)), shape=(n, m))
+
+
+class OperadorKrylov2D:
+    """
+    Operador de 5 puntos de Euler implícito para Richards 2D aplicado sin
+    matriz a partir de los coeficientes de cara,
+
+        (A u)_ij = u_ij + rx D_e (u_ij - u_i+1,j) + rx D_w (u_ij - u_i-1,j) + (análogo en y),
+
+    resuelto por gradiente conjugado precondicionado con un ciclo V de
+    multigrilla geométrica (interpolación bilineal, niveles gruesos de
+    Galerkin P^T A P y Jacobi amortiguado como suavizador). No hay
+    factorización del nivel fino: la memoria crece linealmente con Nx*Ny y
+    las iteraciones de CG casi no dependen de la malla.
+
+    Misma interfaz que OperadorImplicito2D: actualizar, factorizar (aquí arma
+    la jerarquía de multigrilla) y resolver; CG arranca desde la iteración
+    de Picard previa.
+
+    Args:
+        Nx, Ny (int): Puntos interiores en cada dirección.
+        tol (float): Tolerancia de CG sobre ||r||_2.
+        maxiter (int): Iteraciones máximas de CG por sistema.
+        est (Estadisticas, opcional): Registra las iteraciones de CG.
+    """
+
+    def __init__(self, Nx, Ny, tol=TOL_CG, maxiter=MAXITER_CG, est=ESTADISTICAS_NULAS):
+        self.Nx, self.Ny = Nx, Ny
+        self.tol, self.maxiter, self.est = tol, maxiter, est
+        self.iteraciones = []
+
+        # Interpolaciones entre niveles (dependen solo de la malla)
+        self._interpolaciones = []
+        nx, ny = Nx, Ny
+        while nx * ny > NODOS_GRUESOS and min(nx, ny) >= 3:
+            self._interpolaciones.append(sp.kron(_interpolacion_1d(nx), _interpolacion_1d(ny), format='csr'))
+            nx, ny = nx // 2, ny // 2
+
+    def actualizar(self, D_w, D_e, D_s, D_n, rx, ry):
+        """Guarda los coeficientes de cara (arreglos (Nx, Ny)) y la diagonal del operador."""
+        self.cx = rx * np.concatenate([D_w[:1, :], D_e], axis=0)     # (Nx+1, Ny)
+        self.cy = ry * np.concatenate([D_s[:, :1], D_n], axis=1)     # (Nx, Ny+1)
+        self.diagonal = 1.0 + self.cx[:-1, :] + self.cx[1:, :] + self.cy[:, :-1] + self.cy[:, 1:]
+        self._inv_diagonal = 1.0 / self.diagonal
+
+    def aplicar(self, u):
+        """A u sin armar la matriz (u de forma (Nx, Ny))."""
+        Au = self.diagonal * u
+        acople_x = self.cx[1:-1, :]
+        acople_y = self.cy[:, 1:-1]
+        Au[1:, :] -= acople_x * u[:-1, :]
+        Au[:-1, :] -= acople_x * u[1:, :]
+        Au[:, 1:] -= acople_y * u[:, :-1]
+        Au[:, :-1] -= acople_y * u[:, 1:]
+        return Au
+
+    def _matriz(self):
+        """A del nivel fino como matriz dispersa, solo para armar el primer nivel grueso."""
+        Ny = self.Ny
+        acople_x = -self.cx[1:-1, :].ravel()
+        acople_y = np.zeros((self.Nx, Ny))
+        acople_y[:, :-1] = -self.cy[:, 1:-1]
+        acople_y = acople_y.ravel()[:-1]
+        return sp.diags([acople_x, acople_y, self.diagonal.ravel(), acople_y, acople_x],
+                        [-Ny, -1, 0, 1, Ny], format='csr')
+
+    def factorizar(self):
+        """
+        Arma la jerarquía de Galerkin para los coeficientes actuales.
+
+        Returns:
+            list: Por nivel grueso, (matriz, inversa de la diagonal); el último
+                elemento es la LU del nivel más grueso (o None sin niveles gruesos).
+        """
+        niveles = []
+        A = self._matriz() if self._interpolaciones else None
+        for P in self._interpolaciones:
+            A = (P.T @ A @ P).tocsr()
+            niveles.append((A, 1.0 / A.diagonal()))
+        if niveles:
+            niveles[-1] = splu(A.tocsc())
+        return niveles
+
+    def _suavizar(self, aplicar, inv_diag, u, b):
+        """SUAVIZADOS pasos de Jacobi amortiguado sobre A u = b (u=None arranca de cero)."""
+        pasos = SUAVIZADOS
+        if u is None:
+            u, pasos = OMEGA_JACOBI * inv_diag * b, pasos - 1
+        for _ in range(pasos):
+            u = u + OMEGA_JACOBI * inv_diag * (b - aplicar(u))
+        return u
+
+    def _ciclo_v(self, niveles, b, nivel=0):
+        """
+        Ciclo V simétrico aplicado a b (el precondicionador de CG). El nivel 0
+        es el fino, sin matriz; el último elemento de niveles es la LU del
+        más grueso.
+        """
+        if nivel == len(self._interpolaciones):
+            return niveles[-1].solve(b) if niveles else self._suavizar(self.aplicar, self._inv_diagonal, None, b)
+        if nivel == 0:
+            aplicar, inv_diag = self.aplicar, self._inv_diagonal
+        else:
+            A, inv_diag = niveles[nivel - 1]
+            aplicar = A.dot
+
+        P = self._interpolaciones[nivel]
+        u = self._suavizar(aplicar, inv_diag, None, b)
+        residuo_grueso = P.T @ (b - aplicar(u)).ravel()
+        u = u + (P @ self._ciclo_v(niveles, residuo_grueso, nivel + 1)).reshape(b.shape)
+        return self._suavizar(aplicar, inv_diag, u, b)
+
+    def resolver(self, niveles, rhs, inicial=None):
+        """Resuelve A x = rhs (forma (Nx, Ny)) por CG precondicionado, desde inicial (o rhs)."""
+        x = (rhs if inicial is None else inicial).copy()
+        r = rhs - self.aplicar(x)
+        z = self._ciclo_v(niveles, r)
+        p = z.copy()
+        rz = np.vdot(r, z)
+        n_iter = 0
+        while np.linalg.norm(r) > self.tol and n_iter < self.maxiter:
+            n_iter += 1
+            Ap = self.aplicar(p)
+            alfa = rz / np.vdot(p, Ap)
+            x += alfa * p
+            r -= alfa * Ap
+            z = self._ciclo_v(niveles, r)
+            rz, rz_anterior = np.vdot(r, z), rz
+            p = z + (rz / rz_anterior) * p
+        self.iteraciones.append(n_iter)
+        self.est.contar_iteraciones_lineales(n_iter)
+        return x
@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+
+
+def _ruta_tiempos(ruta):
+    """Archivo auxiliar con los tiempos de los cuadros escritos (define cuántos son válidos)."""
+    base = ruta[:-4] if ruta.endswith('.npy') else ruta
+    return base + '_tiempos.npy'
+
+
+class EscritorSnapshots:
+    """
+    Guarda la historia temporal de un solver en una pila .npy en disco
+    (np.lib.format.open_memmap) de forma (n_max, *forma_del_campo), sin
+    retenerla en memoria: los cuadros se juntan en un bloque de `bloque`
+    cuadros y se copian al memmap de a un bloque por vez.
+
+    Los bucles temporales llaman a registrar(paso, t, theta) después de cada
+    paso (y con paso=0 para la condición inicial); el escritor decide si el
+    cuadro se guarda según `cada` o `tiempos`. El archivo se crea con el
+    primer cuadro, tomando su forma y dtype.
+
+    Args:
+        ruta (str): Archivo .npy de destino (los tiempos van a <ruta>_tiempos.npy).
+        n_max (int, opcional): Cuadros a reservar. Por defecto se deduce de
+            tiempos (len + 1 por el inicial) o de cada y n_pasos.
+        cada (int, opcional): Guardar un cuadro cada `cada` pasos.
+        tiempos (array, opcional): Guardar el primer cuadro con t >= cada
+            tiempo pedido (con paso adaptativo el cuadro cae al final del paso
+            que cruza ese tiempo).
+        n_pasos (int, opcional): Pasos previstos, para dimensionar con `cada`.
+        bloque (int): Cuadros acumulados en memoria antes de escribir.
+        incluir_inicial (bool): Guardar el cuadro de paso=0.
+    """
+
+    def __init__(self, ruta, n_max=None, cada=None, tiempos=None, n_pasos=None, bloque=32,
+                 incluir_inicial=True):
+        if (cada is None) == (tiempos is None):
+            raise ValueError("hay que indicar exactamente uno de cada o tiempos")
+        self.tiempos_pedidos = None if tiempos is None else np.sort(np.asarray(tiempos, dtype=np.float64))
+        if n_max is None:
+            if self.tiempos_pedidos is not None:
+                n_max = len(self.tiempos_pedidos) + int(incluir_inicial)
+            elif n_pasos is not None:
+                n_max = n_pasos // cada + int(incluir_inicial)
+            else:
+                raise ValueError("con cada=k hay que indicar n_pasos o n_max")
+
+        self.ruta = ruta
+        self.n_max = int(n_max)
+        self.cada = cada
+        self.bloque = int(bloque)
+        self.incluir_inicial = incluir_inicial
+        self.n_escritos = 0
+        self._siguiente_tiempo = 0
+        self._pila = None
+        self._buffer = None
+        self._n_buffer = 0
+        self._tiempos = []
+
+    def _corresponde(self, paso, t):
+        if paso == 0:
+            return self.incluir_inicial
+        if self.cada is not None:
+            return paso % self.cada == 0
+        # Tiempos pedidos: uno por cada t_i alcanzado (tolerancia relativa al redondeo de t)
+        alcanzados = 0
+        while (self._siguiente_tiempo < len(self.tiempos_pedidos) and
+               t >= self.tiempos_pedidos[self._siguiente_tiempo] * (1 - 1e-12)):
+            self._siguiente_tiempo += 1
+            alcanzados += 1
+        return alcanzados > 0
+
+    def registrar(self, paso, t, theta):
+        """Ofrece el estado tras el paso `paso` (tiempo t); devuelve True si se guardó."""
+        if not self._corresponde(paso, t):
+            return False
+        if self.n_escritos + self._n_buffer >= self.n_max:
+            raise ValueError(f"se superó la capacidad reservada de {self.n_max} cuadros en {self.ruta}")
+
+        if self._pila is None:
+            theta = np.asarray(theta)
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            self._pila = np.lib.format.open_memmap(self.ruta, mode='w+', dtype=theta.dtype,
+                                                   shape=(self.n_max,) + theta.shape)
+            self._buffer = np.empty((min(self.bloque, self.n_max),) + theta.shape, dtype=theta.dtype)
+
+        self._buffer[self._n_buffer] = theta
+        self._tiempos.append(float(t))
+        self._n_buffer += 1
+        if self._n_buffer == len(self._buffer):
+            self.volcar()
+        return True
+
+    def volcar(self):
+        """Escribe el bloque pendiente en el memmap y actualiza el archivo de tiempos."""
+        if self._n_buffer == 0:
+            return
+        self._pila[self.n_escritos:self.n_escritos + self._n_buffer] = self._buffer[:self._n_buffer]
+        self._pila.flush()
+        self.n_escritos += self._n_buffer
+        self._n_buffer = 0
+        np.save(_ruta_tiempos(self.ruta), np.array(self._tiempos))
+
+    def cerrar(self):
+        self.volcar()
+        if self._pila is not None:
+            del self._pila
+            self._pila = None
+            self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+
+def leer_snapshots(ruta):
+    """
+    Abre una pila escrita por EscritorSnapshots sin copiarla a memoria.
+
+    Returns:
+        tuple: (tiempos, cuadros) donde cuadros es una vista de solo lectura
+            del memmap con los cuadros válidos, de forma (n, *forma_del_campo).
+    """
+    tiempos = np.load(_ruta_tiempos(ruta))
+    cuadros = np.load(ruta, mmap_mode='r')
+    return tiempos, cuadros[:len(tiempos)]
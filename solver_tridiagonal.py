@@ -0,0 +1,125 @@
+import numpy as np
+from scipy.linalg import lapack
+
+
+def factorizar_tridiagonal(ab):
+    """
+    Factoriza LU (LAPACK gttrf) una matriz tridiagonal dada en el formato
+    banda de solve_banded: ab[0, 1:] superior, ab[1, :] diagonal, ab[2, :-1] inferior.
+
+    La factorización se calcula una sola vez y luego se reutiliza con
+    resolver_tridiagonal_factorizada para cualquier número de lados derechos.
+
+    Args:
+        ab (np.array): Matriz banda de forma (3, n).
+
+    Returns:
+        tuple: Factores (dl, d, du, du2, ipiv) de LAPACK.
+    """
+    ab = np.asarray(ab, dtype=np.float64)
+    dl, d, du, du2, ipiv, info = lapack.dgttrf(ab[2, :-1], ab[1, :], ab[0, 1:])
+    if info > 0:
+        raise np.linalg.LinAlgError("singular matrix")
+    return dl, d, du, du2, ipiv
+
+
+def resolver_tridiagonal_factorizada(factor, B, sobrescribir=False):
+    """
+    Resuelve A X = B con la factorización de factorizar_tridiagonal
+    (solo sustitución hacia adelante y hacia atrás, LAPACK gttrs).
+
+    Cada columna de B es un lado derecho independiente, de modo que todas las
+    líneas de un barrido ADI se resuelven en una única llamada.
+
+    Args:
+        factor (tuple): Resultado de factorizar_tridiagonal.
+        B (np.array): Lado derecho de forma (n,) o (n, k).
+        sobrescribir (bool): Si es True y B es float64 contiguo en orden Fortran
+            (o un vector), la solución se escribe sobre B sin copias.
+
+    Returns:
+        np.array: Solución con la misma forma que B.
+    """
+    B = np.asarray(B, dtype=np.float64)
+    es_vector = B.ndim == 1
+    B2 = B.reshape(-1, 1) if es_vector else B
+
+    X, info = lapack.dgttrs(*factor, B2, overwrite_b=sobrescribir)
+    if info < 0:
+        raise ValueError(f"argumento {-info} inválido en dgttrs")
+
+    return X.reshape(B.shape) if es_vector else X
+
+
+def resolver_tridiagonal_lotes(inferior, diagonal, superior, rhs, eje=-1):
+    """
+    Resuelve en bloque muchos sistemas tridiagonales independientes con
+    coeficientes variables (algoritmo de Thomas vectorizado sobre las líneas).
+
+    Todos los argumentos tienen la misma forma; el sistema de cada línea se
+    recorre a lo largo de `eje` y las demás dimensiones indexan las líneas.
+    inferior[k] multiplica a x[k-1] (inferior[0] se ignora) y superior[k]
+    multiplica a x[k+1] (superior[-1] se ignora). No se pivotea, por lo que
+    las matrices deben ser diagonalmente dominantes, como las de los barridos
+    ADI de Richards.
+
+    Args:
+        inferior, diagonal, superior (np.array): Diagonales de cada línea.
+        rhs (np.array): Lados derechos.
+        eje (int): Eje a lo largo del cual se acoplan las incógnitas.
+
+    Returns:
+        np.array: Solución con la forma de rhs.
+    """
+    inferior = np.moveaxis(np.asarray(inferior, dtype=np.float64), eje, 0)
+    diagonal = np.moveaxis(np.asarray(diagonal, dtype=np.float64), eje, 0)
+    superior = np.moveaxis(np.asarray(superior, dtype=np.float64), eje, 0)
+    rhs = np.moveaxis(np.asarray(rhs, dtype=np.float64), eje, 0)
+    n = rhs.shape[0]
+
+    c = np.empty(rhs.shape)
+    d = np.empty(rhs.shape)
+
+    # Eliminación hacia adelante
+    c[0] = superior[0] / diagonal[0]
+    d[0] = rhs[0] / diagonal[0]
+    for k in range(1, n):
+        denom = diagonal[k] - inferior[k] * c[k - 1]
+        c[k] = superior[k] / denom
+        d[k] = (rhs[k] - inferior[k] * d[k - 1]) / denom
+
+    # Sustitución hacia atrás (sobre d)
+    for k in range(n - 2, -1, -1):
+        d[k] -= c[k] * d[k + 1]
+
+    return np.moveaxis(d, 0, eje)
+
+
+def resolver_tridiagonal_bloques(inferior, diagonal, superior, rhs):
+    """
+    Resuelve muchos sistemas tridiagonales independientes, acoplados a lo
+    largo del último eje, como un único sistema tridiagonal por bloques en
+    una sola llamada a LAPACK (gtsv, la misma rutina que usa solve_banded
+    para matrices tridiagonales): los acoples entre el final de una línea y
+    el comienzo de la siguiente se anulan.
+
+    Conviene frente a resolver_tridiagonal_lotes cuando las líneas son pocas
+    y largas (perfiles 1D de un conjunto), porque no recorre los nodos en
+    Python. Mismas convenciones de argumentos (inferior[..., 0] y
+    superior[..., -1] se ignoran); pivotea como solve_banded.
+
+    Returns:
+        np.array: Solución con la forma de rhs.
+    """
+    forma = rhs.shape
+    inferior = np.array(inferior, dtype=np.float64)
+    superior = np.array(superior, dtype=np.float64)
+    inferior[..., 0] = 0.0
+    superior[..., -1] = 0.0
+
+    _, _, _, x, info = lapack.dgtsv(inferior.ravel()[1:], np.array(diagonal, dtype=np.float64).ravel(),
+                                    superior.ravel()[:-1], np.array(rhs, dtype=np.float64).ravel(),
+                                    overwrite_dl=True, overwrite_d=True, overwrite_du=True, overwrite_b=True)
+    if info > 0:
+        raise np.linalg.LinAlgError("singular matrix")
+    return x.reshape(forma)
@@ -4,9 +4,12 @@ Demuestra la corrección de la implementación con tests numéricos
 """
 
 import numpy as np
+from operator import itemgetter
 import matplotlib.pyplot as plt
 from actividadB import resolucion_ecuacion_richards_1D_no_lineal
 from models_soil_models import diffusivity_brooks_corey
+from barrido_parametros import barrido_parametros, columna
+from convergencia_temporal import convergencia_temporal, orden_observado, pasos_para_error, N_VALORES
 
 def test_conservacion_masa():
     """Test 1: Verificar conservación de masa (sin fuentes/sumideros)"""
@@ -98,10 +101,15 @@ def test_convergencia_temporal():
     N_values = [50, 100, 200]
     soluciones = []
     
-    for N in N_values:
-        x, theta, _ = resolucion_ecuacion_richards_1D_no_lineal(
-            diffusivity_brooks_corey, L, T_final, M, N, theta_initial
-        )
+    # Los tres N son independientes: se resuelven en paralelo
+    casos = [dict(D_func=diffusivity_brooks_corey, L=L, T_final=T_final, M=M, N=N,
+                  theta_initial=theta_initial) for N in N_values]
+    tabla = barrido_parametros(resolucion_ecuacion_richards_1D_no_lineal, casos, extraer=itemgetter(0, 1))
+    fallidos = [f"N={f['parametros']['N']}: {f['error']}" for f in tabla if f['error'] is not None]
+    if fallidos:
+        raise RuntimeError("casos fallidos en el refinamiento temporal: " + "; ".join(fallidos))
+    
+    for N, (x, theta) in zip(N_values, columna(tabla, 'resultado')):
         soluciones.append(theta)
         print(f"N={N:3d}: θ_max={np.max(theta):.6f}, θ_integral={np.trapz(theta, x):.6f}")
     
@@ -176,6 +184,29 @@ def test_caso_difusion_lineal():
         return False
 
 
+def test_esquemas_orden_superior():
+    """Test 5: Esquemas de orden 2 (menos pasos temporales al mismo error)"""
+    print("\n=== TEST 5: Esquemas Temporales de Orden 2 ===")
+
+    # Caso B de convergencia_temporal: gota gaussiana hasta T_final=1000 s
+    errores = convergencia_temporal('B', esquemas=('euler', 'trbdf2'))
+    objetivo = errores['euler'][-1]
+    orden = orden_observado(N_VALORES, errores['trbdf2'])[-1]
+    N_euler = pasos_para_error(N_VALORES, errores['euler'], objetivo)
+    N_trbdf2 = pasos_para_error(N_VALORES, errores['trbdf2'], objetivo)
+
+    print(f"Orden observado TR-BDF2: {orden:.2f}")
+    print(f"Pasos para error {objetivo:.2e}: Euler {N_euler}, TR-BDF2 {N_trbdf2} "
+          f"({N_euler / N_trbdf2:.1f}x menos)")
+
+    if orden > 1.8 and N_euler >= 10 * N_trbdf2:
+        print("✅ PASA: TR-BDF2 es de orden 2 y reduce N en un orden de magnitud")
+        return True
+    else:
+        print("⚠️ TR-BDF2 no alcanza el orden o la reducción de pasos esperados")
+        return False
+
+
 def generar_reporte_completo():
     """Ejecutar todos los tests y generar reporte"""
     print("="*60)
@@ -189,6 +220,7 @@ def generar_reporte_completo():
     resultados.append(("Estabilidad Física", test_estabilidad_fisica()))
     resultados.append(("Convergencia Temporal", test_convergencia_temporal()))
     resultados.append(("Caso Límite D Constante", test_caso_difusion_lineal()))
+    resultados.append(("Esquemas de Orden 2", test_esquemas_orden_superior()))
     
     print("\n" + "="*60)
     print("RESUMEN DE VALIDACIÓN")
@@ -0,0 +1,118 @@
+"""
+Script de validación adicional para Actividades D y E
+Demuestra la corrección de los modos del motor de Richards 2D con tests numéricos
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+from actividadD import solver_richards_2d_circular
+from actividadE import solver_richards_2d_eliptica
+from checkpoint import VERSION_CHECKPOINT
+from models_soil_models import diffusivity_brooks_corey
+from richards_2d import resolver_richards_2d_adi
+
+
+def test_simetria_cuadrante():
+    """Test 1: El cuadrante con simetría reproduce el dominio completo en mallas impares"""
+    print("\n=== TEST 1: Simetría por Cuadrante ===")
+
+    # Nx impar: el eje pasa por un nodo y el redondeo de linspace hacía asimétricas las máscaras
+    Lx = Ly = 0.4
+    T_final, N = 10.0, 20
+    casos = [("Circular", solver_richards_2d_circular, 59), ("Elíptica", solver_richards_2d_eliptica, 41),
+             ("Elíptica", solver_richards_2d_eliptica, 59)]
+
+    pasa = True
+    for nombre, solver, Nx in casos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            theta_completo = solver(diffusivity_brooks_corey, Lx, Ly, T_final, Nx, Nx, N)[2]
+            theta_cuadrante = solver(diffusivity_brooks_corey, Lx, Ly, T_final, Nx, Nx, N, simetria=True)[2]
+        diferencia = np.max(np.abs(theta_completo - theta_cuadrante))
+        print(f"{nombre:<9} Nx={Nx}: max|completo - cuadrante| = {diferencia:.2e}")
+        pasa &= diferencia < 1e-10
+
+    # Un campo inicial asimétrico debe rechazarse en lugar de tomar el del cuadrante
+    theta_asimetrica = np.full((Nx + 2, Nx + 2), 1e-4)
+    theta_asimetrica[Nx // 2 - 5:Nx // 2 + 2, Nx // 2 - 5:Nx // 2 + 2] = 0.9
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            resolver_richards_2d_adi(diffusivity_brooks_corey, Lx, Ly, T_final, Nx, Nx, N, theta_asimetrica,
+                                     simetria=True)
+        print("Campo asimétrico: aceptado (debería lanzar ValueError)")
+        pasa = False
+    except ValueError:
+        print("Campo asimétrico: rechazado con ValueError")
+
+    if pasa:
+        print("✅ PASA: El cuadrante coincide con el dominio completo al redondeo")
+    else:
+        print("❌ FALLA: El modo simetría no reproduce el dominio completo")
+    return pasa
+
+
+def test_checkpoint_formato_antiguo():
+    """Test 2: Un checkpoint de la versión 1 se rechaza por versión, no por configuración"""
+    print("\n=== TEST 2: Checkpoint de Formato Antiguo ===")
+
+    Lx = Ly = 0.4
+    Nx = Ny = 20
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "v1.npz")
+        # Campos de la versión 1: sin 'esquema' en la configuración ni estado del paso anterior
+        configuracion = {'Lx': Lx, 'Ly': Ly, 'Nx': Nx, 'Ny': Ny, 'theta_borde': 1e-4, 'adaptativo': False,
+                         'tol_tiempo': None, 'D_func': 'diffusivity_brooks_corey', 'metodo': 'adi',
+                         'simetria': False}
+        np.savez(ruta, theta=np.full((Nx + 2, Ny + 2), 1e-4), n=np.array(5), t=np.array(5.0),
+                 dt=np.array(1.0), dt_prev=np.empty(0), theta_anterior=np.empty(0),
+                 configuracion=np.array(json.dumps(configuracion, sort_keys=True)), version=np.array(1))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                solver_richards_2d_circular(diffusivity_brooks_corey, Lx, Ly, 10.0, Nx, Ny, 10, reanudar=ruta)
+            mensaje = None
+        except ValueError as error:
+            mensaje = str(error)
+
+    print(f"Versión actual: {VERSION_CHECKPOINT}")
+    print(f"Error al reanudar: {mensaje}")
+    pasa = mensaje is not None and "versión" in mensaje
+    if pasa:
+        print("✅ PASA: El formato antiguo se rechaza con un error de versión")
+    else:
+        print("❌ FALLA: El formato antiguo no se rechaza por versión")
+    return pasa
+
+
+def generar_reporte_completo():
+    """Ejecutar todos los tests y generar reporte"""
+    print("="*60)
+    print("VALIDACIÓN NUMÉRICA - ACTIVIDADES D y E")
+    print("Ecuación de Richards 2D (gotas circular y elíptica)")
+    print("="*60)
+
+    resultados = []
+
+    resultados.append(("Simetría por Cuadrante", test_simetria_cuadrante()))
+    resultados.append(("Checkpoint de Formato Antiguo", test_checkpoint_formato_antiguo()))
+
+    print("\n" + "="*60)
+    print("RESUMEN DE VALIDACIÓN")
+    print("="*60)
+
+    tests_pasados = sum(1 for _, result in resultados if result)
+    tests_totales = len(resultados)
+
+    for nombre, resultado in resultados:
+        estado = "✅ PASA" if resultado else "❌ FALLA"
+        print(f"{estado} - {nombre}")
+
+    print(f"\nResultado: {tests_pasados}/{tests_totales} tests pasados")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    generar_reporte_completo()
@@ -0,0 +1,93 @@
+"""
+Script de validación adicional para la resolución a precisión pedida
+Verifica contra corridas más finas que la (M, N) elegida cumple la tolerancia
+"""
+
+import contextlib
+import io
+
+import numpy as np
+from precision_objetivo import PROBLEMAS, _norma_L2, _restringir, resolver_con_tolerancia
+
+
+def error_contra_corrida_fina(problema, salida, info):
+    """Error L2 de la salida elegida contra la corrida con malla y pasos 4 veces más finos."""
+    definicion = PROBLEMAS[problema]()
+    dims, medida, campo = definicion['dims'], definicion['medida'], definicion['campo']
+    M, N = info['M'], info['N']
+    with contextlib.redirect_stdout(io.StringIO()):
+        theta_fina = campo(definicion['resolver'](4 * (M + 1) - 1, 4 * N))
+    return _norma_L2(campo(salida) - _restringir(_restringir(theta_fina, dims), dims), medida, M, dims)
+
+
+def test_tolerancia_cumplida():
+    """Test 1: La discretización elegida cumple tol contra una corrida más fina"""
+    print("\n=== TEST 1: Tolerancia Cumplida (A, C y D) ===")
+
+    casos = [('A', 1e-5), ('C', 1e-5), ('D', 2e-2)]
+
+    pasa = True
+    for problema, tol in casos:
+        salida, info = resolver_con_tolerancia(problema, tol)
+        error = error_contra_corrida_fina(problema, salida, info)
+        print(f"{problema}: tol={tol:.1e} -> M={info['M']}, N={info['N']}, error estimado "
+              f"{info['error_estimado']:.2e}, error contra corrida fina {error:.2e}")
+        pasa &= error <= tol
+
+    if pasa:
+        print("✅ PASA: El error contra la corrida fina es menor que la tolerancia")
+    else:
+        print("❌ FALLA: La discretización elegida no cumple la tolerancia")
+    return pasa
+
+
+def test_regimen_preasintotico():
+    """Test 2: Una jerarquía fuera del régimen asintótico se rechaza en lugar de extrapolarse"""
+    print("\n=== TEST 2: Jerarquía Pre-asintótica ===")
+
+    # Con M0=9 la gota de D tiene 2 celdas de radio; sin presupuesto para refinar no hay cota de error
+    try:
+        resolver_con_tolerancia('D', 1e-2, M0=9, max_trabajo=1e5)
+        mensaje = None
+    except RuntimeError as error:
+        mensaje = str(error)
+
+    print(f"Error: {mensaje}")
+    pasa = mensaje is not None and "asintótico" in mensaje
+    if pasa:
+        print("✅ PASA: La jerarquía pre-asintótica se rechaza")
+    else:
+        print("❌ FALLA: Se devolvió una solución sin cota de error")
+    return pasa
+
+
+def generar_reporte_completo():
+    """Ejecutar todos los tests y generar reporte"""
+    print("="*60)
+    print("VALIDACIÓN NUMÉRICA - PRECISIÓN OBJETIVO")
+    print("Elección de (M, N) por extrapolación de Richardson")
+    print("="*60)
+
+    resultados = []
+
+    with np.errstate(all='ignore'):
+        resultados.append(("Tolerancia Cumplida", test_tolerancia_cumplida()))
+        resultados.append(("Jerarquía Pre-asintótica", test_regimen_preasintotico()))
+
+    print("\n" + "="*60)
+    print("RESUMEN DE VALIDACIÓN")
+    print("="*60)
+
+    tests_pasados = sum(1 for _, result in resultados if result)
+    tests_totales = len(resultados)
+
+    for nombre, resultado in resultados:
+        estado = "✅ PASA" if resultado else "❌ FALLA"
+        print(f"{estado} - {nombre}")
+
+    print(f"\nResultado: {tests_pasados}/{tests_totales} tests pasados")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    generar_reporte_completo()